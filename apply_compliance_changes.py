@@ -1,10 +1,13 @@
-﻿from pathlib import Path
-path = Path("src/app/api/compliance/reports/route.ts")
-text = path.read_text(encoding="utf-8")
+﻿import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'scripts'))
+
+from doctools.codemod import Codemod, Patch, run_codemod_cli
+
+ROUTE_PATH = "src/app/api/compliance/reports/route.ts"
 
 insert_anchor = "interface ComplianceReport {\r\n  id: string;\r\n  title: string;\r\n  description: string;\r\n  generatedAt: string;\r\n  reportType: string;\r\n  metrics: Record<string, any>;\r\n  recommendations: string[];\r\n  complianceLevel: 'compliant' | 'partial' | 'non-compliant';\r\n}\r\n\r\n"
-if insert_anchor not in text:
-    raise SystemExit('Anchor for type insertion not found')
 new_types = (
     "type ComplianceMetrics = ReturnType<typeof analyzeComplianceMetrics>;\r\n\r\n"
     "interface DetailedComplianceReport {\r\n"
@@ -27,7 +30,6 @@ new_types = (
     "  reports: ComplianceReport[];\r\n"
     "}\r\n\r\n"
 )
-text = text.replace(insert_anchor, insert_anchor + new_types)
 
 old_block = (
     "  // Generate comprehensive report\r\n"
@@ -56,8 +58,6 @@ old_block = (
     "  return report;\r\n" \
     ")\r\n"
 )
-if old_block not in text:
-    raise SystemExit('Old report block not found')
 new_block = (
     "  // Generate comprehensive report\r\n"
     "  const report: DetailedComplianceReport = {\r\n"
@@ -119,7 +119,6 @@ new_block = (
     "  return report;\r\n" \
     ")\r\n"
 )
-text = text.replace(old_block, new_block)
 
 replacements = {
     "dYs\" No audit events found - ensure audit logging is properly configured": 'ALERT: No audit events found - ensure audit logging is properly configured',
@@ -129,17 +128,21 @@ replacements = {
     "�o. System meets compliance requirements - maintain current practices": 'SUCCESS: System meets compliance requirements - maintain current practices',
     "�o. All compliance checks passed - excellent audit trail maintenance": 'SUCCESS: All compliance checks passed - excellent audit trail maintenance',
 }
-for old, new in replacements.items():
-    if old in text:
-        text = text.replace(old, new)
-
-text = text.replace(
-    "    case 'soc2':\r\n      return 'SOC 2 Compliance Report';",
-    "    case 'soc2':\r\n      return 'SOC 2 Compliance Report';\r\n    case 'iso27001':\r\n      return 'ISO 27001 Compliance Report';"
-)
-text = text.replace(
-    "    case 'soc2':\r\n      return 'Service Organization Control 2 audit trail analysis';",
-    "    case 'soc2':\r\n      return 'Service Organization Control 2 audit trail analysis';\r\n    case 'iso27001':\r\n      return 'ISO 27001 information security management assessment';"
+codemod = Codemod().add(
+    ROUTE_PATH,
+    Patch(insert_anchor, insert_anchor + new_types, name='type insertion anchor'),
+    Patch(old_block, new_block, name='old report block'),
+    *(Patch(old, new, count=None) for old, new in replacements.items()),
+    Patch(
+        "    case 'soc2':\r\n      return 'SOC 2 Compliance Report';",
+        "    case 'soc2':\r\n      return 'SOC 2 Compliance Report';\r\n    case 'iso27001':\r\n      return 'ISO 27001 Compliance Report';",
+        count=None,
+    ),
+    Patch(
+        "    case 'soc2':\r\n      return 'Service Organization Control 2 audit trail analysis';",
+        "    case 'soc2':\r\n      return 'Service Organization Control 2 audit trail analysis';\r\n    case 'iso27001':\r\n      return 'ISO 27001 information security management assessment';",
+        count=None,
+    ),
 )
 
-path.write_text(text, encoding='utf-8')
+run_codemod_cli(codemod)
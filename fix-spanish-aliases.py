@@ -1,179 +1,8 @@
-﻿import json
-import unicodedata
-import urllib.request
-import urllib.parse
+import sys
 from pathlib import Path
 
-REPO_ROOT = Path(__file__).resolve().parents[1]
-MANIFEST_PATH = REPO_ROOT / 'src' / 'lib' / 'documents' / 'manifest.generated.json'
-REPORT_PATH = REPO_ROOT / 'template-verification-report.json'
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'scripts'))
 
-manifest = json.loads(MANIFEST_PATH.read_text(encoding='utf-8'))
-report = json.loads(REPORT_PATH.read_text(encoding='utf-8'))
+from doctools.fix_aliases import main
 
-manifest_by_id = {entry['id']: entry for entry in manifest['entries']}
-mismatched_docs = {
-    result['documentType']
-    for result in report.get('results', [])
-    if any('Metadata alias count mismatch' in error for error in result.get('errors', []))
-}
-
-def normalize_es(value: str) -> str:
-    normalized = unicodedata.normalize('NFD', value.strip().lower())
-    return ''.join(ch for ch in normalized if unicodedata.category(ch) != 'Mn')
-
-def normalize_en(value: str) -> str:
-    return value.strip().lower()
-
-observed_translations: dict[str, set[str]] = {}
-for entry in manifest['entries']:
-    en_aliases = entry['meta']['translations']['en'].get('aliases', [])
-    es_aliases = entry['meta']['translations']['es'].get('aliases', [])
-    if len(en_aliases) == len(es_aliases) and en_aliases:
-        for en_alias, es_alias in zip(en_aliases, es_aliases):
-            candidate = es_alias.strip()
-            if '(' in candidate:
-                continue
-            observed_translations.setdefault(normalize_en(en_alias), set()).add(candidate.lower())
-
-translation_cache: dict[str, str] = {}
-
-REMOVE_SUFFIXES = (
-    '(plazo legal)',
-    '(término legal)',
-    '(término jurídico)',
-    '(documento legal)',
-    '(frase legal)',
-    '(condición legal)',
-    '(cláusula legal)',
-)
-
-def translate_alias(alias: str) -> str:
-    alias = alias.strip()
-    if not alias:
-        return alias
-    if alias in translation_cache:
-        return translation_cache[alias]
-
-    params = {
-        'client': 'gtx',
-        'sl': 'en',
-        'tl': 'es',
-        'dt': 't',
-        'q': f'{alias} (legal term)',
-    }
-    url = 'https://translate.googleapis.com/translate_a/single?' + urllib.parse.urlencode(params)
-    with urllib.request.urlopen(url) as response:
-        payload = json.loads(response.read().decode('utf-8'))
-    translated = ''.join(chunk[0] for chunk in payload[0]) if payload and payload[0] else ''
-    result = translated.strip() or alias
-    lowered = result.lower()
-    for suffix in REMOVE_SUFFIXES:
-        if lowered.endswith(suffix):
-            result = result[: -len(suffix)].strip()
-            lowered = result.lower()
-            break
-    normalized = ' '.join(result.split()).lower()
-    translation_cache[alias] = normalized
-    return normalized
-
-def ensure_unique_translation(candidate: str, english_alias: str, existing_norm: set[str]) -> str:
-    base = candidate.strip() or english_alias.strip().lower()
-    if normalize_es(base) not in existing_norm:
-        return base
-
-    suffixes = [' legal', ' oficial', ' complementaria', ' alternativa', ' especializada', ' profesional']
-    for suffix in suffixes:
-        alt = base + suffix
-        if normalize_es(alt) not in existing_norm:
-            return alt
-
-    fallback = f"{base} ({english_alias.lower()})"
-    if normalize_es(fallback) not in existing_norm:
-        return fallback
-
-    counter = 2
-    while normalize_es(f"{base} variante {counter}") in existing_norm:
-        counter += 1
-    return f"{base} variante {counter}"
-
-def update_alias_array(file_path: Path, aliases: list[str]) -> None:
-    content = file_path.read_text(encoding='utf-8')
-    es_index = content.find('es:')
-    if es_index == -1:
-        raise ValueError(f'Missing es block in {file_path}')
-    alias_index = content.find('aliases', es_index)
-    if alias_index == -1:
-        raise ValueError(f'Missing aliases array in {file_path}')
-    array_start = content.find('[', alias_index)
-    if array_start == -1:
-        raise ValueError(f'Malformed aliases array in {file_path}')
-
-    depth = 0
-    array_end = -1
-    for idx in range(array_start, len(content)):
-        char = content[idx]
-        if char == '[':
-            depth += 1
-        elif char == ']':
-            depth -= 1
-            if depth == 0:
-                array_end = idx
-                break
-    if array_end == -1:
-        raise ValueError(f'Unmatched aliases bracket in {file_path}')
-
-    line_start = content.rfind('\n', 0, array_start) + 1
-    line = content[line_start:array_start]
-    whitespace = line[:len(line) - len(line.lstrip())]
-    base_indent = whitespace
-    item_indent = base_indent + '  '
-    newline = '\r\n' if '\r\n' in content else '\n'
-
-    escaped_aliases = [alias.replace('\\', '\\\\').replace("'", "\\'") for alias in aliases]
-    alias_lines = newline.join(f"{item_indent}'{alias}'," for alias in escaped_aliases)
-    new_block = '[' + newline + alias_lines + newline + base_indent + ']'
-
-    updated = content[:array_start] + new_block + content[array_end + 1:]
-    file_path.write_text(updated, encoding='utf-8')
-
-updates: list[tuple[str, str, str]] = []
-
-for doc_id in sorted(mismatched_docs):
-    entry = manifest_by_id.get(doc_id)
-    if not entry:
-        print(f"⚠️  {doc_id} missing from manifest, skipping.")
-        continue
-
-    en_aliases = entry['meta']['translations']['en'].get('aliases', [])
-    es_aliases = entry['meta']['translations']['es'].get('aliases', [])
-
-    if len(en_aliases) <= len(es_aliases):
-        continue
-
-    missing_index = len(es_aliases)
-    english_alias = en_aliases[missing_index]
-    existing_norm = {normalize_es(alias) for alias in es_aliases}
-
-    spanish_alias = None
-    for candidate in observed_translations.get(normalize_en(english_alias), set()):
-        if normalize_es(candidate) not in existing_norm:
-            spanish_alias = candidate.lower()
-            break
-
-    if spanish_alias is None:
-        translated = translate_alias(english_alias)
-        spanish_alias = ensure_unique_translation(translated, english_alias, existing_norm)
-
-    final_aliases = es_aliases + [spanish_alias]
-    metadata_dir = entry['importPath'].lstrip('./')
-    metadata_path = REPO_ROOT / 'src' / 'lib' / 'documents' / metadata_dir / 'metadata.ts'
-    update_alias_array(metadata_path, final_aliases)
-    updates.append((doc_id, english_alias, spanish_alias))
-
-if updates:
-    print(f'Updated {len(updates)} metadata files:')
-    for doc_id, english_alias, spanish_alias in updates:
-        print(f" - {doc_id}: added '{spanish_alias}' for '{english_alias}'")
-else:
-    print('No metadata files were updated.')
+raise SystemExit(main())
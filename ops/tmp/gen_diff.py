@@ -1,13 +1,9 @@
-import subprocess
-import pathlib
-import difflib
+import sys
+from pathlib import Path
 
-def write_diff(path):
-    old = subprocess.check_output(['git', 'show', f'HEAD:{path}'], text=True)
-    new = pathlib.Path(path).read_text()
-    diff = difflib.unified_diff(old.splitlines(), new.splitlines(), fromfile=f'a/{path}', tofile=f'b/{path}', lineterm='')
-    out_path = pathlib.Path('ops/tmp') / (path.replace('/', '_') + '.diff')
-    out_path.write_text('\n'.join(diff) + '\n')
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / 'scripts'))
 
-write_diff('public/templates/en/advance-directive.md')
-write_diff('public/templates/es/advance-directive.md')
+from doctools.worktree_diff import main
+
+raise SystemExit(main())
@@ -1,18 +1,19 @@
-﻿import json
-from datetime import datetime, timezone
+﻿from datetime import datetime, timezone
 from pathlib import Path
+import sys
 
-path = Path('TEAM/Document-Intelligence/memory.json')
-data = json.loads(path.read_text(encoding='utf-8'))
-now = datetime.now(timezone.utc).isoformat()
-notes = data.get('notes', [])
-notes.append('document-intel-cycle-0009: Replaced mojibake-laden legal dictionary entries with clean ASCII translations for five canonical contract concepts.')
-notes.append('LegalTranslationEngine passes ESLint after repair; tsc still failing due to broader admin/AI regressions (see ops/artifacts/document-intel-cycle-0009/typecheck.txt).')
-data['notes'] = notes
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / 'scripts'))
 
-todos = data.get('todos', [])
-todos.append('Coordinate with AI and Platform owners on restoring global typecheck success so Document Intelligence verifications can gate releases.')
-data['todos'] = todos
-data['cycle_id'] = 'document-intel-cycle-0009'
-data['last_updated'] = now
-path.write_text(json.dumps(data, indent=4, ensure_ascii=False) + '\n', encoding='utf-8')
+from doctools.memory_store import MemoryStore
+
+store = MemoryStore(REPO_ROOT / 'TEAM/Document-Intelligence/memory.json')
+store.record(
+    notes=[
+        'document-intel-cycle-0009: Replaced mojibake-laden legal dictionary entries with clean ASCII translations for five canonical contract concepts.',
+        'LegalTranslationEngine passes ESLint after repair; tsc still failing due to broader admin/AI regressions (see ops/artifacts/document-intel-cycle-0009/typecheck.txt).',
+    ],
+    todos=['Coordinate with AI and Platform owners on restoring global typecheck success so Document Intelligence verifications can gate releases.'],
+    cycle_id='document-intel-cycle-0009',
+    last_updated=datetime.now(timezone.utc).isoformat(),
+)
@@ -1,27 +1,26 @@
 ﻿from pathlib import Path
-import re
+import sys
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / 'scripts'))
+
+from doctools.doc_pipeline import DocPipeline, replace_section, replace_text, run_pipeline_cli, trim_trailing_whitespace
 
 summaries = {
-    'docs/legal/disclaimer.md': "**Spanish Summary (Resumen en Español)**  \r\n123LegalDoc no es un bufete de abogados y la información que proporcionamos no constituye asesoría legal. No se forma una relación abogado-cliente al usar nuestros servicios. Las leyes varían según el estado; consulte a un abogado con licencia en su jurisdicción antes de utilizar cualquier documento generado.\r\n",
-    'docs/legal/terms-of-service.md': "**Spanish Summary (Resumen en Español)**  \r\nAl usar 123LegalDoc, usted acepta estos Términos. 123LegalDoc no es un bufete de abogados y el servicio se proporciona \"tal cual\". Consulte el Aviso de Privacidad y la Política de Reembolsos para conocer cómo manejamos sus datos y cuándo están disponibles los reembolsos.\r\n",
-    'docs/legal/privacy-notice.md': "**Spanish Summary (Resumen en Español)**  \r\nRecopilamos información personal para ofrecer y mejorar nuestros servicios. Puede solicitar acceso, corrección o eliminación de sus datos, u optar por no compartirlos con fines publicitarios, escribiendo a privacy@123legaldoc.com.\r\n\r\n",
-    'docs/legal/refund-policy.md': "**Spanish Summary (Resumen en Español)**  \r\nOfrecemos un reembolso completo dentro de los 30 días para compras iniciales si no ha descargado más de dos documentos y el producto no cumplió con sus expectativas. Envíe un correo electrónico a billing@123legaldoc.com con su número de pedido.\r\n",
+    'docs/legal/disclaimer.md': "**Spanish Summary (Resumen en Español)**  \n\n123LegalDoc no es un bufete de abogados y la información que proporcionamos no constituye asesoría legal. No se forma una relación abogado-cliente al usar nuestros servicios. Las leyes varían según el estado; consulte a un abogado con licencia en su jurisdicción antes de utilizar cualquier documento generado.\n",
+    'docs/legal/terms-of-service.md': "**Spanish Summary (Resumen en Español)**  \n\nAl usar 123LegalDoc, usted acepta estos Términos. 123LegalDoc no es un bufete de abogados y el servicio se proporciona \"tal cual\". Consulte el Aviso de Privacidad y la Política de Reembolsos para conocer cómo manejamos sus datos y cuándo están disponibles los reembolsos.\n",
+    'docs/legal/privacy-notice.md': "**Spanish Summary (Resumen en Español)**  \n\nRecopilamos información personal para ofrecer y mejorar nuestros servicios. Puede solicitar acceso, corrección o eliminación de sus datos, u optar por no compartirlos con fines publicitarios, escribiendo a privacy@123legaldoc.com.\n",
+    'docs/legal/refund-policy.md': "**Spanish Summary (Resumen en Español)**  \n\nOfrecemos un reembolso completo dentro de los 30 días para compras iniciales si no ha descargado más de dos documentos y el producto no cumplió con sus expectativas. Envíe un correo electrónico a billing@123legaldoc.com con su número de pedido.\n",
 }
 
-pattern = re.compile(r"\*\*Spanish Summary[\s\S]*$", re.DOTALL)
+char_fixes = {
+    'docs/legal/refund-policy.md': [replace_text('5?10', '5–10', name='en dash 5-10')],
+    'docs/legal/terms-of-service.md': [
+        replace_text('Legal Operations ? Terms Questions', 'Legal Operations – Terms Questions', name='en dash contact heading'),
+    ],
+}
 
+pipeline = DocPipeline(REPO_ROOT).add_shared(trim_trailing_whitespace())
 for rel_path, replacement in summaries.items():
-    path = Path(rel_path)
-    text = path.read_text(encoding='utf8')
-    if '**Spanish Summary' not in text:
-        raise SystemExit(f"Summary header missing in {rel_path}")
-    new_text = pattern.sub(replacement, text)
-    path.write_text(new_text, encoding='utf8')
-
-refund_path = Path('docs/legal/refund-policy.md')
-refund_text = refund_path.read_text(encoding='utf8').replace('5?10', '5–10')
-refund_path.write_text(refund_text, encoding='utf8')
-
-terms_path = Path('docs/legal/terms-of-service.md')
-terms_text = terms_path.read_text(encoding='utf8').replace('Legal Operations ? Terms Questions', 'Legal Operations – Terms Questions')
-terms_path.write_text(terms_text, encoding='utf8')
+    pipeline.add(rel_path, replace_section('**Spanish Summary', replacement, name='spanish summary'), *char_fixes.get(rel_path, []))
+run_pipeline_cli(pipeline)
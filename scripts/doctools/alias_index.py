@@ -0,0 +1,249 @@
+"""Bilingual alias search index built from ``manifest.generated.json``.
+
+    python -m doctools.alias_index build [--manifest PATH] [--output PATH]
+    python -m doctools.alias_index query TEXT [--locale en|es] [--limit N] [--json]
+
+The index is one JSON file (default ``state/alias-index.json``) holding:
+
+``keys``
+    every en/es alias, accent-folded with ``normalize_es``, sorted, so an
+    exact match is one ``bisect`` and a prefix query is a ``bisect`` plus a
+    walk over the matching run;
+``postings``
+    per key, the documents it belongs to as ``doc << 2 | locales`` with bit 0
+    for en and bit 1 for es;
+``grams``
+    a trigram inverted index over the keys (padded with spaces), ranked by
+    Dice similarity for typo-tolerant lookups;
+``docs``, ``labels``
+    document ids and the first original spelling of each key.
+
+The header records the manifest's mtime, size and sha256; ``load_alias_index``
+rebuilds the file only when the manifest content changed.
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import sys
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
+from pathlib import Path
+
+from .fsutil import write_atomic
+from .manifest import LOCALES
+from .normalize import normalize_es, normalize_es_many
+from .paths import MANIFEST_PATH, STATE_DIR
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_PATH = STATE_DIR / 'alias-index.json'
+GRAM = 3
+LOCALE_BITS = {locale: 1 << position for position, locale in enumerate(LOCALES)}
+
+
+def grams(key: str) -> set[str]:
+    padded = f' {key} '
+    return {padded[start:start + GRAM] for start in range(len(padded) - GRAM + 1)}
+
+
+@dataclass(frozen=True)
+class AliasMatch:
+    alias: str
+    doc_ids: tuple[str, ...]
+    locales: tuple[str, ...]
+    kind: str  # 'exact', 'prefix' or 'fuzzy'
+    score: float = 1.0
+
+
+@dataclass
+class AliasIndex:
+    docs: list[str] = field(default_factory=list)
+    keys: list[str] = field(default_factory=list)
+    labels: list[str] = field(default_factory=list)
+    postings: list[list[int]] = field(default_factory=list)
+    grams: dict[str, list[int]] = field(default_factory=dict)
+    header: dict = field(default_factory=dict)
+
+    @cached_property
+    def gram_counts(self) -> list[int]:
+        return [len(grams(key)) for key in self.keys]
+
+    def _match(self, position: int, locale: str | None, kind: str, score: float = 1.0) -> AliasMatch | None:
+        wanted = LOCALE_BITS[locale] if locale else 0b11
+        doc_ids: list[str] = []
+        locales = 0
+        for posting in self.postings[position]:
+            if posting & wanted:
+                doc_ids.append(self.docs[posting >> 2])
+                locales |= posting & wanted
+        if not doc_ids:
+            return None
+        names = tuple(name for name, bit in LOCALE_BITS.items() if locales & bit)
+        return AliasMatch(self.labels[position], tuple(doc_ids), names, kind, score)
+
+    def _find(self, key: str) -> int | None:
+        position = bisect.bisect_left(self.keys, key)
+        return position if position < len(self.keys) and self.keys[position] == key else None
+
+    def lookup(self, alias: str, locale: str | None = None) -> list[str]:
+        """Document ids whose alias folds to the same key as ``alias``."""
+        position = self._find(normalize_es(alias))
+        match = None if position is None else self._match(position, locale, 'exact')
+        return list(match.doc_ids) if match else []
+
+    def prefix(self, text: str, locale: str | None = None, limit: int = 20) -> list[AliasMatch]:
+        key = normalize_es(text)
+        matches: list[AliasMatch] = []
+        position = bisect.bisect_left(self.keys, key)
+        while position < len(self.keys) and self.keys[position].startswith(key) and len(matches) < limit:
+            match = self._match(position, locale, 'exact' if self.keys[position] == key else 'prefix')
+            if match:
+                matches.append(match)
+            position += 1
+        return matches
+
+    def fuzzy(self, text: str, locale: str | None = None, limit: int = 10, min_score: float = 0.4) -> list[AliasMatch]:
+        """Aliases ranked by trigram Dice similarity to ``text``."""
+        query = grams(normalize_es(text))
+        if not query:
+            return []
+        shared: dict[int, int] = {}
+        for gram in query:
+            for position in self.grams.get(gram, ()):
+                shared[position] = shared.get(position, 0) + 1
+        counts = self.gram_counts
+        scored = []
+        for position, overlap in shared.items():
+            score = 2 * overlap / (len(query) + counts[position])
+            if score >= min_score:
+                scored.append((-score, self.keys[position], position))
+        scored.sort()
+        matches: list[AliasMatch] = []
+        for negative, _, position in scored:
+            match = self._match(position, locale, 'fuzzy', round(-negative, 3))
+            if match:
+                matches.append(match)
+                if len(matches) == limit:
+                    break
+        return matches
+
+    def search(self, text: str, locale: str | None = None, limit: int = 10) -> list[AliasMatch]:
+        """Exact and prefix matches first, then fuzzy ones to fill ``limit``."""
+        matches = self.prefix(text, locale, limit)
+        seen = {match.alias for match in matches}
+        if len(matches) < limit:
+            for match in self.fuzzy(text, locale, limit):
+                if match.alias not in seen and len(matches) < limit:
+                    matches.append(match)
+        return matches
+
+    def to_json(self) -> dict:
+        return {
+            **self.header,
+            'version': INDEX_VERSION,
+            'docs': self.docs,
+            'keys': self.keys,
+            'labels': self.labels,
+            'postings': self.postings,
+            'grams': self.grams,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'AliasIndex':
+        header = {key: data[key] for key in ('source', 'mtime_ns', 'size', 'sha256') if key in data}
+        return cls(data['docs'], data['keys'], data['labels'], data['postings'], data['grams'], header)
+
+
+def build_alias_index(manifest: dict) -> AliasIndex:
+    docs: list[str] = []
+    postings: dict[str, dict[int, int]] = {}
+    labels: dict[str, str] = {}
+    for entry in manifest['entries']:
+        doc = len(docs)
+        docs.append(entry['id'])
+        translations = entry['meta'].get('translations', {})
+        for locale in LOCALES:
+            aliases = translations.get(locale, {}).get('aliases', [])
+            for alias, key in zip(aliases, normalize_es_many(aliases)):
+                if not key:
+                    continue
+                labels.setdefault(key, alias.strip())
+                found = postings.setdefault(key, {})
+                found[doc] = found.get(doc, 0) | LOCALE_BITS[locale]
+
+    index = AliasIndex(docs=docs, keys=sorted(postings))
+    index.labels = [labels[key] for key in index.keys]
+    index.postings = [[doc << 2 | bits for doc, bits in sorted(postings[key].items())] for key in index.keys]
+    for position, key in enumerate(index.keys):
+        for gram in grams(key):
+            index.grams.setdefault(gram, []).append(position)
+    index.grams = dict(sorted(index.grams.items()))
+    return index
+
+
+def _read_index(path: Path) -> AliasIndex | None:
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return AliasIndex.from_json(data) if data.get('version') == INDEX_VERSION else None
+
+
+def write_alias_index(manifest_path: Path = MANIFEST_PATH, path: Path = DEFAULT_INDEX_PATH) -> AliasIndex:
+    raw = manifest_path.read_bytes()
+    stat = manifest_path.stat()
+    index = build_alias_index(json.loads(raw))
+    index.header = {
+        'source': manifest_path.name,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': hashlib.sha256(raw).hexdigest(),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, json.dumps(index.to_json(), ensure_ascii=False, separators=(',', ':')))
+    return index
+
+
+def load_alias_index(manifest_path: Path = MANIFEST_PATH, path: Path = DEFAULT_INDEX_PATH) -> AliasIndex:
+    """Load the index file, rebuilding it first if the manifest content changed."""
+    index = _read_index(path)
+    if index is not None:
+        stat = manifest_path.stat()
+        header = index.header
+        if header.get('mtime_ns') == stat.st_mtime_ns and header.get('size') == stat.st_size:
+            return index
+        if header.get('sha256') == hashlib.sha256(manifest_path.read_bytes()).hexdigest():
+            return index
+    return write_alias_index(manifest_path, path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Build or query the bilingual alias search index.')
+    parser.add_argument('command', choices=['build', 'query'])
+    parser.add_argument('text', nargs='?', help='Query text (for query).')
+    parser.add_argument('--manifest', type=Path, default=MANIFEST_PATH, help='manifest.generated.json to index.')
+    parser.add_argument('--output', type=Path, default=DEFAULT_INDEX_PATH, help='Index file (default: state/alias-index.json).')
+    parser.add_argument('--locale', choices=LOCALES, help='Only match aliases of this locale.')
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--json', action='store_true', help='Print matches as JSON.')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        index = write_alias_index(args.manifest, args.output)
+        size = args.output.stat().st_size
+        print(f'{len(index.keys)} aliases, {len(index.docs)} documents, {len(index.grams)} trigrams -> {args.output} ({size / 1024:.0f} KiB)')
+        return 0
+    if not args.text:
+        parser.error('query needs TEXT')
+    matches = load_alias_index(args.manifest, args.output).search(args.text, args.locale, args.limit)
+    if args.json:
+        json.dump([asdict(match) for match in matches], sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write('\n')
+    else:
+        for match in matches:
+            print(f'{match.kind:<6} {match.score:5.2f}  {match.alias}  [{"/".join(match.locales)}] {", ".join(match.doc_ids)}')
+    return 0 if matches else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,93 @@
+"""Global alias-collision index across every document and locale.
+
+The registry maps the accent-folded form of each alias to the set of
+``(document id, locale)`` pairs that use it, so a uniqueness probe is a single
+dict lookup. Folding is memoized in a bounded LRU because the same candidate
+strings are normalized over and over while probing suffix variants.
+"""
+from functools import lru_cache
+
+from .normalize import fold_es
+
+UNIQUE_SUFFIXES = (' legal', ' oficial', ' complementaria', ' alternativa', ' especializada', ' profesional')
+
+
+class AliasRegistry:
+    def __init__(self, cache_size: int = 8192, global_scope: bool = False):
+        self.normalize = lru_cache(maxsize=cache_size)(fold_es)
+        self.global_scope = global_scope
+        self.cross_document_rejections = 0
+        self._owners: dict[str, set[tuple[str, str]]] = {}
+        self._by_document: dict[tuple[str, str], set[str]] = {}
+
+    @classmethod
+    def from_manifest(cls, index, **kwargs) -> 'AliasRegistry':
+        registry = cls(**kwargs)
+        for entry in index.entries:
+            translations = entry['meta'].get('translations', {})
+            for locale, block in translations.items():
+                for alias in block.get('aliases', []):
+                    registry.add(entry['id'], locale, alias)
+        return registry
+
+    def add(self, doc_id: str, locale: str, alias: str) -> None:
+        key = self.normalize(alias)
+        self._owners.setdefault(key, set()).add((doc_id, locale))
+        self._by_document.setdefault((doc_id, locale), set()).add(key)
+
+    def remove_document(self, doc_id: str, locale: str) -> None:
+        for key in self._by_document.pop((doc_id, locale), ()):
+            owners = self._owners.get(key)
+            if owners is None:
+                continue
+            owners.discard((doc_id, locale))
+            if not owners:
+                del self._owners[key]
+
+    def owners(self, alias: str) -> set[tuple[str, str]]:
+        return self._owners.get(self.normalize(alias), set())
+
+    def conflicts(self, alias: str, doc_id: str) -> set[str]:
+        """Other documents that already use ``alias`` in any locale."""
+        return {owner for owner, _ in self.owners(alias) if owner != doc_id}
+
+    def is_available(self, alias: str, doc_id: str, locale: str, count: bool = True) -> bool:
+        """Whether ``doc_id`` may use ``alias`` in ``locale``; ``count=False`` probes without touching the stats."""
+        owners = self._owners.get(self.normalize(alias))
+        if not owners:
+            return True
+        for owner, owner_locale in owners:
+            if owner == doc_id:
+                if owner_locale == locale:
+                    return False
+            elif self.global_scope:
+                self.cross_document_rejections += count
+                return False
+        return True
+
+    def unique_alias(self, candidate: str, english_alias: str, doc_id: str, locale: str = 'es') -> str:
+        base = candidate.strip().lower() or english_alias.strip().lower()
+        if self.is_available(base, doc_id, locale):
+            return base
+
+        for suffix in UNIQUE_SUFFIXES:
+            alt = base + suffix
+            if self.is_available(alt, doc_id, locale):
+                return alt
+
+        fallback = f"{base} ({english_alias.lower()})"
+        if self.is_available(fallback, doc_id, locale):
+            return fallback
+
+        counter = 2
+        while not self.is_available(f"{base} variante {counter}", doc_id, locale):
+            counter += 1
+        return f"{base} variante {counter}"
+
+    def summary(self) -> str:
+        info = self.normalize.cache_info()
+        return (
+            f'Alias registry: {len(self._owners)} distinct aliases, '
+            f'{self.cross_document_rejections} cross-document collisions rejected, '
+            f'normalize cache {info.hits} hits / {info.misses} misses'
+        )
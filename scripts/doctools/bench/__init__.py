@@ -0,0 +1,4 @@
+"""Micro-benchmarks for the Python maintenance tooling.
+
+Run a module with ``python -m doctools.bench.<name>`` from ``scripts/``.
+"""
@@ -0,0 +1,99 @@
+"""Query latency of the alias index against scanning the manifest.
+
+    python -m doctools.bench.alias_index [--queries N] [--seed N]
+
+The scan baseline is what a lookup costs without the index: fold every
+alias of every entry and compare (exact), test ``startswith`` (prefix) or
+score trigram similarity (fuzzy, with one character dropped from the query).
+The report counts how often both sides agree (same documents, same best score).
+"""
+import argparse
+import json
+import random
+import time
+
+from ..alias_index import DEFAULT_INDEX_PATH, grams, load_alias_index
+from ..manifest import LOCALES
+from ..normalize import fold_es
+from ..paths import MANIFEST_PATH
+
+
+def scan_exact(entries: list[dict], text: str) -> set[str]:
+    key = fold_es(text)
+    return {
+        entry['id']
+        for entry in entries
+        for locale in LOCALES
+        if any(fold_es(alias) == key for alias in entry['meta']['translations'][locale].get('aliases', []))
+    }
+
+
+def scan_prefix(entries: list[dict], text: str) -> set[str]:
+    key = fold_es(text)
+    return {
+        entry['id']
+        for entry in entries
+        for locale in LOCALES
+        if any(fold_es(alias).startswith(key) for alias in entry['meta']['translations'][locale].get('aliases', []))
+    }
+
+
+def scan_fuzzy(entries: list[dict], text: str, min_score: float = 0.4) -> float | None:
+    """Best trigram Dice score over all aliases (the index's top fuzzy score)."""
+    query = grams(fold_es(text))
+    best = None
+    for entry in entries:
+        for locale in LOCALES:
+            for alias in entry['meta']['translations'][locale].get('aliases', []):
+                candidate = grams(fold_es(alias))
+                score = 2 * len(query & candidate) / (len(query) + len(candidate))
+                if score >= min_score and (best is None or score > best):
+                    best = score
+    return None if best is None else round(best, 3)
+
+
+def timed(label: str, func, queries: list[str]) -> tuple[list, float]:
+    started = time.perf_counter()
+    results = [func(query) for query in queries]
+    seconds = time.perf_counter() - started
+    print(f'  {label:<16} {seconds / len(queries) * 1e6:10.1f} us/query')
+    return results, seconds
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    entries = json.loads(MANIFEST_PATH.read_text(encoding='utf-8'))['entries']
+    started = time.perf_counter()
+    index = load_alias_index()
+    print(f'index: {len(index.keys)} aliases, loaded in {(time.perf_counter() - started) * 1000:.1f} ms '
+          f'from {DEFAULT_INDEX_PATH.name} ({DEFAULT_INDEX_PATH.stat().st_size / 1024:.0f} KiB)')
+
+    aliases = [alias for entry in entries for locale in LOCALES for alias in entry['meta']['translations'][locale].get('aliases', [])]
+    sample = rng.sample(aliases, min(args.queries, len(aliases)))
+    prefixes = [alias[: max(3, len(alias) // 2)] for alias in sample]
+    typos = []
+    for alias in sample:
+        drop = rng.randrange(len(alias))
+        typos.append(alias[:drop] + alias[drop + 1:])
+
+    for label, queries, scan, indexed, same in (
+        ('exact', sample, lambda q: scan_exact(entries, q), index.lookup, lambda a, b: a == set(b)),
+        ('prefix', prefixes, lambda q: scan_prefix(entries, q), lambda q: index.prefix(q, limit=10**6),
+         lambda a, b: a == {doc for match in b for doc in match.doc_ids}),
+        ('fuzzy', typos, lambda q: scan_fuzzy(entries, q), lambda q: index.fuzzy(q, limit=1),
+         lambda a, b: a == (b[0].score if b else None)),
+    ):
+        print(f'{label} ({len(queries)} queries):')
+        expected, scan_seconds = timed('manifest scan', scan, queries)
+        produced, index_seconds = timed('index', indexed, queries)
+        agree = sum(same(a, b) for a, b in zip(expected, produced))
+        print(f'  speed-up         {scan_seconds / index_seconds:10.0f}x   ({agree}/{len(queries)} results agree)')
+
+
+if __name__ == '__main__':
+    main()
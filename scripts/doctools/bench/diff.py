@@ -0,0 +1,97 @@
+"""Compare ``difflib.unified_diff`` against ``doctools.diff.unified_diff``.
+
+    python -m doctools.bench.diff [--edits N] [--seed N]
+
+Diffs every en/es template pair, every template against a randomly edited
+copy of itself, and the generated TS manifest against an edited copy. Each
+diff produced by the new engine is applied back to its source to check that
+it reconstructs the target exactly.
+"""
+import argparse
+import difflib
+import random
+import re
+import time
+
+from .. import diff
+from ..paths import REPO_ROOT
+
+HUNK_RE = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@$')
+
+
+def mutate(lines: list[str], edits: int, rng: random.Random) -> list[str]:
+    lines = list(lines)
+    for _ in range(edits):
+        index = rng.randrange(len(lines) + 1)
+        roll = rng.random()
+        if roll < 0.4 or not lines:
+            lines.insert(index, f'inserted line {rng.random():.6f}')
+        elif roll < 0.7:
+            del lines[min(index, len(lines) - 1)]
+        else:
+            lines[min(index, len(lines) - 1)] += ' (edited)'
+    return lines
+
+
+def apply_unified(old: list[str], patch: list[str]) -> list[str]:
+    result: list[str] = []
+    cursor = 0
+    for line in patch[2:]:
+        match = HUNK_RE.match(line)
+        if match:
+            start = int(match.group(1)) - (0 if match.group(2) == '0' else 1)
+            result.extend(old[cursor:start])
+            cursor = start
+        elif line[:1] in {' ', '-'}:
+            if old[cursor] != line[1:]:
+                raise AssertionError(f'context mismatch at line {cursor + 1}')
+            if line[0] == ' ':
+                result.append(line[1:])
+            cursor += 1
+        elif line[:1] == '+':
+            result.append(line[1:])
+    result.extend(old[cursor:])
+    return result
+
+
+def compare(label: str, pairs: list[tuple[list[str], list[str]]]) -> None:
+    started = time.perf_counter()
+    expected = [list(difflib.unified_diff(a, b, 'a', 'b', lineterm='')) for a, b in pairs]
+    difflib_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    produced = [list(diff.unified_diff(a, b, 'a', 'b', lineterm='')) for a, b in pairs]
+    engine_seconds = time.perf_counter() - started
+
+    identical = sum(left == right for left, right in zip(expected, produced))
+    for (a, b), patch in zip(pairs, produced):
+        if apply_unified(a, patch) != b:
+            raise SystemExit(f'{label}: diff does not reconstruct its target')
+    print(f'{label}: {len(pairs)} diffs, {identical} byte-identical to difflib, all reconstruct')
+    print(f'  difflib        : {difflib_seconds:8.3f}s')
+    print(f'  doctools.diff  : {engine_seconds:8.3f}s')
+    print(f'  speed-up       : {difflib_seconds / engine_seconds:8.1f}x')
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--edits', type=int, default=6, help='Random edits per mutated copy (default: 6).')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    templates = REPO_ROOT / 'public' / 'templates'
+    en = {path.name: path.read_text(encoding='utf-8', errors='replace').splitlines() for path in sorted((templates / 'en').glob('*.md'))}
+    es = {path.name: path.read_text(encoding='utf-8', errors='replace').splitlines() for path in sorted((templates / 'es').glob('*.md'))}
+
+    compare('en/es template pairs', [(en[name], es[name]) for name in sorted(en.keys() & es.keys())])
+    compare(
+        'templates vs edited copy',
+        [(lines, mutate(lines, args.edits, rng)) for lines in [*en.values(), *es.values()] if lines],
+    )
+    manifest = (REPO_ROOT / 'src' / 'lib' / 'documents' / 'manifest.generated.ts').read_text(encoding='utf-8').splitlines()
+    compare('manifest.generated.ts vs edited copy', [(manifest, mutate(manifest, args.edits * 10, rng))])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+"""Generate a synthetic document library shaped like this repo's.
+
+    python -m doctools.bench.fixtures 10k /tmp/library [--seed N] [--mismatch-rate F]
+
+The tree has ``src/lib/documents/manifest.generated.{json,ts}``, one
+``us/<doc>/metadata.ts`` (CRLF, like the real ones) and ``questions.ts`` per document,
+``template-verification-report.json`` with an alias-count mismatch on a
+fraction of the documents, and en/es templates for a capped sample of them.
+Alias counts follow the real library: 3-8 English aliases per document. The
+aliases missing from Spanish are unique to their document, so the
+fix-spanish-aliases run has to translate them.
+"""
+import argparse
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..fsutil import write_atomic
+from ..report_stream import ALIAS_MISMATCH
+
+SCALES = {'1k': 1_000, '10k': 10_000, '50k': 50_000}
+TEMPLATE_SAMPLE = 500
+
+NOUNS = [
+    ('agreement', 'acuerdo'), ('contract', 'contrato'), ('lease', 'arrendamiento'), ('notice', 'aviso'),
+    ('authorization', 'autorización'), ('release', 'liberación'), ('form', 'formulario'), ('letter', 'carta'),
+    ('affidavit', 'declaración jurada'), ('waiver', 'renuncia'), ('application', 'solicitud'),
+    ('bill of sale', 'factura de venta'), ('power of attorney', 'poder notarial'), ('declaration', 'declaración'),
+    ('addendum', 'anexo'), ('certificate', 'certificado'), ('policy', 'política'), ('receipt', 'recibo'),
+]
+MODIFIERS = [
+    ('rental', 'alquiler'), ('vehicle', 'vehículo'), ('business', 'negocio'), ('property', 'propiedad'),
+    ('employment', 'empleo'), ('payment', 'pago'), ('service', 'servicio'), ('partnership', 'sociedad'),
+    ('loan', 'préstamo'), ('consent', 'consentimiento'), ('confidentiality', 'confidencialidad'),
+    ('construction', 'construcción'), ('purchase', 'compra'), ('marine', 'marítimo'), ('tenant', 'inquilino'),
+    ('medical', 'médico'), ('school', 'escuela'), ('software', 'programa'), ('equipment', 'equipo'),
+    ('travel', 'viaje'), ('storage', 'almacenamiento'), ('livestock', 'ganado'), ('event', 'evento'),
+]
+QUESTION_TYPES = ['text', 'text', 'text', 'textarea', 'select', 'date', 'number', 'boolean', 'address']
+CATEGORIES = ['Business', 'Real Estate', 'Family', 'Finance', 'Employment', 'Personal', 'Risk & Liability']
+
+METADATA_TEMPLATE = """import {{ DocumentMetadata }} from '@/types/documents';
+
+export const {name}Metadata: DocumentMetadata = {{
+  id: '{id}',
+  title: '{title}',
+  slug: '{id}',
+  description:
+    '{description}',
+  category: '{category}',
+  tags: [
+{tags}
+  ],
+  difficulty: '{difficulty}',
+  timeToComplete: '15-20 minutes',
+  price: 16.95,
+  state: 'US',
+  url: '/documents/{id}',
+  translations: {{
+    en: {{
+      name: '{title}',
+      description:
+        '{description}',
+      aliases: [
+{en_aliases}
+      ],
+    }},
+    es: {{
+      name: '{title_es}',
+      description:
+        '{description_es}',
+      aliases: [
+{es_aliases}
+      ],
+    }},
+  }},
+}};
+"""
+QUESTIONS_TEMPLATE = """import type {{ Question }} from '@/types/documents';
+
+export const {name}Questions: Question[] = [
+{fields}
+];
+"""
+
+
+@dataclass
+class FixtureInfo:
+    root: Path
+    documents: int
+    mismatched: int
+    aliases: int
+    templates: int
+
+
+def parse_scale(value: str) -> int:
+    return SCALES.get(value.lower()) or int(value.replace('_', ''))
+
+
+def _camel(doc_id: str) -> str:
+    head, *rest = doc_id.split('-')
+    return head + ''.join(part.capitalize() for part in rest)
+
+
+def _ts_list(values: list[str], indent: str) -> str:
+    return '\n'.join(f"{indent}'{value}'," for value in values)
+
+
+def _aliases(rng: random.Random, count: int) -> list[tuple[str, str]]:
+    pairs = rng.sample([(mod, noun) for mod in MODIFIERS for noun in NOUNS], count)
+    return [(f'{mod_en} {noun_en}', f'{noun_es} de {mod_es}') for (mod_en, mod_es), (noun_en, noun_es) in pairs]
+
+
+def _questions(name: str, rng: random.Random) -> str:
+    fields = []
+    for number in range(1, rng.randint(4, 12)):
+        field_type = rng.choice(QUESTION_TYPES)
+        fields.append(f"  {{\n    id: 'field{number}',\n    label: 'Field {number}',\n    type: '{field_type}',\n    required: true,\n  }},")
+    return QUESTIONS_TEMPLATE.format(name=name, fields='\n'.join(fields))
+
+
+def _template(title: str, aliases: list[str], rng: random.Random) -> str:
+    sections = [f'# {title}', '']
+    for number in range(1, rng.randint(6, 12)):
+        sections += [f'## {number}. {rng.choice(aliases).title()}', '']
+        sections += [
+            f'The parties agree that {{{{party_{number}}}}} will review the {rng.choice(aliases)} before {{{{date_{number}}}}}.'
+            for _ in range(rng.randint(2, 6))
+        ]
+        sections.append('')
+    return '\n'.join(sections)
+
+
+def generate(root: Path, documents: int, seed: int = 0, mismatch_rate: float = 0.2) -> FixtureInfo:
+    rng = random.Random(seed)
+    # Questions draw from their own stream so the rest of the library stays the same for a seed.
+    question_rng = random.Random(seed + 1)
+    documents_dir = root / 'src' / 'lib' / 'documents'
+    templates_dir = root / 'public' / 'templates'
+    entries: list[dict] = []
+    results: list[dict] = []
+    mismatched = aliases_total = templates = 0
+    for index in range(documents):
+        (mod_en, mod_es), (noun_en, noun_es) = rng.choice(MODIFIERS), rng.choice(NOUNS)
+        doc_id = f'{mod_en}-{noun_en}-{index:05d}'.replace(' ', '-')
+        title = f'{mod_en.title()} {noun_en.title()} {index}'
+        title_es = f'{noun_es.capitalize()} de {mod_es} {index}'
+        description = f'Create a {mod_en} {noun_en} for your records.'
+        description_es = f'Cree un {noun_es} de {mod_es} para sus registros.'
+        pairs = _aliases(rng, rng.randint(3, 8))
+        en_aliases = [en for en, _ in pairs]
+        es_aliases = [es for _, es in pairs]
+        if rng.random() < mismatch_rate:
+            kept = rng.randint(1, len(es_aliases) - 1)
+            es_aliases = es_aliases[:kept]
+            # Give the untranslated aliases document-specific wording so they
+            # reach the translator instead of reusing another document's pair.
+            en_aliases[kept:] = [f'{alias} no. {index}' for alias in en_aliases[kept:]]
+            mismatched += 1
+        aliases_total += len(en_aliases) + len(es_aliases)
+
+        metadata = METADATA_TEMPLATE.format(
+            name=_camel(doc_id),
+            id=doc_id,
+            title=title,
+            title_es=title_es,
+            description=description,
+            description_es=description_es,
+            category=rng.choice(CATEGORIES),
+            difficulty=rng.choice(['beginner', 'intermediate', 'advanced']),
+            tags=_ts_list([mod_en, noun_en], '    '),
+            en_aliases=_ts_list(en_aliases, '        '),
+            es_aliases=_ts_list(es_aliases, '        '),
+        )
+        path = documents_dir / 'us' / doc_id / 'metadata.ts'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(metadata.replace('\n', '\r\n').encode('utf-8'))
+        (path.parent / 'questions.ts').write_text(_questions(_camel(doc_id), question_rng), encoding='utf-8')
+
+        entries.append(
+            {
+                'id': doc_id,
+                'importPath': f'./us/{doc_id}',
+                'meta': {
+                    'id': doc_id,
+                    'title': title,
+                    'description': description,
+                    'category': 'Business',
+                    'jurisdiction': 'us',
+                    'tags': [],
+                    'aliases': en_aliases + es_aliases,
+                    'requiresNotary': False,
+                    'states': ['all'],
+                    'translations': {
+                        'en': {'name': title, 'description': description, 'aliases': en_aliases},
+                        'es': {'name': title_es, 'description': description_es, 'aliases': es_aliases},
+                    },
+                },
+            }
+        )
+        for language in ('en', 'es'):
+            errors = []
+            if language == 'en' and len(en_aliases) != len(es_aliases):
+                errors.append(f'{ALIAS_MISMATCH}: EN has {len(en_aliases)}, ES has {len(es_aliases)}.')
+            results.append(
+                {
+                    'path': f'public/templates/{language}/{doc_id}.md',
+                    'isValid': not errors,
+                    'errors': errors,
+                    'warnings': [],
+                    'documentType': doc_id,
+                    'language': language,
+                    'wordCount': rng.randint(300, 3000),
+                }
+            )
+        if index < TEMPLATE_SAMPLE:
+            for language, names in (('en', en_aliases), ('es', es_aliases)):
+                path = templates_dir / language / f'{doc_id}.md'
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(_template(title if language == 'en' else title_es, names, rng), encoding='utf-8')
+                templates += 1
+
+    manifest = {
+        'entries': entries,
+        'metadata': {entry['id']: entry['meta'] for entry in entries},
+        'ids': [entry['id'] for entry in entries],
+        'generatedAt': '2025-01-01T00:00:00.000Z',
+    }
+    write_atomic(documents_dir / 'manifest.generated.json', json.dumps(manifest, indent=2, ensure_ascii=False) + '\n')
+    write_atomic(
+        documents_dir / 'manifest.generated.ts',
+        '// AUTO-GENERATED FILE. DO NOT EDIT DIRECTLY.\n\n'
+        f'export const DOCUMENT_MANIFEST = {json.dumps(entries, indent=2, ensure_ascii=False)};\n',
+    )
+    valid = sum(result['isValid'] for result in results)
+    report = {
+        'timestamp': '2025-01-01T00:00:00.000Z',
+        'summary': {'totalTemplates': len(results), 'validTemplates': valid, 'invalidTemplates': len(results) - valid},
+        'results': results,
+    }
+    write_atomic(root / 'template-verification-report.json', json.dumps(report, indent=2, ensure_ascii=False) + '\n')
+    return FixtureInfo(root, documents, mismatched, aliases_total, templates)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('scale', help=f'Document count or one of {", ".join(SCALES)}.')
+    parser.add_argument('root', type=Path, help='Directory to create the library in.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--mismatch-rate', type=float, default=0.2, help='Share of documents missing es aliases (default: 0.2).')
+    args = parser.parse_args(argv)
+    info = generate(args.root, parse_scale(args.scale), args.seed, args.mismatch_rate)
+    print(f'{info.documents} documents ({info.mismatched} mismatched, {info.aliases} aliases, {info.templates} templates) in {info.root}')
+
+
+if __name__ == '__main__':
+    main()
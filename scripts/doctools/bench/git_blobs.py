@@ -0,0 +1,42 @@
+"""Compare per-file ``git show`` against the batched ``cat-file`` reader.
+
+    python -m doctools.bench.git_blobs [--limit N] [pathspec ...]
+"""
+import argparse
+import subprocess
+import time
+
+from ..git_blobs import GitBlobReader
+from ..paths import REPO_ROOT
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('pathspecs', nargs='*', default=['public/templates/en', 'public/templates/es'])
+    parser.add_argument('--limit', type=int, default=200, help='Number of files to fetch (default: 200).')
+    args = parser.parse_args(argv)
+
+    listing = subprocess.check_output(['git', 'ls-files', '--', *args.pathspecs], cwd=REPO_ROOT, text=True)
+    paths = listing.splitlines()[: args.limit]
+    if not paths:
+        raise SystemExit('No tracked files matched the pathspecs.')
+
+    started = time.perf_counter()
+    spawned = {path: subprocess.check_output(['git', 'show', f'HEAD:{path}'], cwd=REPO_ROOT) for path in paths}
+    spawn_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with GitBlobReader() as reader:
+        batched = reader.read_many(paths)
+    batch_seconds = time.perf_counter() - started
+
+    if spawned != batched:
+        raise SystemExit('Blob contents differ between the two readers.')
+    print(f'{len(paths)} blobs')
+    print(f'  git show per file : {spawn_seconds:8.3f}s ({len(paths) / spawn_seconds:8.0f} files/s)')
+    print(f'  cat-file --batch  : {batch_seconds:8.3f}s ({len(paths) / batch_seconds:8.0f} files/s)')
+    print(f'  speed-up          : {spawn_seconds / batch_seconds:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
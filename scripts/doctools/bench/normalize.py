@@ -0,0 +1,66 @@
+"""Compare the original ``normalize_es`` with the fast path on every manifest alias.
+
+    python -m doctools.bench.normalize [--rounds N]
+
+Times four variants over all en/es aliases in ``manifest.generated.json``:
+the original NFD-and-filter implementation, the unmemoized fast path, the
+memoized ``normalize_es`` on a warm cache (the repeated-probe case), and the
+batch API both per document alias list and over every alias at once.
+"""
+import argparse
+import json
+import time
+import unicodedata
+
+from ..normalize import fold_es, normalize_es, normalize_es_many
+from ..paths import MANIFEST_PATH
+
+
+def original_normalize_es(value: str) -> str:
+    normalized = unicodedata.normalize('NFD', value.strip().lower())
+    return ''.join(ch for ch in normalized if unicodedata.category(ch) != 'Mn')
+
+
+def timed(label: str, rounds: int, func, baseline: float | None = None) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    seconds = (time.perf_counter() - started) / rounds
+    speedup = f'{baseline / seconds:8.1f}x' if baseline else ''
+    print(f'  {label:<24} {seconds * 1000:9.3f} ms/pass {speedup}')
+    return seconds
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    entries = json.loads(MANIFEST_PATH.read_text(encoding='utf-8'))['entries']
+    lists = [
+        entry['meta']['translations'][locale].get('aliases', [])
+        for entry in entries
+        for locale in ('en', 'es')
+        if locale in entry['meta'].get('translations', {})
+    ]
+    aliases = [alias for group in lists for alias in group]
+    expected = [original_normalize_es(alias) for alias in aliases]
+    if [fold_es(alias) for alias in aliases] != expected:
+        raise SystemExit('fold_es disagrees with the original implementation.')
+    if [key for group in lists for key in normalize_es_many(group)] != expected:
+        raise SystemExit('normalize_es_many disagrees with the original implementation.')
+
+    non_ascii = sum(not alias.isascii() for alias in aliases)
+    print(f'{len(aliases)} aliases ({non_ascii} non-ASCII) in {len(lists)} lists, all outputs identical')
+    baseline = timed('original', args.rounds, lambda: [original_normalize_es(alias) for alias in aliases])
+    timed('fast path (no memo)', args.rounds, lambda: [fold_es(alias) for alias in aliases], baseline)
+    normalize_es.cache_clear()
+    for alias in aliases:
+        normalize_es(alias)
+    timed('memoized (warm)', args.rounds, lambda: [normalize_es(alias) for alias in aliases], baseline)
+    timed('batch per list', args.rounds, lambda: [normalize_es_many(group) for group in lists], baseline)
+    timed('batch, one call', args.rounds, lambda: normalize_es_many(aliases), baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+"""Run the maintenance scripts against synthetic libraries and compare with a baseline.
+
+    python -m doctools.bench.suite [--scales 1k,10k,50k] [--save-baseline] [--tolerance 0.25]
+
+For each scale a fresh library is generated with ``bench.fixtures`` and these
+run against it, each in its own process:
+
+``diff``
+    ``doctools.diff`` over the en/es template sample and over
+    ``manifest.generated.ts`` against an edited copy.
+``codemod``
+    ``codemod_runner`` bulk-patching every ``metadata.ts``.
+``fix-spanish-aliases``
+    the full pipeline with the fake translator and no rate limit.
+
+Wall time, documents per second and the child's peak RSS are recorded. With
+a baseline (default ``state/bench-baseline.json``) every result is compared
+to it and the exit status is 1 if any got slower or bigger by more than
+``--tolerance``. ``--save-baseline`` stores this run as the new baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .. import diff
+from ..fsutil import write_atomic
+from ..paths import REPO_ROOT, STATE_DIR
+from .diff import mutate
+from .fixtures import parse_scale
+
+SCRIPTS_DIR = REPO_ROOT / 'scripts'
+DEFAULT_BASELINE = STATE_DIR / 'bench-baseline.json'
+CODEMOD_SPEC = [
+    {'anchor': "timeToComplete: '15-20 minutes',", 'replacement': "timeToComplete: '15–20 minutes',", 'name': 'en dash'},
+    {'anchor': "difficulty: 'beginner',", 'replacement': "difficulty: 'easy',", 'name': 'difficulty'},
+]
+
+
+def diff_worker(root: Path) -> None:
+    rng = random.Random(0)
+    templates = root / 'public' / 'templates'
+    for en in sorted((templates / 'en').glob('*.md')):
+        a = en.read_text(encoding='utf-8').splitlines()
+        b = (templates / 'es' / en.name).read_text(encoding='utf-8').splitlines()
+        list(diff.unified_diff(a, b, f'a/{en.name}', f'b/{en.name}', lineterm=''))
+    manifest = (root / 'src' / 'lib' / 'documents' / 'manifest.generated.ts').read_text(encoding='utf-8').splitlines()
+    list(diff.unified_diff(manifest, mutate(manifest, 60, rng), 'a', 'b', lineterm=''))
+
+
+def commands(root: Path) -> dict[str, list[str]]:
+    spec = root / 'codemod-spec.json'
+    spec.write_text(json.dumps(CODEMOD_SPEC, ensure_ascii=False), encoding='utf-8')
+    return {
+        'diff': [sys.executable, '-m', 'doctools.bench.suite', '--diff-worker', str(root)],
+        'codemod': [
+            sys.executable, '-m', 'doctools.codemod_runner', '--spec', str(spec), '--root', str(root),
+            'src/lib/documents/us/*/metadata.ts',
+        ],
+        'fix-spanish-aliases': [
+            sys.executable, str(SCRIPTS_DIR / 'fix-spanish-aliases.py'), '--root', str(root),
+            '--translator', 'fake', '--rate', '1e9', '--concurrency', '8', '--no-manifest-patch',
+        ],
+    }
+
+
+def _maxrss_mb(rusage) -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return round(rusage.ru_maxrss * scale / 1e6, 1)
+
+
+def run_measured(command: list[str], log_path: Path) -> tuple[float, float | None]:
+    """Run ``command`` to completion; returns wall seconds and peak RSS in MB (None without wait4)."""
+    with open(log_path, 'wb') as log:
+        started = time.perf_counter()
+        process = subprocess.Popen(command, cwd=SCRIPTS_DIR, stdout=log, stderr=subprocess.STDOUT)
+        if hasattr(os, 'wait4'):
+            _, status, rusage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            rss = _maxrss_mb(rusage)
+        else:
+            process.wait()
+            rss = None
+        seconds = time.perf_counter() - started
+    if process.returncode != 0:
+        tail = log_path.read_text(encoding='utf-8', errors='replace')[-2000:]
+        raise SystemExit(f'{" ".join(command[1:3])} failed with exit status {process.returncode}:\n{tail}')
+    return seconds, rss
+
+
+def run_scale(label: str, work_dir: Path, seed: int) -> dict[str, dict]:
+    documents = parse_scale(label)
+    root = work_dir / label
+    # Generate in a child: Linux carries the parent's peak RSS across fork and
+    # exec, so the suite itself has to stay small for the measurements to mean anything.
+    seconds, _ = run_measured(
+        [sys.executable, '-m', 'doctools.bench.fixtures', str(documents), str(root), '--seed', str(seed)],
+        work_dir / f'{label}-fixtures.log',
+    )
+    print(f'{label}: {(work_dir / f"{label}-fixtures.log").read_text(encoding="utf-8").strip()} (generated in {seconds:.1f}s)')
+    results: dict[str, dict] = {}
+    for name, command in commands(root).items():
+        seconds, rss = run_measured(command, work_dir / f'{label}-{name}.log')
+        results[name] = {'seconds': round(seconds, 3), 'docs_per_second': round(documents / seconds, 1), 'peak_rss_mb': rss}
+        print(f'  {name:<22} {seconds:8.2f}s {documents / seconds:10.0f} docs/s {rss if rss is not None else "-":>8} MB')
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    regressions: list[str] = []
+    print(f'vs baseline (tolerance {tolerance:.0%}):')
+    for label, benches in results.items():
+        for name, current in benches.items():
+            previous = baseline.get(label, {}).get(name)
+            if previous is None:
+                print(f'  {label} {name:<22} no baseline')
+                continue
+            notes = []
+            for metric in ('seconds', 'peak_rss_mb'):
+                if not previous.get(metric) or current.get(metric) is None:
+                    continue
+                change = current[metric] / previous[metric] - 1
+                notes.append(f'{metric} {change:+.0%}')
+                if change > tolerance:
+                    regressions.append(f'{label} {name}: {metric} {previous[metric]} -> {current[metric]} ({change:+.0%})')
+            print(f'  {label} {name:<22} {", ".join(notes)}')
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', default='1k', help='Comma-separated scales: 1k, 10k, 50k or a document count (default: 1k).')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help='Baseline JSON (default: state/bench-baseline.json).')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown or growth before failing (default: 0.25).')
+    parser.add_argument('--output', type=Path, help='Also write this run as JSON.')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated libraries and logs.')
+    parser.add_argument('--diff-worker', type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.diff_worker:
+        diff_worker(args.diff_worker)
+        return 0
+
+    work_dir = Path(tempfile.mkdtemp(prefix='doctools-bench-'))
+    try:
+        results = {label: run_scale(label, work_dir, args.seed) for label in args.scales.split(',')}
+    finally:
+        if args.keep:
+            print(f'kept {work_dir}')
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    run = {'python': platform.python_version(), 'machine': platform.machine(), 'cpus': os.cpu_count(), 'results': results}
+    if args.output:
+        write_atomic(args.output, json.dumps(run, indent=2) + '\n')
+    regressions: list[str] = []
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        regressions = compare(results, baseline.get('results', {}), args.tolerance)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(args.baseline, json.dumps(run, indent=2) + '\n')
+        print(f'saved baseline to {args.baseline}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,49 @@
+"""Lookup latency and leave-one-out reuse of the translation memory.
+
+    python -m doctools.bench.translation_memory [--threshold F]
+
+Every manifest (en, es) pair is looked up against the memory with its own
+entry excluded, as if that alias were new. The report gives the lookup time
+and, per threshold, how many aliases would have reused a neighbour's Spanish
+instead of going to the translator.
+"""
+import argparse
+import time
+
+from ..manifest import load_manifest
+from ..paths import MANIFEST_PATH
+from ..translation_memory import DEFAULT_THRESHOLD, TranslationMemory, manifest_pairs, memory_key, same_terms
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threshold', type=float, action='append', help=f'Threshold to report (default: 0.6-0.9 and {DEFAULT_THRESHOLD}).')
+    parser.add_argument('--show', action='store_true', help='List the accepted matches at the default threshold.')
+    args = parser.parse_args(argv)
+
+    pairs = list(manifest_pairs(load_manifest(MANIFEST_PATH).entries))
+    started = time.perf_counter()
+    memory = TranslationMemory.from_pairs(pairs)
+    print(f'memory: {len(memory)} entries from {len(pairs)} pairs, built in {(time.perf_counter() - started) * 1000:.1f} ms')
+
+    started = time.perf_counter()
+    best = []
+    for english, _ in pairs:
+        key = memory_key(english)
+        matches = [match for match in memory.lookup(english, limit=6, min_score=0.5) if match.source != key]
+        best.append((english, key, matches[0] if matches else None))
+    seconds = time.perf_counter() - started
+    print(f'lookup: {seconds / len(pairs) * 1e6:.1f} us/query over {len(pairs)} queries')
+
+    for threshold in sorted(set(args.threshold or [0.6, 0.7, 0.8, 0.9, DEFAULT_THRESHOLD])):
+        accepted = [(english, match) for english, key, match in best
+                    if match and match.score >= threshold and same_terms(key, match.source)]
+        near = sum(1 for _, _, match in best if match and match.score >= threshold)
+        print(f'  >= {threshold:<5g} {len(accepted):5d} reused ({near} scored high enough, {near - len(accepted)} rejected for differing terms)')
+        if args.show and threshold == DEFAULT_THRESHOLD:
+            for english, match in accepted:
+                print(f'      {match.score:5.2f}  {english} <- {match.source} -> {match.translations[0]}')
+
+
+if __name__ == '__main__':
+    main()
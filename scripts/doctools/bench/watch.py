@@ -0,0 +1,167 @@
+"""Stress the watch mode with single and bulk edits to a synthetic library.
+
+    python -m doctools.bench.watch [--documents N] [--bulk N] [--singles N]
+
+A ``bench.fixtures`` library (no alias mismatches to start with) is watched
+from a background thread while this process edits it. Edits alternate
+between dropping the last Spanish alias of a ``metadata.ts`` and giving a
+``questions.ts`` field an unsupported type.
+
+``single``
+    one folder at a time, waiting for its report: save-to-report latency;
+``bulk``
+    ``--bulk`` folders written back to back, then all reverted: time from the
+    last write until every folder was reported, and how often each folder was
+    checked (debouncing should make that once).
+
+Every report must show the edit's problem, and the revert's report must not.
+The exit status is 1 if any report is missing or wrong.
+"""
+import argparse
+import re
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from ..manifest_patch import read_aliases
+from ..question_types import supported_types
+from ..report_stream import ALIAS_MISMATCH
+from ..ts_literals import rewrite_alias_arrays
+from ..watch import DEFAULT_DEBOUNCE, DEFAULT_INTERVAL, FolderReport, Watcher
+from .fixtures import generate
+
+FIELD_TYPE_RE = re.compile(r"type: '[a-z-]+'")
+UNSUPPORTED = 'slider'
+
+
+class Collector:
+    def __init__(self):
+        self.reports: dict[str, list[tuple[float, FolderReport]]] = {}
+        self.condition = threading.Condition()
+
+    def __call__(self, report: FolderReport) -> None:
+        with self.condition:
+            self.reports.setdefault(report.folder, []).append((time.monotonic(), report))
+            self.condition.notify_all()
+
+    def wait(self, folders: list[str], since: float, timeout: float = 30.0) -> dict[str, list[tuple[float, FolderReport]]]:
+        """Reports made after ``since`` for each folder, once every folder has one."""
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while True:
+                found = {folder: [item for item in self.reports.get(folder, []) if item[0] >= since] for folder in folders}
+                if all(found.values()) or not self.condition.wait(deadline - time.monotonic()):
+                    return found
+
+
+def edit(folder: Path, kind: str) -> tuple[Path, bytes, str]:
+    """Break ``folder`` in one way; returns the file, its original bytes and the expected problem."""
+    if kind == 'alias':
+        path = folder / 'metadata.ts'
+        original = path.read_bytes()
+        content = original.decode('utf-8')
+        content = rewrite_alias_arrays(content, {'es': read_aliases(path)['es'][:-1]})
+        path.write_bytes(content.encode('utf-8'))
+        return path, original, ALIAS_MISMATCH
+    path = folder / 'questions.ts'
+    original = path.read_bytes()
+    path.write_bytes(FIELD_TYPE_RE.sub(f"type: '{UNSUPPORTED}'", original.decode('utf-8'), count=1).encode('utf-8'))
+    return path, original, f'Unsupported question type {UNSUPPORTED!r}'
+
+
+def has_problem(report: FolderReport, expected: str) -> bool:
+    return any(expected in problem for problem in report.problems)
+
+
+def percentiles(values: list[float]) -> str:
+    values = sorted(values)
+    p95 = values[min(len(values) - 1, round(len(values) * 0.95))]
+    return f'p50 {statistics.median(values) * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms, max {values[-1] * 1000:.0f} ms'
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--documents', type=int, default=1000, help='Library size (default: 1000).')
+    parser.add_argument('--bulk', type=int, default=300, help='Folders edited at once in the bulk round (default: 300).')
+    parser.add_argument('--singles', type=int, default=20, help='Single-folder edits to time (default: 20).')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL)
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    work_dir = Path(tempfile.mkdtemp(prefix='doctools-watch-'))
+    failures: list[str] = []
+    try:
+        generate(work_dir, args.documents, args.seed, mismatch_rate=0.0)
+        documents_dir = work_dir / 'src' / 'lib' / 'documents'
+        watcher = Watcher(documents_dir, supported_types(), args.debounce)
+        started = time.perf_counter()
+        watcher.load(snapshot_dir=None)
+        print(f'{args.documents} folders loaded and checked in {(time.perf_counter() - started) * 1000:.0f} ms')
+        started = time.perf_counter()
+        for _ in range(20):
+            watcher.scan()
+        print(f'poll: {(time.perf_counter() - started) / 20 * 1000:.1f} ms per scan, every {args.interval * 1000:.0f} ms')
+
+        collector = Collector()
+        stop = threading.Event()
+        thread = threading.Thread(target=watcher.run, args=(collector, args.interval, stop), daemon=True)
+        thread.start()
+        folders = sorted(watcher.signatures)
+        kinds = ('alias', 'questions')
+
+        latencies: list[float] = []
+        for number, folder in enumerate(folders[:args.singles]):
+            path, original, expected = edit(documents_dir / folder, kinds[number % 2])
+            saved = time.monotonic()
+            found = collector.wait([folder], saved)[folder]
+            if not found or not has_problem(found[0][1], expected):
+                failures.append(f'single {folder}: expected {expected!r}, got {found[0][1].problems if found else "no report"}')
+            else:
+                latencies.append(found[0][0] - saved)
+            path.write_bytes(original)
+            collector.wait([folder], time.monotonic())
+        if latencies:
+            print(f'single: {len(latencies)} edits, save-to-report {percentiles(latencies)}')
+
+        targets = folders[args.singles:args.singles + args.bulk]
+        for phase in ('bulk edit', 'bulk revert'):
+            started = time.monotonic()
+            if phase == 'bulk edit':
+                edits = {folder: edit(documents_dir / folder, kinds[number % 2]) for number, folder in enumerate(targets)}
+            else:
+                for path, original, _ in edits.values():
+                    path.write_bytes(original)
+            written = time.monotonic()
+            # Early folders may be reported while later ones are still being written.
+            found = collector.wait(targets, started)
+            missing = [folder for folder in targets if not found[folder]]
+            wrong = [
+                folder for folder in targets
+                if found[folder] and has_problem(found[folder][-1][1], edits[folder][2]) != (phase == 'bulk edit')
+            ]
+            failures += [f'{phase} {folder}: no report' for folder in missing]
+            failures += [f'{phase} {folder}: {found[folder][-1][1].problems}' for folder in wrong]
+            time.sleep(args.debounce + 2 * args.interval)
+            checks = sum(len([item for item in collector.reports.get(folder, []) if item[0] >= started]) for folder in targets)
+            last = max((item[0] for items in found.values() for item in items), default=written)
+            print(
+                f'{phase}: {len(targets)} folders written in {(written - started) * 1000:.0f} ms, all reported '
+                f'{(last - written) * 1000:.0f} ms after the last write, {checks / len(targets):.2f} checks per folder'
+            )
+        stop.set()
+        thread.join()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    for failure in failures[:20]:
+        print(f'FAIL {failure}')
+    print(f'{len(failures)} failures' if failures else 'all reports correct')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+"""One entry point for the Python maintenance scripts.
+
+    cd scripts && python -m doctools [--keep-going] COMMAND [ARGS...] [+ COMMAND [ARGS...]]...
+
+Each command's module is imported only when that command runs, so listing
+the commands (``--help``) loads nothing beyond this file. ``+`` chains
+commands in one process, where they share the ``doctools.workspace`` cache:
+the manifest and the verification report are parsed once, and reloaded only
+when an earlier step rewrote them. For example::
+
+    python -m doctools verify --output ../template-verification-report.json \\
+        + fix-aliases --offline --changed-ids /tmp/changed.json \\
+        + diff --changed src/lib/documents
+
+A chain stops at the first command that exits non-zero unless
+``--keep-going`` comes before the first command; the exit status is then the
+first non-zero one. ``verify`` exits 0 when it finds invalid templates (pass
+``--strict`` to gate on them), so it does not stop a chain by itself.
+"""
+import sys
+
+SEPARATOR = '+'
+# name -> (module, summary); summaries live here so --help needs no imports.
+COMMANDS = {
+    'verify': ('template_verify', 'Verify en/es templates against the document manifest.'),
+    'fix-aliases': ('fix_aliases', 'Restore en/es alias parity in document metadata.'),
+    'patch-manifest': ('manifest_patch', 'Patch changed documents into the generated manifests.'),
+    'diff': ('worktree_diff', 'Write HEAD-vs-working-tree diffs into ops/tmp.'),
+    'watch': ('watch', 'Re-check alias parity and question types as document folders are saved.'),
+    'alias-index': ('alias_index', 'Build or query the bilingual alias search index.'),
+    'memory': ('translation_memory', 'Look up English aliases in the manifest translation memory.'),
+    'codemod': ('codemod_runner', 'Apply anchored patches to every file matching the targets.'),
+    'mojibake': ('mojibake', 'Scan text files for mojibake and optionally repair it.'),
+    'question-types': ('question_types', 'Index question field types across document questions.ts files.'),
+    'team-memory': ('memory_store', 'Inspect, update or compact TEAM memory stores.'),
+}
+
+
+def usage() -> str:
+    lines = [
+        'usage: python -m doctools [--keep-going] COMMAND [ARGS...] [+ COMMAND [ARGS...]]...',
+        '',
+        'commands:',
+        *(f'  {name:<16}{summary}' for name, (_, summary) in COMMANDS.items()),
+        '',
+        '--keep-going runs every command of a chain even after one fails',
+        '(verify only fails on invalid templates with --strict).',
+        "Run 'python -m doctools COMMAND --help' for a command's options.",
+    ]
+    return '\n'.join(lines)
+
+
+def split_chain(argv: list[str]) -> list[list[str]]:
+    chain: list[list[str]] = [[]]
+    for arg in argv:
+        if arg == SEPARATOR:
+            chain.append([])
+        else:
+            chain[-1].append(arg)
+    return chain
+
+
+def run(name: str, args: list[str]) -> int:
+    from importlib import import_module
+
+    module = import_module(f'{__package__}.{COMMANDS[name][0]}')
+    program = sys.argv[0]
+    # argparse takes the program name from argv[0]; show the subcommand in usage lines.
+    sys.argv[0] = f'doctools {name}'
+    try:
+        return module.main(args) or 0
+    except SystemExit as exit:
+        return exit.code if isinstance(exit.code, int) else (0 if exit.code is None else 1)
+    finally:
+        sys.argv[0] = program
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0 if argv else 2
+    keep_going = argv[0] in ('-k', '--keep-going')
+    chain = split_chain(argv[1:] if keep_going else argv)
+    for step in chain:
+        if not step or step[0] not in COMMANDS:
+            print(usage(), file=sys.stderr)
+            print(f'\ndoctools: unknown command {step[0] if step else "(empty)"!r}', file=sys.stderr)
+            return 2
+
+    result = 0
+    for position, (name, *args) in enumerate(chain):
+        status = run(name, args)
+        if status and position < len(chain) - 1:
+            print(f'doctools: {name} exited with status {status}; '
+                  f'{"continuing" if keep_going else "stopping the chain"}.', file=sys.stderr)
+        result = result or status
+        if status and not keep_going:
+            break
+    if len(chain) > 1:
+        from . import workspace
+
+        print(workspace.summary(), file=sys.stderr)
+    return result
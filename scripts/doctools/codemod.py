@@ -0,0 +1,215 @@
+"""Declarative anchored-patch codemods.
+
+A ``Patch`` names a literal anchor, its replacement and how many times the
+anchor is expected to occur. ``Codemod`` groups patches by file and applies
+them with one read and one write per file:
+
+* anchors and file text are compared with ``\\n`` line endings, so a patch
+  written with ``\\r\\n`` literals applies to LF files and vice versa; the
+  file's own newline style is restored on write;
+* every anchor for a file is located in a single Aho-Corasick scan, and
+  overlapping matches resolve leftmost-first; among matches starting at the
+  same offset the longest anchor wins, then the earlier patch;
+* all replacements are spliced into the original text at once, so an anchor
+  never matches text produced by another patch in the same run;
+* ``dry_run`` returns unified diffs instead of writing.
+"""
+import difflib
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import instrument
+from .fsutil import write_atomic
+from .paths import REPO_ROOT
+
+
+class PatchError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Patch:
+    anchor: str
+    replacement: str
+    # Exact number of occurrences required; ``None`` accepts any number, including none.
+    count: int | None = 1
+    name: str = ''
+
+    def label(self) -> str:
+        return self.name or repr(self.anchor[:40] + ('...' if len(self.anchor) > 40 else ''))
+
+
+def posix_path(path: str | Path) -> str:
+    """Normalize Windows-style ``src\\components\\x.tsx`` paths and globs to POSIX separators."""
+    return str(path).replace('\\\\', '/').replace('\\', '/')
+
+
+def normalize_newlines(text: str) -> str:
+    return text.replace('\r\n', '\n')
+
+
+def detect_newline(text: str) -> str:
+    crlf = text.count('\r\n')
+    return '\r\n' if crlf and crlf >= text.count('\n') - crlf else '\n'
+
+
+class AhoCorasick:
+    """Multi-pattern literal matcher: one pass over the text finds every anchor.
+
+    ``finditer`` reports all matches, overlapping ones included, in order of
+    their end offset; choosing between overlaps is left to the caller.
+    """
+
+    def __init__(self, patterns: list[str]):
+        self.patterns = patterns
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        for index, pattern in enumerate(patterns):
+            if not pattern:
+                raise PatchError(f'Empty anchor for pattern #{index}')
+            state = 0
+            for char in pattern:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def finditer(self, text: str):
+        """Yield ``(start, pattern_index)`` for every (possibly overlapping) match."""
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        root = goto[0]
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0) if state else root.get(char, 0)
+            if out[state]:
+                for index in out[state]:
+                    yield position - len(patterns[index]) + 1, index
+
+
+def apply_patches(text: str, patches: list[Patch]) -> tuple[str, list[int]]:
+    """Apply ``patches`` to ``text``; returns the new text and per-patch match counts."""
+    newline = detect_newline(text)
+    normalized = normalize_newlines(text)
+    anchors = [normalize_newlines(patch.anchor) for patch in patches]
+    matcher = AhoCorasick(anchors)
+    matches = sorted(matcher.finditer(normalized), key=lambda item: (item[0], -len(anchors[item[1]]), item[1]))
+
+    counts = [0] * len(patches)
+    parts: list[str] = []
+    cursor = 0
+    for start, index in matches:
+        if start < cursor:
+            continue
+        parts.append(normalized[cursor:start])
+        parts.append(normalize_newlines(patches[index].replacement))
+        cursor = start + len(anchors[index])
+        counts[index] += 1
+    parts.append(normalized[cursor:])
+
+    failures = [
+        f'{patch.label()}: expected {patch.count}, found {found}'
+        for patch, found in zip(patches, counts)
+        if patch.count is not None and found != patch.count
+    ]
+    if failures:
+        raise PatchError('; '.join(failures))
+
+    if not any(counts):
+        return text, counts
+    result = ''.join(parts)
+    if newline == '\r\n':
+        result = result.replace('\n', '\r\n')
+    return result, counts
+
+
+@dataclass
+class FileResult:
+    path: Path
+    counts: list[int]
+    changed: bool
+    diff: str = ''
+
+
+@dataclass
+class Codemod:
+    root: Path = REPO_ROOT
+    files: dict[Path, list[Patch]] = field(default_factory=dict)
+
+    def add(self, path: str | Path, *patches: Patch) -> 'Codemod':
+        self.files.setdefault(Path(posix_path(path)), []).extend(patches)
+        return self
+
+    def apply_file(self, path: Path, patches: list[Patch], dry_run: bool = False) -> FileResult:
+        target = path if path.is_absolute() else self.root / path
+        with instrument.phase('read'):
+            raw = target.read_bytes()
+        bom = raw.startswith(b'\xef\xbb\xbf')
+        original = raw.decode('utf-8-sig')
+        try:
+            with instrument.phase('patch'):
+                updated, counts = apply_patches(original, patches)
+        except PatchError as error:
+            raise PatchError(f'{path.as_posix()}: {error}') from None
+        result = FileResult(path, counts, updated != original)
+        instrument.count('codemod.replacements', sum(counts))
+        if dry_run:
+            if result.changed:
+                result.diff = ''.join(
+                    difflib.unified_diff(
+                        normalize_newlines(original).splitlines(keepends=True),
+                        normalize_newlines(updated).splitlines(keepends=True),
+                        fromfile=f'a/{path.as_posix()}',
+                        tofile=f'b/{path.as_posix()}',
+                    )
+                )
+        elif result.changed:
+            with instrument.phase('write'):
+                write_atomic(target, ('\ufeff' if bom else '') + updated)
+            instrument.count('codemod.files_written')
+        return result
+
+    def run(self, dry_run: bool = False) -> list[FileResult]:
+        return [self.apply_file(path, patches, dry_run) for path, patches in self.files.items()]
+
+
+def run_codemod_cli(codemod: Codemod, argv: list[str] | None = None) -> list[FileResult]:
+    """Shared entry point for patch scripts: ``--dry-run`` prints diffs instead of writing."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Apply anchored source patches.')
+    parser.add_argument('--dry-run', action='store_true', help='Print a unified diff instead of writing files.')
+    instrument.add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    instrument.start(Path(sys.argv[0]).stem, args)
+    try:
+        results = codemod.run(dry_run=args.dry_run)
+    except (PatchError, FileNotFoundError) as error:
+        raise SystemExit(str(error))
+    for result in results:
+        if args.dry_run:
+            sys.stdout.write(result.diff)
+        status = 'changed' if result.changed else 'unchanged'
+        print(f'{result.path.as_posix()}: {sum(result.counts)} replacements ({status})', file=sys.stderr)
+    return results
@@ -0,0 +1,189 @@
+"""Apply codemod patches across a glob of files with a worker pool.
+
+Usage::
+
+    python -m doctools.codemod_runner --spec patches.json 'src/**/*.tsx' [--dry-run]
+
+``patches.json`` is a list of ``{"anchor": ..., "replacement": ...}`` objects
+(``name`` is optional). In bulk mode a patch may match any number of times
+per file. Before full matching, each file is memory-mapped and skipped unless
+it contains the rarest substring of at least one anchor, which rules out
+almost every file in a large tree for the cost of a ``find`` on raw bytes.
+"""
+import argparse
+import dataclasses
+import json
+import mmap
+import os
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+from .codemod import Codemod, Patch, PatchError, normalize_newlines, posix_path
+from .paths import REPO_ROOT
+
+# Rough byte frequencies for TypeScript/Markdown sources: a lower rank is more common.
+# Letters in "etaoinsrhl", spaces and common punctuation dominate real code.
+_COMMON = b' etaoinsrhldcumfpgwybvk\n\r.,;:()\'"{}=<>/-_'
+BYTE_RANK = {byte: 255 for byte in range(256)}
+for rank, byte in enumerate(_COMMON):
+    BYTE_RANK[byte] = rank * 4
+for byte in range(128, 256):
+    BYTE_RANK[byte] = 40
+
+
+def expand_targets(patterns: list[str], root: Path = REPO_ROOT) -> list[Path]:
+    seen: dict[Path, None] = {}
+    for pattern in patterns:
+        pattern = posix_path(pattern)
+        if Path(pattern).is_absolute():
+            matches = [Path(pattern)] if Path(pattern).is_file() else []
+        else:
+            matches = sorted(root.glob(pattern))
+        for path in matches:
+            if path.is_file() and 'node_modules' not in path.parts:
+                seen.setdefault(path, None)
+    return list(seen)
+
+
+def rarest_substring(anchor: str, length: int = 12) -> bytes:
+    """Pick the window of the anchor whose bytes are least common in source code.
+
+    Windows never span a line break, so the needle matches regardless of the
+    target file's line endings.
+    """
+    best: bytes = b''
+    best_score = -1.0
+    for line in normalize_newlines(anchor).split('\n'):
+        data = line.encode('utf-8')
+        if not data:
+            continue
+        size = min(length, len(data))
+        for start in range(0, len(data) - size + 1):
+            window = data[start:start + size]
+            score = sum(BYTE_RANK[byte] for byte in window)
+            if score > best_score:
+                best, best_score = window, score
+    return best
+
+
+@dataclasses.dataclass
+class BulkReport:
+    scanned: int = 0
+    candidates: int = 0
+    changed: list[str] = dataclasses.field(default_factory=list)
+    errors: list[str] = dataclasses.field(default_factory=list)
+    diffs: list[str] = dataclasses.field(default_factory=list)
+    replacements: int = 0
+    bytes_scanned: int = 0
+    seconds: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.scanned / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes_scanned / 1_000_000 / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        return (
+            f'Scanned {self.scanned} files ({self.bytes_scanned / 1_000_000:.1f} MB), '
+            f'{self.candidates} prefilter candidates, {len(self.changed)} changed, '
+            f'{self.replacements} replacements in {self.seconds:.2f}s '
+            f'({self.files_per_second:.0f} files/s, {self.mb_per_second:.1f} MB/s)'
+        )
+
+
+_worker_state: dict = {}
+
+
+def _init_worker(patches: list[Patch], needles: list[bytes], dry_run: bool) -> None:
+    _worker_state.update(patches=patches, needles=needles, dry_run=dry_run)
+
+
+def _contains_any(path: Path, needles: list[bytes]) -> tuple[bool, int]:
+    with path.open('rb') as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size == 0:
+            return False, 0
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            return any(view.find(needle) != -1 for needle in needles), size
+
+
+def _process_file(path: Path) -> tuple[str, int, bool, bool, int, str, str | None]:
+    """Return ``(path, size, candidate, changed, replacements, diff, error)``."""
+    try:
+        candidate, size = _contains_any(path, _worker_state['needles'])
+        if not candidate:
+            return str(path), size, False, False, 0, '', None
+        result = Codemod(root=path.parent).apply_file(path, _worker_state['patches'], _worker_state['dry_run'])
+        return str(path), size, True, result.changed, sum(result.counts), result.diff, None
+    except (OSError, UnicodeDecodeError, PatchError) as error:
+        return str(path), 0, True, False, 0, '', f'{type(error).__name__}: {error}'
+
+
+def run_bulk(
+    patches: list[Patch],
+    targets: list[str],
+    root: Path = REPO_ROOT,
+    workers: int | None = None,
+    dry_run: bool = False,
+) -> BulkReport:
+    patches = [dataclasses.replace(patch, count=None) for patch in patches]
+    needles = [rarest_substring(patch.anchor) for patch in patches]
+    files = expand_targets(targets, root)
+    report = BulkReport()
+    started = time.perf_counter()
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers > 1 and len(files) > 1:
+        with Pool(workers, initializer=_init_worker, initargs=(patches, needles, dry_run)) as pool:
+            results = list(pool.imap_unordered(_process_file, files, chunksize=max(1, len(files) // (workers * 8))))
+    else:
+        _init_worker(patches, needles, dry_run)
+        results = [_process_file(path) for path in files]
+
+    for path, size, candidate, changed, replacements, diff, error in results:
+        report.scanned += 1
+        report.bytes_scanned += size
+        report.candidates += candidate
+        report.replacements += replacements
+        if changed:
+            report.changed.append(Path(path).relative_to(root).as_posix() if Path(path).is_relative_to(root) else path)
+        if diff:
+            report.diffs.append(diff)
+        if error:
+            report.errors.append(f'{path}: {error}')
+    report.changed.sort()
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def load_spec(path: Path) -> list[Patch]:
+    data = json.loads(path.read_text(encoding='utf-8'))
+    return [Patch(item['anchor'], item['replacement'], count=None, name=item.get('name', '')) for item in data]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Apply anchored patches to every file matching the targets.')
+    parser.add_argument('targets', nargs='+', help="Glob patterns relative to the repo root, e.g. 'src/**/*.tsx'.")
+    parser.add_argument('--spec', type=Path, required=True, help='JSON list of {anchor, replacement, name?} patches.')
+    parser.add_argument('--root', type=Path, default=REPO_ROOT, help='Directory the globs are resolved against.')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count).')
+    parser.add_argument('--dry-run', action='store_true', help='Print unified diffs instead of writing files.')
+    args = parser.parse_args(argv)
+
+    report = run_bulk(load_spec(args.spec), args.targets, args.root.resolve(), args.workers, args.dry_run)
+    for diff in report.diffs:
+        sys.stdout.write(diff)
+    for path in report.changed:
+        print(f'{"would change" if args.dry_run else "changed"}: {path}', file=sys.stderr)
+    for error in report.errors:
+        print(f'error: {error}', file=sys.stderr)
+    print(report.summary(), file=sys.stderr)
+    return 1 if report.errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
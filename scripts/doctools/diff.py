@@ -0,0 +1,239 @@
+"""Line diff with patience anchoring and difflib-compatible output.
+
+``difflib.SequenceMatcher`` searches for the longest matching block at every
+level of recursion, which gets slow on long files with scattered edits (the
+generated manifests, large templates). This module interns lines to integers,
+trims the common prefix and suffix, and anchors each region on the longest
+increasing run of lines that are unique on both sides (patience diff, as in
+``git diff --patience``). Only regions without a unique anchor line are handed
+to ``SequenceMatcher``, and those are small.
+
+``unified_diff`` mirrors ``difflib.unified_diff``: same signature, headers,
+hunk ranges and grouping. When both pick the same alignment the output is
+byte-identical; when a change is ambiguous the hunks may differ but still
+form a correct patch.
+"""
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from difflib import SequenceMatcher
+
+
+def _intern(a: Sequence[str], b: Sequence[str]) -> tuple[list[int], list[int]]:
+    table: dict[str, int] = {}
+    setdefault = table.setdefault
+    ai = [setdefault(line, len(table)) for line in a]
+    bi = [setdefault(line, len(table)) for line in b]
+    return ai, bi
+
+
+def _fallback_pairs(a: list[int], alo: int, ahi: int, b: list[int], blo: int, bhi: int) -> list[tuple[int, int]]:
+    """Align a region with no unique anchor line via difflib on interned ints."""
+    matcher = SequenceMatcher(None, a[alo:ahi], b[blo:bhi])
+    return [
+        (alo + i + step, blo + j + step)
+        for i, j, size in matcher.get_matching_blocks()
+        for step in range(size)
+    ]
+
+
+def _unique_anchors(a: list[int], alo: int, ahi: int, b: list[int], blo: int, bhi: int) -> list[tuple[int, int]]:
+    """Longest increasing run of lines that occur exactly once on each side."""
+    seen_a: dict[int, int] = {}
+    for i in range(alo, ahi):
+        seen_a[a[i]] = -1 if a[i] in seen_a else i
+    seen_b: dict[int, int] = {}
+    for j in range(blo, bhi):
+        line = b[j]
+        if seen_a.get(line, -1) >= 0:
+            seen_b[line] = -1 if line in seen_b else j
+    candidates = [(seen_a[line], j) for line, j in seen_b.items() if j >= 0]
+    if not candidates:
+        return []
+    candidates.sort(key=lambda pair: pair[1])
+
+    # Patience sorting: tails[k] is the candidate index ending the best run of length k + 1.
+    tails: list[int] = []
+    tail_values: list[int] = []
+    previous = [-1] * len(candidates)
+    for index, (i, _) in enumerate(candidates):
+        k = bisect_left(tail_values, i)
+        if k:
+            previous[index] = tails[k - 1]
+        if k == len(tails):
+            tails.append(index)
+            tail_values.append(i)
+        else:
+            tails[k] = index
+            tail_values[k] = i
+    anchors: list[tuple[int, int]] = []
+    index = tails[-1]
+    while index >= 0:
+        anchors.append(candidates[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _matching_pairs(a: list[int], b: list[int]) -> list[tuple[int, int]]:
+    pairs: list[tuple[int, int]] = []
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        alo, ahi, blo, bhi = stack.pop()
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            pairs.append((alo, blo))
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            pairs.append((ahi, bhi))
+        if alo == ahi or blo == bhi:
+            continue
+
+        anchors = _unique_anchors(a, alo, ahi, b, blo, bhi)
+        if not anchors:
+            pairs.extend(_fallback_pairs(a, alo, ahi, b, blo, bhi))
+            continue
+        # Each sub-region between anchors is trimmed again on the next pop,
+        # which extends the anchors over neighbouring equal lines.
+        for i, j in anchors:
+            pairs.append((i, j))
+            stack.append((alo, i, blo, j))
+            alo, blo = i + 1, j + 1
+        stack.append((alo, ahi, blo, bhi))
+    pairs.sort()
+    return pairs
+
+
+def get_opcodes(a: Sequence[str], b: Sequence[str]) -> list[tuple[str, int, int, int, int]]:
+    """Return ``SequenceMatcher.get_opcodes()``-style tuples for ``a`` -> ``b``."""
+    ai, bi = _intern(a, b)
+    opcodes: list[tuple[str, int, int, int, int]] = []
+    i = j = 0
+    run_start: tuple[int, int] | None = None
+    for pi, pj in _matching_pairs(ai, bi) + [(len(a), len(b))]:
+        if pi == i and pj == j and (pi, pj) != (len(a), len(b)):
+            if run_start is None:
+                run_start = (i, j)
+            i += 1
+            j += 1
+            continue
+        if run_start is not None:
+            opcodes.append(('equal', run_start[0], i, run_start[1], j))
+            run_start = None
+        if i < pi and j < pj:
+            opcodes.append(('replace', i, pi, j, pj))
+        elif i < pi:
+            opcodes.append(('delete', i, pi, j, j))
+        elif j < pj:
+            opcodes.append(('insert', i, i, j, pj))
+        i, j = pi, pj
+        if (pi, pj) != (len(a), len(b)):
+            run_start = (i, j)
+            i += 1
+            j += 1
+    if run_start is not None:
+        opcodes.append(('equal', run_start[0], i, run_start[1], j))
+    return opcodes
+
+
+def group_opcodes(
+    codes: list[tuple[str, int, int, int, int]], n: int = 3
+) -> Iterator[list[tuple[str, int, int, int, int]]]:
+    """Same grouping as ``SequenceMatcher.get_grouped_opcodes``."""
+    codes = list(codes)
+    if not codes:
+        codes = [('equal', 0, 1, 0, 1)]
+    if codes[0][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    nn = n + n
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == 'equal' and i2 - i1 > nn:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == 'equal'):
+        yield group
+
+
+def _format_range(start: int, stop: int) -> str:
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f'{beginning}'
+    if not length:
+        beginning -= 1
+    return f'{beginning},{length}'
+
+
+def unified_diff(
+    a: Sequence[str],
+    b: Sequence[str],
+    fromfile: str = '',
+    tofile: str = '',
+    fromfiledate: str = '',
+    tofiledate: str = '',
+    n: int = 3,
+    lineterm: str = '\n',
+) -> Iterator[str]:
+    """Drop-in replacement for ``difflib.unified_diff``."""
+    started = False
+    for group in group_opcodes(get_opcodes(a, b), n):
+        if not started:
+            started = True
+            fromdate = f'\t{fromfiledate}' if fromfiledate else ''
+            todate = f'\t{tofiledate}' if tofiledate else ''
+            yield f'--- {fromfile}{fromdate}{lineterm}'
+            yield f'+++ {tofile}{todate}{lineterm}'
+
+        first, last = group[0], group[-1]
+        file1_range = _format_range(first[1], last[2])
+        file2_range = _format_range(first[3], last[4])
+        yield f'@@ -{file1_range} +{file2_range} @@{lineterm}'
+
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                for line in a[i1:i2]:
+                    yield ' ' + line
+                continue
+            if tag in {'replace', 'delete'}:
+                for line in a[i1:i2]:
+                    yield '-' + line
+            if tag in {'replace', 'insert'}:
+                for line in b[j1:j2]:
+                    yield '+' + line
+
+
+def find_region(lines: Sequence[str], start_marker: str, end_marker: str) -> tuple[int, int]:
+    """Return ``(start, end)`` of the window from the first line containing
+    ``start_marker`` up to (not including) the next line containing
+    ``end_marker``. A missing end marker extends the window to the end."""
+    start = next((index for index, line in enumerate(lines) if start_marker in line), None)
+    if start is None:
+        raise ValueError(f'Start marker {start_marker!r} not found')
+    end = next((index for index in range(start, len(lines)) if end_marker in lines[index]), len(lines))
+    return start, end
+
+
+def region_diff(
+    a: Sequence[str],
+    b: Sequence[str],
+    start_marker: str,
+    end_marker: str,
+    fromfile: str = '',
+    tofile: str = '',
+    n: int = 3,
+    lineterm: str = '\n',
+) -> Iterator[str]:
+    """Unified diff restricted to the anchor-bounded region of each side."""
+    a_start, a_end = find_region(a, start_marker, end_marker)
+    b_start, b_end = find_region(b, start_marker, end_marker)
+    return unified_diff(a[a_start:a_end], b[b_start:b_end], fromfile, tofile, n=n, lineterm=lineterm)
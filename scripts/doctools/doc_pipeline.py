@@ -0,0 +1,157 @@
+"""Chain text transforms over documents with one read and one write per file.
+
+Transforms are plain ``str -> str`` callables with a name. A pipeline applies
+the file's own transforms, then the shared ones, to the in-memory text and
+writes the result once (atomically, only when it changed). The report records
+which transforms changed each file and the time spent in each transform.
+"""
+import re
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import instrument
+from .codemod import PatchError, posix_path
+from .fsutil import write_atomic
+from .paths import REPO_ROOT
+
+HEADING_RE = re.compile(r'^#{1,6} ', re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class Transform:
+    name: str
+    func: Callable[[str], str]
+
+    def __call__(self, text: str) -> str:
+        return self.func(text)
+
+
+def replace_section(anchor: str, body: str, name: str = '') -> Transform:
+    """Replace the section that starts with the line beginning ``anchor``.
+
+    The section runs up to the next markdown heading or the end of the file.
+    Whitespace between the section and what follows it is kept as it is.
+    """
+    anchor_re = re.compile(rf'^{re.escape(anchor)}', re.MULTILINE)
+
+    def apply(text: str) -> str:
+        start = anchor_re.search(text)
+        if start is None:
+            raise PatchError(f'section anchor not found: {anchor!r}')
+        end = HEADING_RE.search(text, start.end())
+        stop = end.start() if end else len(text)
+        stop = start.start() + len(text[start.start():stop].rstrip())
+        return text[: start.start()] + body.rstrip() + text[stop:]
+
+    return Transform(name or f'section {anchor.strip("*# ")[:40]}', apply)
+
+
+def replace_text(old: str, new: str, name: str = '') -> Transform:
+    return Transform(name or f'replace {old!r}', lambda text: text.replace(old, new))
+
+
+def trim_trailing_whitespace(newline: str = '\n') -> Transform:
+    """End the file with exactly one ``newline``; only whitespace at the very end is touched."""
+    return Transform('trailing whitespace', lambda text: text.rstrip() + newline)
+
+
+@dataclass
+class DocResult:
+    path: Path
+    fired: list[str]
+    changed: bool
+
+
+@dataclass
+class TransformStat:
+    fired: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class PipelineReport:
+    results: list[DocResult] = field(default_factory=list)
+    stats: dict[str, TransformStat] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def lines(self) -> list[str]:
+        lines = [
+            f'{result.path.as_posix()}: {", ".join(result.fired) or "no changes"}'
+            + ('' if result.changed else ' (unchanged)')
+            for result in self.results
+        ]
+        for name, stat in self.stats.items():
+            lines.append(f'  {name:<40} fired in {stat.fired:>3} files  {stat.seconds * 1000:8.3f} ms')
+        changed = sum(result.changed for result in self.results)
+        lines.append(f'{len(self.results)} files, {changed} written in {self.seconds * 1000:.1f} ms')
+        return lines
+
+
+@dataclass
+class DocPipeline:
+    root: Path = REPO_ROOT
+    files: dict[Path, list[Transform]] = field(default_factory=dict)
+    shared: list[Transform] = field(default_factory=list)
+
+    def add(self, path: str | Path, *transforms: Transform) -> 'DocPipeline':
+        self.files.setdefault(Path(posix_path(path)), []).extend(transforms)
+        return self
+
+    def add_shared(self, *transforms: Transform) -> 'DocPipeline':
+        """Transforms applied to every file after its own."""
+        self.shared.extend(transforms)
+        return self
+
+    def run(self, dry_run: bool = False) -> PipelineReport:
+        report = PipelineReport()
+        started = time.perf_counter()
+        for path, transforms in self.files.items():
+            target = path if path.is_absolute() else self.root / path
+            with instrument.phase('read'):
+                raw = target.read_bytes()
+            bom = raw.startswith(b'\xef\xbb\xbf')
+            original = text = raw.decode('utf-8-sig')
+            fired: list[str] = []
+            for transform in [*transforms, *self.shared]:
+                stat = report.stats.setdefault(transform.name, TransformStat())
+                began = time.perf_counter()
+                try:
+                    with instrument.phase(f'transform {transform.name}'):
+                        updated = transform(text)
+                except PatchError as error:
+                    raise PatchError(f'{path.as_posix()}: {error}') from None
+                stat.seconds += time.perf_counter() - began
+                if updated != text:
+                    fired.append(transform.name)
+                    text = updated
+            if text == original:
+                fired = []  # the transforms undid each other; nothing changed
+            for name in fired:
+                report.stats[name].fired += 1
+            result = DocResult(path, fired, text != original)
+            if result.changed and not dry_run:
+                with instrument.phase('write'):
+                    write_atomic(target, ('\ufeff' if bom else '') + text)
+            report.results.append(result)
+        report.seconds = time.perf_counter() - started
+        return report
+
+
+def run_pipeline_cli(pipeline: DocPipeline, argv: list[str] | None = None) -> PipelineReport:
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Apply document transforms.')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would change without writing files.')
+    instrument.add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    instrument.start(Path(sys.argv[0]).stem, args)
+    try:
+        report = pipeline.run(dry_run=args.dry_run)
+    except (PatchError, FileNotFoundError) as error:
+        raise SystemExit(str(error))
+    for line in report.lines():
+        print(line, file=sys.stderr)
+    return report
@@ -0,0 +1,471 @@
+"""Restore en/es alias parity in document metadata.
+
+    python -m doctools fix-aliases [--offline] [--verify] [--translator NAME] ...
+
+Documents flagged with an alias-count mismatch (by the verification report or
+an in-process ``--verify``) get their Spanish alias list rebuilt to match the
+English one, preferring in order: ``TRANSLATION_OVERRIDES``, the document's
+own Spanish alias at that position, an exact pair seen elsewhere in the
+manifest, a translation-memory match and finally the translator. Rewritten
+documents are patched into the generated manifests.
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+
+from . import instrument
+from .alias_registry import AliasRegistry
+from .incremental import REASONS, IncrementalState, file_hash, json_hash
+from .manifest import load_manifest
+from .manifest_patch import ManifestPatchError, patch_manifests
+from .metadata_rewrite import RewriteJob, run_rewrites
+from .normalize import normalize_en
+from .paths import REPO_ROOT
+from .report_stream import alias_mismatch_documents
+from .template_verify import verify_templates
+from .translation_cache import TranslationCache, normalize_key, rules_fingerprint
+from .translation_memory import DEFAULT_THRESHOLD, TranslationMemory, manifest_pairs
+from .translators import (
+    BACKENDS,
+    FakeTranslator,
+    TokenBucket,
+    TranslationError,
+    translate_batch,
+    translate_with_retry,
+)
+
+TRANSLATION_OVERRIDES = {
+    'marine bill of sale': 'factura de venta marítima',
+    'boat bill of sale': 'factura de venta de embarcación',
+    'auto maintenance agreement': 'acuerdo de mantenimiento automotriz',
+    'car repair contract': 'contrato de reparación de automóvil',
+    'donation agreement': 'acuerdo de donación',
+    'cryptocurrency agreement': 'acuerdo de criptomonedas',
+}
+
+BAD_SUBSTRINGS = ('(', 'bolsa de venta', 'automático')
+
+REMOVE_SUFFIXES = (
+    '(plazo legal)',
+    '(término legal)',
+    '(término jurídico)',
+    '(documento legal)',
+    '(frase legal)',
+    '(condición legal)',
+    '(cláusula legal)',
+)
+
+
+def clean_translation(alias: str, translated: str) -> str:
+    result = translated.strip() or alias
+    lowered = result.lower()
+    for suffix in REMOVE_SUFFIXES:
+        if lowered.endswith(suffix):
+            result = result[: -len(suffix)].strip()
+            lowered = result.lower()
+            break
+    return ' '.join(result.split()).lower()
+
+
+def reusable_spanish_alias(es_aliases: list[str], idx: int) -> str | None:
+    if idx < len(es_aliases):
+        candidate = es_aliases[idx].strip().lower()
+        if candidate and not any(bad in candidate for bad in BAD_SUBSTRINGS):
+            return candidate
+    return None
+
+
+def observed_translation_map(entries: list[dict]) -> dict[str, set[str]]:
+    observed: dict[str, set[str]] = {}
+    for entry in entries:
+        en_aliases = entry['meta']['translations']['en'].get('aliases', [])
+        es_aliases = entry['meta']['translations']['es'].get('aliases', [])
+        if len(en_aliases) == len(es_aliases) and en_aliases:
+            for en_alias, es_alias in zip(en_aliases, es_aliases):
+                candidate = es_alias.strip()
+                if '(' in candidate:
+                    continue
+                observed.setdefault(normalize_en(en_alias), set()).add(candidate.lower())
+    return observed
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Restore en/es alias parity in document metadata.')
+    parser.add_argument(
+        '--root',
+        type=Path,
+        default=REPO_ROOT,
+        help='Tree holding src/lib/documents, public/templates and the verification report (default: this repo).',
+    )
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        default=os.environ.get('FIX_ALIASES_OFFLINE') == '1',
+        help='Never call the translate endpoint; documents with an uncached alias are left unchanged.',
+    )
+    parser.add_argument(
+        '--cache-path',
+        type=Path,
+        default=None,
+        help='JSONL translation cache (default: <root>/state/translation-cache.jsonl).',
+    )
+    parser.add_argument('--translator', choices=sorted(BACKENDS), default='google', help='Translation backend.')
+    parser.add_argument('--concurrency', type=int, default=8, help='Parallel translation requests in the pre-pass.')
+    parser.add_argument('--rate', type=float, default=5.0, help='Maximum translation requests per second.')
+    parser.add_argument('--retries', type=int, default=3, help='Retries per alias with exponential backoff.')
+    parser.add_argument('--fake-latency', type=float, default=0.0, help='Simulated per-request latency for --translator fake.')
+    parser.add_argument('--workers', type=int, default=None, help='Processes for the metadata rewrite stage (default: CPU count).')
+    parser.add_argument(
+        '--all-or-nothing',
+        action='store_true',
+        help='Write no metadata file at all if any document fails to rewrite.',
+    )
+    parser.add_argument('--timings', action='store_true', help='Print per-document rewrite timings.')
+    parser.add_argument(
+        '--global-uniqueness',
+        action='store_true',
+        help="Also reject Spanish aliases that collide with another document's en/es aliases.",
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Skip documents whose metadata.ts, manifest entry and overrides are unchanged since the last successful run.',
+    )
+    parser.add_argument(
+        '--state-path',
+        type=Path,
+        default=None,
+        help='Incremental state file (default: <root>/state/fix-spanish-aliases.state.json).',
+    )
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='Find alias mismatches by verifying templates in-process instead of reading template-verification-report.json.',
+    )
+    parser.add_argument(
+        '--no-manifest-patch',
+        action='store_true',
+        help='Leave manifest.generated.json/.ts alone instead of patching the rewritten documents into them.',
+    )
+    parser.add_argument(
+        '--memory-threshold',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f'Reuse the Spanish form of a translation-memory match with the same content words scoring at least '
+        f'this much instead of translating; lower values tolerate more word-order and function-word drift '
+        f'(default: {DEFAULT_THRESHOLD}; 1 requires the same wording; above 1 disables).',
+    )
+    parser.add_argument('--changed-ids', type=Path, help='Write the ids of rewritten documents to this JSON file.')
+    instrument.add_profile_arguments(parser)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    instrument.start('fix-spanish-aliases', args)
+
+    root = args.root.resolve()
+    state_dir = root / 'state'
+    documents_dir = root / 'src' / 'lib' / 'documents'
+    manifest_path = documents_dir / 'manifest.generated.json'
+    report_path = root / 'template-verification-report.json'
+    args.cache_path = args.cache_path or state_dir / 'translation-cache.jsonl'
+    args.state_path = args.state_path or state_dir / 'fix-spanish-aliases.state.json'
+
+    with instrument.phase('manifest load'):
+        manifest = load_manifest(manifest_path, snapshot_dir=state_dir)
+
+    manifest_by_id = manifest.by_id
+    with instrument.phase('report parse'):
+        if args.verify:
+            verification = verify_templates(
+                root / 'public' / 'templates',
+                manifest=manifest,
+                cache_path=state_dir / 'template-verify.cache.json',
+            )
+            print(verification.summary())
+            mismatched_docs = verification.alias_mismatch_documents()
+        else:
+            mismatched_docs = alias_mismatch_documents(report_path)
+    instrument.count('documents.manifest', len(manifest.entries))
+    instrument.count('documents.mismatched', len(mismatched_docs))
+
+    observed_translations = observed_translation_map(manifest.entries)
+
+    forced_docs = {
+        entry['id']
+        for entry in manifest.entries
+        if any(normalize_en(alias) in TRANSLATION_OVERRIDES for alias in entry['meta']['translations']['en'].get('aliases', []))
+    }
+
+    # mismatched docs now include override coverage
+    mismatched_docs = mismatched_docs.union(forced_docs)
+
+    translation_memory = TranslationMemory.from_pairs(manifest_pairs(manifest.entries), TRANSLATION_OVERRIDES)
+    memory_hits: list[tuple[str, str, float]] = []
+
+    def memory_matches(alias: str):
+        return translation_memory.accept(alias, args.memory_threshold) if args.memory_threshold <= 1 else []
+
+    alias_registry = AliasRegistry.from_manifest(manifest, global_scope=args.global_uniqueness)
+
+    def observed_choice(lower_key: str, doc_id: str, count: bool = True) -> str | None:
+        for candidate in observed_translations.get(lower_key, set()):
+            if alias_registry.is_available(candidate, doc_id, 'es', count):
+                return candidate
+        return None
+
+    def memory_choice(english_alias: str, doc_id: str, count: bool = True):
+        """The first usable Spanish form among the accepted memory matches, with its match."""
+        for match in memory_matches(english_alias):
+            for candidate in match.translations:
+                if not any(bad in candidate for bad in BAD_SUBSTRINGS) and alias_registry.is_available(
+                    candidate, doc_id, 'es', count
+                ):
+                    return candidate, match
+        return None
+
+    translation_cache = TranslationCache(args.cache_path, rules_fingerprint(REMOVE_SUFFIXES, TRANSLATION_OVERRIDES))
+    offline_misses: list[str] = []
+    translation_failures: dict[str, str] = {}
+
+    translator = FakeTranslator(latency=args.fake_latency) if args.translator == 'fake' else BACKENDS[args.translator]()
+    # One limit for the whole run: the batch pre-pass and any serial fallback draw from the same bucket.
+    rate_limit = TokenBucket(args.rate)
+
+    def translate_alias(alias: str) -> str | None:
+        """Spanish for ``alias``; ``None`` when offline and nothing is cached, or when translation fails."""
+        alias = alias.strip()
+        if not alias:
+            return alias
+        lower_key = alias.lower()
+        if lower_key in TRANSLATION_OVERRIDES:
+            return TRANSLATION_OVERRIDES[lower_key]
+        cached = translation_cache.get(alias)
+        if cached is not None:
+            return cached
+        if args.offline:
+            offline_misses.append(alias)
+            return None
+
+        try:
+            translated = translate_with_retry(translator, alias, rate_limit, retries=args.retries)
+        except TranslationError as error:
+            translation_failures[alias] = str(error)
+            return None
+        normalized = clean_translation(alias, translated)
+        translation_cache.put(alias, normalized)
+        return normalized
+
+    def collect_pending_translations(doc_ids: set[str]) -> list[str]:
+        pending: dict[str, str] = {}
+        for doc_id in sorted(doc_ids):
+            entry = manifest_by_id.get(doc_id)
+            if not entry:
+                continue
+            en_aliases = entry['meta']['translations']['en'].get('aliases', [])
+            es_aliases = entry['meta']['translations']['es'].get('aliases', [])
+            for idx, english_alias in enumerate(en_aliases):
+                lower_key = normalize_en(english_alias)
+                if lower_key in TRANSLATION_OVERRIDES or reusable_spanish_alias(es_aliases, idx) is not None:
+                    continue
+                # Skip only when selection will find a usable candidate; otherwise the alias
+                # would reach translate_alias one request at a time instead of in the batch.
+                if observed_choice(lower_key, doc_id, False) or memory_choice(english_alias, doc_id, False):
+                    continue
+                alias = english_alias.strip()
+                if alias and alias not in translation_cache:
+                    pending.setdefault(normalize_key(alias), alias)
+        return list(pending.values())
+
+    def metadata_path_for(entry: dict) -> Path:
+        return documents_dir / entry['importPath'].lstrip('./') / 'metadata.ts'
+
+    # Everything besides the document's own inputs that can change what gets written for it.
+    output_rules = {
+        'overrides': TRANSLATION_OVERRIDES,
+        'bad_substrings': BAD_SUBSTRINGS,
+        'remove_suffixes': REMOVE_SUFFIXES,
+        'memory_threshold': args.memory_threshold,
+        'global_uniqueness': args.global_uniqueness,
+        'translator': args.translator,
+        'cache': [str(args.cache_path.resolve()), translation_cache.fingerprint],
+    }
+    incremental_state = IncrementalState(args.state_path, json_hash(output_rules))
+    fingerprints: dict[str, dict[str, str]] = {}
+    skipped_unchanged: list[str] = []
+    stale_reasons: dict[str, int] = {}
+    for doc_id in sorted(mismatched_docs):
+        entry = manifest_by_id.get(doc_id)
+        if not entry:
+            continue
+        fingerprints[doc_id] = incremental_state.fingerprint(metadata_path_for(entry), entry)
+        if not args.incremental:
+            continue
+        reason = incremental_state.stale_reason(doc_id, fingerprints[doc_id])
+        if reason is None:
+            skipped_unchanged.append(doc_id)
+        else:
+            stale_reasons[reason] = stale_reasons.get(reason, 0) + 1
+    mismatched_docs = mismatched_docs.difference(skipped_unchanged)
+
+    with instrument.phase('translation'):
+        pending_translations = [] if args.offline else collect_pending_translations(mismatched_docs)
+        if pending_translations:
+            print(
+                f'Translating {len(pending_translations)} aliases via {translator.name} '
+                f'(concurrency {args.concurrency}, {args.rate:g} req/s)...'
+            )
+            translated_batch, failed_batch = translate_batch(
+                pending_translations,
+                translator,
+                concurrency=args.concurrency,
+                rate=args.rate,
+                retries=args.retries,
+                bucket=rate_limit,
+            )
+            for alias, translated in translated_batch.items():
+                translation_cache.put(alias, clean_translation(alias, translated))
+            for alias, error in failed_batch.items():
+                print(f"⚠️  Translation failed for '{alias}': {error}")
+    instrument.count('translation.requests', len(pending_translations))
+
+    jobs: list[RewriteJob] = []
+    parity_pairs: dict[str, tuple[str, str]] = {}
+    untranslated_docs: list[str] = []
+
+    with instrument.phase('alias selection'):
+        for doc_id in sorted(mismatched_docs):
+            entry = manifest_by_id.get(doc_id)
+            if not entry:
+                print(f"⚠️  {doc_id} missing from manifest, skipping.")
+                continue
+
+            en_aliases = entry['meta']['translations']['en'].get('aliases', [])
+            es_aliases = entry['meta']['translations']['es'].get('aliases', [])
+
+            alias_registry.remove_document(doc_id, 'es')
+            rebuilt_aliases: list[str] = []
+
+            for idx, english_alias in enumerate(en_aliases):
+                lower_key = normalize_en(english_alias)
+                selected = None
+
+                override = TRANSLATION_OVERRIDES.get(lower_key)
+                if override:
+                    selected = override
+                else:
+                    selected = reusable_spanish_alias(es_aliases, idx)
+
+                if selected is None:
+                    selected = observed_choice(lower_key, doc_id)
+
+                if selected is None:
+                    choice = memory_choice(english_alias, doc_id)
+                    if choice is not None:
+                        selected, match = choice
+                        memory_hits.append((english_alias, match.source, match.score))
+
+                if selected is None:
+                    selected = translate_alias(english_alias)
+                if selected is None:
+                    break
+
+                selected = alias_registry.unique_alias(selected, english_alias, doc_id)
+                alias_registry.add(doc_id, 'es', selected)
+                rebuilt_aliases.append(selected)
+
+            if len(rebuilt_aliases) < len(en_aliases):
+                # No translation (offline cache miss or a failed request): writing the English text as
+                # Spanish would stick, since later runs keep any existing es alias. Leave the document as is.
+                alias_registry.remove_document(doc_id, 'es')
+                for alias in es_aliases:
+                    alias_registry.add(doc_id, 'es', alias)
+                untranslated_docs.append(doc_id)
+                continue
+            jobs.append(RewriteJob(doc_id, metadata_path_for(entry), {'en': en_aliases, 'es': rebuilt_aliases}))
+            parity_pairs[doc_id] = (en_aliases[-1], rebuilt_aliases[-1])
+
+    rewrite_report = run_rewrites(jobs, workers=args.workers, all_or_nothing=args.all_or_nothing)
+
+    if args.timings:
+        for result in sorted(rewrite_report.results, key=lambda item: item.seconds, reverse=True):
+            status = 'error' if result.error else 'changed' if result.changed else 'unchanged'
+            print(f'   {result.seconds * 1000:8.2f} ms  {result.doc_id} ({status})')
+
+    for result in rewrite_report.failures:
+        print(f"⚠️  {result.doc_id}: {result.error}")
+    if rewrite_report.rolled_back:
+        print(f'All-or-nothing: {len(rewrite_report.failures)} failures, no metadata files were written.')
+
+    updates = [(result.doc_id, *parity_pairs[result.doc_id]) for result in rewrite_report.committed]
+    changed_ids = sorted(result.doc_id for result in rewrite_report.committed if result.changed)
+    if args.changed_ids:
+        args.changed_ids.write_text(json.dumps(changed_ids, indent=2) + '\n', encoding='utf-8')
+
+    manifest_patch_summary = None
+    patch_report = None
+    if changed_ids and not args.no_manifest_patch:
+        with instrument.phase('manifest patch'):
+            try:
+                patch_report = patch_manifests(changed_ids, documents_dir)
+                manifest_patch_summary = patch_report.summary()
+            except (ManifestPatchError, ValueError) as error:
+                manifest_patch_summary = f'Manifest patch failed ({error}); run node scripts/generate-document-manifest.mjs.'
+
+    if not rewrite_report.rolled_back:
+        with instrument.phase('state save'):
+            # Fingerprint the manifest entries as patched; with the pre-patch hashes the next
+            # --incremental run would see every fixed document's entry as changed.
+            patched_by_id = {} if patch_report is None else load_manifest(manifest_path, snapshot_dir=state_dir).by_id
+            for result in rewrite_report.results:
+                if result.error is not None:
+                    continue
+                fingerprint = dict(fingerprints[result.doc_id], metadata=file_hash(result.path))
+                if result.changed and not args.no_manifest_patch:
+                    if result.doc_id not in patched_by_id:
+                        continue  # the patch failed; leave the document stale
+                    fingerprint['manifest'] = json_hash(patched_by_id[result.doc_id])
+                incremental_state.record(result.doc_id, fingerprint)
+            incremental_state.save()
+
+    if updates:
+        print(f'Updated {len(updates)} metadata files:')
+        for doc_id, english_alias, spanish_alias in updates:
+            print(f" - {doc_id}: ensured parity for '{english_alias}' with '{spanish_alias}'")
+    else:
+        print('No metadata files were updated.')
+
+    if args.incremental:
+        print(f'Incremental: skipped {len(skipped_unchanged)} documents with unchanged inputs.')
+        for reason, count in sorted(stale_reasons.items()):
+            print(f'  reprocessed {count}: {REASONS[reason]}')
+    print(
+        f'Rewrite stage: {len(rewrite_report.results)} documents in {rewrite_report.seconds:.3f}s '
+        f'({rewrite_report.throughput:.1f} docs/s, {rewrite_report.workers} workers)'
+    )
+    if manifest_patch_summary:
+        print(manifest_patch_summary)
+    print(translation_cache.summary())
+    print(
+        f'Translation memory: {len(translation_memory)} entries, '
+        f'{len(memory_hits)} aliases reused from fuzzy matches (threshold {args.memory_threshold:g})'
+    )
+    if args.timings:
+        for english_alias, source, score in memory_hits:
+            print(f'   {score:5.2f}  {english_alias} <- {source}')
+    instrument.count('translation.cache_hits', translation_cache.hits)
+    instrument.count('translation.cache_misses', translation_cache.misses)
+    instrument.count('translation.memory_hits', len(memory_hits))
+    instrument.count('translation.offline_misses', len(offline_misses))
+    instrument.count('translation.failures', len(translation_failures))
+    print(alias_registry.summary())
+    if untranslated_docs:
+        if args.offline:
+            print(f'Offline mode: {len(offline_misses)} aliases had no cached translation.')
+        for alias, error in translation_failures.items():
+            print(f"⚠️  Translation failed for '{alias}': {error}")
+        print(f'{len(untranslated_docs)} documents left unchanged until a later run: {", ".join(untranslated_docs)}')
+
+    return 1 if rewrite_report.failures or translation_failures else 0
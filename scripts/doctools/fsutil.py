@@ -0,0 +1,37 @@
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+
+def _target_mode(path: Path) -> int:
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def stage_text(path: Path, text: str, encoding: str = 'utf-8') -> Path:
+    """Write ``text`` to a temp file beside ``path`` and return the temp path.
+
+    The temp file lives in the same directory so a later ``os.replace`` is an
+    atomic rename on the same filesystem.
+    """
+    fd, temp_name = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        # mkstemp creates 0600 files; keep the target's mode (or the umask default).
+        os.chmod(temp_name, _target_mode(path))
+        with os.fdopen(fd, 'w', encoding=encoding, newline='') as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return Path(temp_name)
+
+
+def write_atomic(path: Path, text: str, encoding: str = 'utf-8') -> None:
+    os.replace(stage_text(path, text, encoding), path)
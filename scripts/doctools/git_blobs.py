@@ -0,0 +1,78 @@
+"""Read many git blobs over one long-lived ``git cat-file --batch`` process.
+
+Spawning ``git show HEAD:<path>`` per file costs a process start each time;
+for a cycle touching hundreds of templates that dominates runtime. The reader
+keeps a single ``cat-file`` process open and streams requests to it from a
+writer thread while the caller consumes responses, so large batches never
+deadlock on full pipe buffers.
+"""
+import subprocess
+import threading
+from pathlib import Path
+
+from .paths import REPO_ROOT
+
+
+class GitBlobReader:
+    def __init__(self, repo: Path = REPO_ROOT):
+        self.repo = repo
+        self._process = subprocess.Popen(
+            ['git', 'cat-file', '--batch'],
+            cwd=repo,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'GitBlobReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._process.poll() is None:
+            self._process.stdin.close()
+            self._process.wait()
+        self._process.stdout.close()
+
+    def _read_response(self) -> bytes | None:
+        header = self._process.stdout.readline()
+        if not header:
+            raise RuntimeError('git cat-file exited unexpectedly')
+        # '<oid> <type> <size>' or '<object> missing'; the object name may contain spaces.
+        status = header.rstrip(b'\n').rsplit(b' ', 1)[-1]
+        if status in (b'missing', b'ambiguous'):
+            return None
+        size = int(status)
+        data = self._process.stdout.read(size)
+        self._process.stdout.read(1)  # trailing newline
+        return data
+
+    def read(self, path: str, rev: str = 'HEAD') -> bytes | None:
+        """Return the blob for ``rev:path`` or ``None`` if it does not exist."""
+        with self._lock:
+            self._process.stdin.write(f'{rev}:{path}\n'.encode('utf-8'))
+            self._process.stdin.flush()
+            return self._read_response()
+
+    def read_many(self, paths: list[str], rev: str = 'HEAD') -> dict[str, bytes | None]:
+        """Fetch every ``rev:path`` in one pipelined round trip."""
+        requests = b''.join(f'{rev}:{path}\n'.encode('utf-8') for path in paths)
+
+        def feed() -> None:
+            self._process.stdin.write(requests)
+            self._process.stdin.flush()
+
+        with self._lock:
+            writer = threading.Thread(target=feed, daemon=True)
+            writer.start()
+            blobs = {path: self._read_response() for path in paths}
+            writer.join()
+        return blobs
+
+
+def changed_paths(pathspecs: list[str], repo: Path = REPO_ROOT, rev: str = 'HEAD') -> list[str]:
+    """Paths under ``pathspecs`` that differ between ``rev`` and the working tree, deletions included."""
+    output = subprocess.check_output(['git', 'diff', '--name-only', rev, '--', *pathspecs], cwd=repo, text=True)
+    return [line for line in output.splitlines() if line]
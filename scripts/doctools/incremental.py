@@ -0,0 +1,73 @@
+"""Input fingerprints that let a script skip documents it already handled.
+
+The state file maps each document id to hashes of everything that decides its
+output: the ``metadata.ts`` file as last written, the manifest entry, and the
+rules (overrides and friends, plus any option that changes the output). A
+document is skipped when all three still match; otherwise the first differing
+input is reported as the reason.
+"""
+import hashlib
+import json
+from pathlib import Path
+
+from .fsutil import write_atomic
+
+STATE_VERSION = 1
+
+REASONS = {
+    'new': 'no previous run',
+    'metadata': 'metadata.ts changed',
+    'manifest': 'manifest entry changed',
+    'rules': 'overrides or options changed',
+}
+
+
+def file_hash(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return ''
+
+
+def json_hash(value) -> str:
+    payload = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=list)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class IncrementalState:
+    def __init__(self, path: Path, rules_hash: str):
+        self.path = path
+        self.rules_hash = rules_hash
+        self.documents: dict[str, dict[str, str]] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding='utf-8'))
+            except json.JSONDecodeError:
+                data = {}
+            if data.get('version') == STATE_VERSION:
+                self.documents = data.get('documents', {})
+
+    def fingerprint(self, metadata_path: Path, entry: dict) -> dict[str, str]:
+        return {
+            'metadata': file_hash(metadata_path),
+            'manifest': json_hash(entry),
+            'rules': self.rules_hash,
+        }
+
+    def stale_reason(self, doc_id: str, fingerprint: dict[str, str]) -> str | None:
+        """Return why ``doc_id`` must be processed, or ``None`` if it can be skipped."""
+        previous = self.documents.get(doc_id)
+        if previous is None:
+            return 'new'
+        for key in ('metadata', 'manifest', 'rules'):
+            if previous.get(key) != fingerprint[key]:
+                return key
+        return None
+
+    def record(self, doc_id: str, fingerprint: dict[str, str]) -> None:
+        self.documents[doc_id] = fingerprint
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {'version': STATE_VERSION, 'documents': dict(sorted(self.documents.items()))}
+        write_atomic(self.path, json.dumps(payload, indent=2) + '\n')
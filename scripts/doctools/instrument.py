@@ -0,0 +1,252 @@
+"""Phase timers, counters and optional cProfile/tracemalloc capture for the scripts.
+
+Scripts call ``start(script, args)`` after parsing their arguments and wrap
+their work in ``phase()`` blocks; library code can do the same and
+``count()`` things, and it costs nothing unless profiling was switched on
+with ``--profile`` or ``DOCTOOLS_PROFILE``::
+
+    python scripts/fix-spanish-aliases.py --offline --profile
+    python scripts/fix-spanish-aliases.py --profile cprofile,tracemalloc --profile-cycle document-intel-cycle-0012
+    DOCTOOLS_PROFILE=all DOCTOOLS_PROFILE_CYCLE=platform-cycle-0011 python apply_compliance_changes.py
+
+At exit the run is written to ``ops/artifacts/<cycle>/profile-<script>.json``
+(plus ``.pstats`` with cProfile), so runs of the same script can be compared
+across cycles. Phases nest; a nested phase is reported as ``outer/inner``.
+With tracemalloc each phase also records the peak traced memory inside it.
+"""
+import atexit
+import cProfile
+import io
+import json
+import os
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .fsutil import write_atomic
+from .paths import REPO_ROOT
+
+ARTIFACTS_DIR = REPO_ROOT / 'ops' / 'artifacts'
+DEFAULT_CYCLE = 'local'
+MODES = ('timers', 'cprofile', 'tracemalloc')
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 20
+
+
+def parse_modes(value: str | None) -> frozenset[str]:
+    """``'1'``/``'timers'`` -> timers only; ``'all'`` or a comma list adds cProfile/tracemalloc."""
+    if not value or value.strip().lower() in {'0', 'false', 'no', 'off'}:
+        return frozenset()
+    modes = {'timers'}
+    for item in value.lower().split(','):
+        item = item.strip()
+        if item == 'all':
+            modes.update(MODES)
+        elif item in MODES:
+            modes.add(item)
+        elif item not in {'1', 'true', 'yes', 'on'}:
+            raise ValueError(f'unknown profile mode {item!r} (expected {", ".join(MODES)} or all)')
+    return frozenset(modes)
+
+
+@dataclass
+class PhaseStat:
+    calls: int = 0
+    seconds: float = 0.0
+    peak_bytes: int = 0
+
+
+@dataclass
+class _Frame:
+    name: str
+    started: float
+    peak_bytes: int = 0
+
+
+@dataclass
+class Profiler:
+    script: str = ''
+    modes: frozenset[str] = frozenset()
+    cycle: str = DEFAULT_CYCLE
+    phases: dict[str, PhaseStat] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=dict)
+    _stack: list[_Frame] = field(default_factory=list, repr=False)
+    _profile: cProfile.Profile | None = field(default=None, repr=False)
+    _started: float = field(default=0.0, repr=False)
+    _started_at: str = field(default='', repr=False)
+    _finished: bool = field(default=False, repr=False)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.modes)
+
+    @property
+    def output_path(self) -> Path:
+        return ARTIFACTS_DIR / self.cycle / f'profile-{self.script}.json'
+
+    def begin(self) -> 'Profiler':
+        self._started = time.perf_counter()
+        self._started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        if 'tracemalloc' in self.modes and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if 'cprofile' in self.modes:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def _peak(self) -> int:
+        return tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if self._stack:
+            # The outer phase keeps the peak reached before this one started.
+            self._stack[-1].peak_bytes = max(self._stack[-1].peak_bytes, self._peak())
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        frame = _Frame(f'{self._stack[-1].name}/{name}' if self._stack else name, time.perf_counter())
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - frame.started
+            self._stack.pop()
+            peak = max(frame.peak_bytes, self._peak())
+            stat = self.phases.setdefault(frame.name, PhaseStat())
+            stat.calls += 1
+            stat.seconds += elapsed
+            stat.peak_bytes = max(stat.peak_bytes, peak)
+            if self._stack:
+                self._stack[-1].peak_bytes = max(self._stack[-1].peak_bytes, peak)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def _cprofile_report(self) -> list[dict]:
+        stats = pstats.Stats(self._profile, stream=io.StringIO())
+        rows = []
+        for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            try:
+                where = Path(filename).resolve().relative_to(REPO_ROOT).as_posix()
+            except ValueError:
+                where = filename
+            rows.append(
+                {
+                    'function': f'{where}:{line}({function})',
+                    'calls': calls,
+                    'tottime': round(tottime, 6),
+                    'cumtime': round(cumtime, 6),
+                }
+            )
+        rows.sort(key=lambda row: -row['cumtime'])
+        return rows[:TOP_FUNCTIONS]
+
+    def report(self) -> dict:
+        data: dict = {
+            'script': self.script,
+            'cycle': self.cycle,
+            'started': self._started_at,
+            'argv': sys.argv[1:],
+            'python': platform.python_version(),
+            'modes': sorted(self.modes),
+            'seconds': round(time.perf_counter() - self._started, 6),
+            'phases': {
+                name: {'calls': stat.calls, 'seconds': round(stat.seconds, 6)}
+                | ({'peak_bytes': stat.peak_bytes} if 'tracemalloc' in self.modes else {})
+                for name, stat in self.phases.items()
+            },
+            'counters': dict(sorted(self.counters.items())),
+        }
+        if self._profile is not None:
+            data['cprofile'] = self._cprofile_report()
+        if 'tracemalloc' in self.modes and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            data['tracemalloc'] = {
+                'current_bytes': current,
+                'peak_bytes': max([peak, *(stat.peak_bytes for stat in self.phases.values())]),
+                'top': [
+                    {'where': str(stat.traceback), 'bytes': stat.size, 'blocks': stat.count}
+                    for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]
+                ],
+            }
+        return data
+
+    def finish(self) -> Path | None:
+        """Stop capturing and write the report. Returns the JSON path, or None when disabled."""
+        if not self.enabled or self._finished:
+            return None
+        self._finished = True
+        if self._profile is not None:
+            self._profile.disable()
+        data = self.report()
+        path = self.output_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, json.dumps(data, indent=2, ensure_ascii=False) + '\n')
+        if self._profile is not None:
+            self._profile.dump_stats(path.with_suffix('.pstats'))
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        try:
+            label = path.relative_to(REPO_ROOT).as_posix()
+        except ValueError:
+            label = str(path)
+        print(f'profile: {label}', file=sys.stderr)
+        return path
+
+
+_active = Profiler()
+
+
+def active() -> Profiler:
+    return _active
+
+
+def phase(name: str):
+    """Time a block under the active profiler; a no-op context when profiling is off."""
+    return _active.phase(name) if _active.modes else nullcontext()
+
+
+def count(name: str, amount: int = 1) -> None:
+    if _active.modes:
+        _active.count(name, amount)
+
+
+def add_profile_arguments(parser) -> None:
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='timers',
+        default=None,
+        metavar='MODES',
+        help='Write phase timings to ops/artifacts/<cycle>/; MODES adds cprofile, tracemalloc or all '
+        '(default: $DOCTOOLS_PROFILE).',
+    )
+    parser.add_argument(
+        '--profile-cycle',
+        default=None,
+        help=f'Artifact directory for the profile (default: $DOCTOOLS_PROFILE_CYCLE or {DEFAULT_CYCLE}).',
+    )
+
+
+def start(script: str, args=None) -> Profiler:
+    """Install the run-wide profiler from ``--profile``/``DOCTOOLS_PROFILE``; it is written at exit."""
+    global _active
+    value = getattr(args, 'profile', None) or os.environ.get('DOCTOOLS_PROFILE')
+    try:
+        modes = parse_modes(value)
+    except ValueError as error:
+        raise SystemExit(f'--profile: {error}')
+    cycle = getattr(args, 'profile_cycle', None) or os.environ.get('DOCTOOLS_PROFILE_CYCLE') or DEFAULT_CYCLE
+    _active = Profiler(script, modes, cycle)
+    if _active.enabled:
+        _active.begin()
+        atexit.register(_active.finish)
+    return _active
@@ -0,0 +1,129 @@
+"""Indexed access to ``manifest.generated.json`` with an on-disk snapshot.
+
+``load_manifest`` parses the manifest once, builds lookup indexes and pickles
+them under ``state/``. Later calls reuse the snapshot while the JSON's mtime
+and size are unchanged; if only the mtime moved (a fresh checkout, a touch),
+the file is hashed and the snapshot is still reused when the content matches.
+"""
+import hashlib
+import json
+import os
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import workspace
+from .fsutil import stage_text
+from .normalize import normalize_es, normalize_es_many
+from .paths import MANIFEST_PATH, STATE_DIR
+
+SNAPSHOT_VERSION = 1
+LOCALES = ('en', 'es')
+
+
+@dataclass
+class ManifestIndex:
+    entries: list[dict]
+    by_id: dict[str, dict] = field(default_factory=dict)
+    # locale -> accent-folded alias -> document ids
+    by_alias: dict[str, dict[str, list[str]]] = field(default_factory=dict)
+    by_category: dict[str, list[str]] = field(default_factory=dict)
+    by_state: dict[str, list[str]] = field(default_factory=dict)
+    source_hash: str = ''
+
+    def aliases(self, doc_id: str, locale: str) -> list[str]:
+        return self.by_id[doc_id]['meta']['translations'][locale].get('aliases', [])
+
+    def find_alias(self, alias: str, locale: str | None = None) -> list[str]:
+        key = normalize_es(alias)
+        locales = (locale,) if locale else LOCALES
+        found: list[str] = []
+        for name in locales:
+            for doc_id in self.by_alias.get(name, {}).get(key, ()):
+                if doc_id not in found:
+                    found.append(doc_id)
+        return found
+
+
+def build_index(manifest: dict, source_hash: str = '') -> ManifestIndex:
+    index = ManifestIndex(entries=manifest['entries'], source_hash=source_hash)
+    index.by_alias = {locale: {} for locale in LOCALES}
+    for entry in index.entries:
+        doc_id = entry['id']
+        meta = entry['meta']
+        index.by_id[doc_id] = entry
+        index.by_category.setdefault(meta.get('category') or 'Uncategorized', []).append(doc_id)
+        for state in meta.get('states') or ['all']:
+            index.by_state.setdefault(state, []).append(doc_id)
+        translations = meta.get('translations', {})
+        for locale in LOCALES:
+            for key in normalize_es_many(translations.get(locale, {}).get('aliases', [])):
+                ids = index.by_alias[locale].setdefault(key, [])
+                if doc_id not in ids:
+                    ids.append(doc_id)
+    return index
+
+
+def snapshot_path_for(path: Path, snapshot_dir: Path = STATE_DIR) -> Path:
+    return snapshot_dir / f'{path.stem}.index.pickle'
+
+
+def _read_snapshot(snapshot: Path) -> tuple[dict, ManifestIndex | None]:
+    try:
+        with snapshot.open('rb') as handle:
+            header = pickle.load(handle)
+            if header.get('version') != SNAPSHOT_VERSION:
+                return {}, None
+            return header, pickle.load(handle)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+        return {}, None
+
+
+def _write_snapshot(snapshot: Path, header: dict, index: ManifestIndex) -> None:
+    snapshot.parent.mkdir(parents=True, exist_ok=True)
+    temp = stage_text(snapshot, '')
+    with temp.open('wb') as handle:
+        pickle.dump(header, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(index, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp, snapshot)
+
+
+def load_manifest(
+    path: Path = MANIFEST_PATH,
+    snapshot_dir: Path | None = STATE_DIR,
+) -> ManifestIndex:
+    """Return the indexed manifest, using the snapshot cache when it is current.
+
+    Pass ``snapshot_dir=None`` to always parse the JSON and skip the cache.
+    Within one process the index is also kept in the workspace cache.
+    """
+    return workspace.cached(path, 'manifest', lambda: _load_manifest(path, snapshot_dir))
+
+
+def _load_manifest(path: Path, snapshot_dir: Path | None) -> ManifestIndex:
+    stat = path.stat()
+    if snapshot_dir is None:
+        raw = path.read_bytes()
+        return build_index(json.loads(raw), hashlib.sha256(raw).hexdigest())
+
+    snapshot = snapshot_path_for(path, snapshot_dir)
+    header, index = _read_snapshot(snapshot)
+    if index is not None and header.get('mtime_ns') == stat.st_mtime_ns and header.get('size') == stat.st_size:
+        return index
+
+    raw = path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    if index is None or header.get('sha256') != digest:
+        index = build_index(json.loads(raw), digest)
+    header = {
+        'version': SNAPSHOT_VERSION,
+        'source': str(path),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': digest,
+    }
+    try:
+        _write_snapshot(snapshot, header, index)
+    except OSError:
+        pass
+    return index
@@ -0,0 +1,410 @@
+"""Patch the alias fields of changed documents in both generated manifests.
+
+    python -m doctools.manifest_patch DOC_ID [DOC_ID ...] [--dry-run] [--verify-full]
+
+``scripts/generate-document-manifest.mjs`` rebuilds ``manifest.generated.json``
+and ``manifest.generated.ts`` from every ``metadata.ts``. After an alias fix
+only a handful of documents changed, so this re-reads just their
+``translations.<locale>.aliases`` arrays, derives the manifest fields the
+way the generator does (trimmed, de-duplicated, es falling back to en,
+``meta.aliases`` = en + es) and splices them into both files:
+
+* in the JSON, each changed entry and its ``metadata`` value are re-rendered
+  with ``json.dumps(indent=2)``, which is byte-identical to the generator's
+  ``JSON.stringify(..., null, 2)``;
+* in the TS, only the three ``aliases`` arrays of the entry in
+  ``DOCUMENT_MANIFEST`` and ``DOCUMENT_METADATA`` are replaced, laid out the
+  way prettier does (one line when it fits in 80 columns, one item per line
+  otherwise, in the file's own quote style).
+
+Everything else, including key order and ``generatedAt``, is left alone.
+After patching, every alias array of each patched document, in both files and
+within that document's own blocks, is checked against its ``metadata.ts``.
+``--verify-full`` also runs the generator on a temporary copy of the tree and
+compares the results.
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .fsutil import write_atomic
+from .paths import DOCUMENTS_DIR, REPO_ROOT
+from .ts_literals import STRING_LITERAL, TOKEN_RE, find_translations_block, is_code, locate_alias_arrays
+
+PRINT_WIDTH = 80
+STRING_RE = re.compile(STRING_LITERAL)
+IDENTIFIER_RE = re.compile(r'[A-Za-z_$][\w$]*')
+GENERATOR = REPO_ROOT / 'scripts' / 'generate-document-manifest.mjs'
+
+
+class ManifestPatchError(Exception):
+    pass
+
+
+def normalize_strings(values: list[str]) -> list[str]:
+    """The generator's ``normalizeStrings``: trim, drop empties, keep the first of duplicates."""
+    return list(dict.fromkeys(value.strip() for value in values if value.strip()))
+
+
+def _strings(content: str, start: int, end: int) -> list[str]:
+    return [ast.literal_eval(literal) for literal in STRING_RE.findall(content, start, end)]
+
+
+def _top_level_aliases(content: str) -> list[str]:
+    """The exported object's own ``aliases`` array (the generator's last fallback)."""
+    match = re.search(r'^export const \w+[^=\n]*=\s*\{', content, re.MULTILINE)
+    if match is None or not is_code(content, match.start()):
+        return []
+    depth = 0
+    pending = None
+    array_start = None
+    for token in TOKEN_RE.finditer(content, match.end() - 1):
+        kind = token.lastgroup
+        if kind == 'key':
+            pending = token.group('key').strip('\'"')
+        elif kind == 'open':
+            depth += 1
+            if depth == 2 and pending == 'aliases' and token.group() == '[':
+                array_start = token.end()
+            pending = None
+        elif kind == 'close':
+            depth -= 1
+            if array_start is not None:
+                return _strings(content, array_start, token.start())
+            if depth == 0:
+                break
+            pending = None
+    return []
+
+
+def read_aliases(metadata_path: Path) -> dict[str, list[str]]:
+    """``translations.<locale>.aliases`` plus the top-level ``aliases`` under ``''``."""
+    content = metadata_path.read_text(encoding='utf-8-sig')
+    try:
+        find_translations_block(content)
+    except ValueError:
+        # No translations at all: the generator falls back to the top-level aliases.
+        spans = {}
+    else:
+        spans = locate_alias_arrays(content)
+    aliases = {locale: _strings(content, span.start, span.end) for locale, span in spans.items()}
+    aliases[''] = _top_level_aliases(content)
+    return aliases
+
+
+def manifest_aliases(aliases: dict[str, list[str]]) -> dict[str, list[str]]:
+    """``{'en', 'es', 'all'}`` as ``ensureTranslation``/``buildEntry`` compute them."""
+    fallback = aliases.get('en') or aliases.get('', [])
+    en = normalize_strings(fallback)
+    es = normalize_strings(aliases.get('es') or fallback)
+    return {'en': en, 'es': es, 'all': normalize_strings(en + es)}
+
+
+def _apply(meta: dict, fields: dict[str, list[str]]) -> None:
+    meta['aliases'] = fields['all']
+    meta['translations']['en']['aliases'] = fields['en']
+    meta['translations']['es']['aliases'] = fields['es']
+
+
+def _block(text: str, opener: str, indent: str) -> tuple[int, int]:
+    """Span of the object whose first line is ``opener``, up to its closing brace at ``indent``."""
+    start = text.find(opener)
+    if start == -1:
+        raise ManifestPatchError(f'block not found: {opener.strip()!r}')
+    start += 1
+    end = text.find(f'\n{indent}}}', start)
+    if end == -1:
+        raise ManifestPatchError(f'unterminated block: {opener.strip()!r}')
+    return start, end + len(indent) + 2
+
+
+def _indent_json(value: dict, indent: str) -> str:
+    return json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n' + indent)
+
+
+def patch_json(text: str, updates: dict[str, dict[str, list[str]]]) -> str:
+    spans: list[tuple[int, int, str]] = []
+    for doc_id, fields in updates.items():
+        key = json.dumps(doc_id, ensure_ascii=False)
+        start, end = _block(text, f'\n    {{\n      "id": {key},\n', '    ')
+        entry = json.loads(text[start:end])
+        _apply(entry['meta'], fields)
+        spans.append((start, end, '    ' + _indent_json(entry, '    ')))
+
+        start, end = _block(text, f'\n    {key}: {{\n', '    ')
+        meta = json.loads(text[start + len(key) + 6:end])
+        _apply(meta, fields)
+        spans.append((start, end, f'    {key}: ' + _indent_json(meta, '    ')))
+    return _splice(text, spans)
+
+
+def _ts_quote(value: str, quote: str) -> str:
+    other = "'" if quote == '"' else '"'
+    if value.count(quote) > value.count(other):
+        quote = other
+    escaped = value.replace('\\', '\\\\').replace(quote, '\\' + quote).replace('\n', '\\n')
+    return quote + escaped + quote
+
+
+def render_ts_aliases(values: list[str], indent: str, quote: str = '"') -> str:
+    items = [_ts_quote(value, quote) for value in values]
+    line = f'{indent}aliases: [{", ".join(items)}],'
+    if len(line) <= PRINT_WIDTH:
+        return line
+    return f'{indent}aliases: [\n' + ''.join(f'{indent}  {item},\n' for item in items) + f'{indent}],'
+
+
+def _alias_spans(text: str, start: int, end: int, indents: tuple[str, ...]) -> list[tuple[int, int, str]]:
+    spans = []
+    cursor = start
+    for indent in indents:
+        found = text.find(f'\n{indent}aliases: [', cursor, end)
+        if found == -1:
+            raise ManifestPatchError(f'aliases array not found at indent {len(indent)}')
+        found += 1
+        line_end = text.find('\n', found)
+        if not text[found:line_end].endswith('],'):
+            line_end = text.find(f'\n{indent}],', found) + len(indent) + 3
+        spans.append((found, line_end, indent))
+        cursor = line_end
+    return spans
+
+
+def _ts_key(doc_id: str, quote: str) -> str:
+    return doc_id if IDENTIFIER_RE.fullmatch(doc_id) else _ts_quote(doc_id, quote)
+
+
+def detect_quote(ts_text: str) -> str:
+    return "'" if "\n    id: '" in ts_text else '"'
+
+
+def patch_ts(text: str, updates: dict[str, dict[str, list[str]]]) -> str:
+    quote = detect_quote(text)
+    spans: list[tuple[int, int, str]] = []
+    for doc_id, fields in updates.items():
+        start, end = _block(text, f'\n  {{\n    id: {_ts_quote(doc_id, quote)},\n', '  ')
+        arrays = _alias_spans(text, start, end, (' ' * 6, ' ' * 10, ' ' * 10))
+        start, end = _block(text, f'\n  {_ts_key(doc_id, quote)}: {{\n', '  ')
+        arrays += _alias_spans(text, start, end, (' ' * 4, ' ' * 8, ' ' * 8))
+        for (array_start, array_end, indent), values in zip(arrays, [fields['all'], fields['en'], fields['es']] * 2):
+            spans.append((array_start, array_end, render_ts_aliases(values, indent, quote)))
+    return _splice(text, spans)
+
+
+def _splice(text: str, spans: list[tuple[int, int, str]]) -> str:
+    parts: list[str] = []
+    cursor = 0
+    for start, end, replacement in sorted(spans):
+        parts.append(text[cursor:start])
+        parts.append(replacement)
+        cursor = end
+    parts.append(text[cursor:])
+    return ''.join(parts)
+
+
+def _ts_alias_arrays(text: str, start: int, end: int) -> dict[str, tuple[int, int]]:
+    """Spans of the ``aliases`` arrays in one TS object, keyed ``'all'``, ``'en'`` or ``'es'``.
+
+    Keys come from the object path, not the indentation: ``aliases`` directly on
+    the document (or its ``meta``) is ``'all'``, ``translations.<locale>.aliases``
+    is the locale.
+    """
+    arrays: dict[str, tuple[int, int]] = {}
+    stack: list[tuple[str | None, int]] = []
+    pending = None
+    for token in TOKEN_RE.finditer(text, start, end):
+        kind = token.lastgroup
+        if kind == 'key':
+            key = token.group('key')
+            pending = key[1:-1] if key[0] in '\'"' else key
+        elif kind == 'open':
+            stack.append((pending, token.start()))
+            pending = None
+        elif kind == 'close':
+            key, opened = stack.pop()
+            if key == 'aliases' and token.group() == ']':
+                path = [frame for frame, _ in stack[1:] if frame != 'meta']
+                if not path:
+                    arrays['all'] = (opened, token.end())
+                elif len(path) == 2 and path[0] == 'translations':
+                    arrays[path[1]] = (opened, token.end())
+            pending = None
+    return arrays
+
+
+def check_consistency(json_text: str, ts_text: str, metadata_paths: dict[str, Path]) -> list[str]:
+    """Compare the patched manifests with each document's ``metadata.ts``.
+
+    The alias fields are derived afresh from ``metadata_paths`` and compared with
+    the document's JSON entry and ``metadata`` value and with the ``all``/``en``/``es``
+    arrays inside its own ``DOCUMENT_MANIFEST`` and ``DOCUMENT_METADATA`` blocks,
+    values and prettier layout both.
+    """
+    payload = json.loads(json_text)
+    entries = {entry['id']: entry for entry in payload['entries']}
+    quote = detect_quote(ts_text)
+    problems = []
+    for doc_id, metadata_path in metadata_paths.items():
+        expected = manifest_aliases(read_aliases(metadata_path))
+        for where, meta in (('entries', entries[doc_id]['meta']), ('metadata', payload['metadata'][doc_id])):
+            translations = meta['translations']
+            actual = {'all': meta['aliases'], 'en': translations['en']['aliases'], 'es': translations['es']['aliases']}
+            for name in ('all', 'en', 'es'):
+                if actual[name] != expected[name]:
+                    problems.append(f'{doc_id}: JSON {where} {name} aliases do not match metadata.ts')
+        for where, opener in (
+            ('DOCUMENT_MANIFEST', f'\n  {{\n    id: {_ts_quote(doc_id, quote)},\n'),
+            ('DOCUMENT_METADATA', f'\n  {_ts_key(doc_id, quote)}: {{\n'),
+        ):
+            start, end = _block(ts_text, opener, '  ')
+            arrays = _ts_alias_arrays(ts_text, start, end)
+            for name in ('all', 'en', 'es'):
+                if name not in arrays:
+                    problems.append(f'{doc_id}: {where} has no {name} aliases array')
+                    continue
+                array_start, array_end = arrays[name]
+                line_start = ts_text.rfind('\n', 0, array_start) + 1
+                line = ts_text[line_start:array_end + 1]
+                array_indent = line[: len(line) - len(line.lstrip())]
+                if _strings(ts_text, array_start, array_end) != expected[name]:
+                    problems.append(f'{doc_id}: {where} {name} aliases do not match metadata.ts')
+                elif line != render_ts_aliases(expected[name], array_indent, quote):
+                    problems.append(f'{doc_id}: {where} {name} aliases are not laid out like the generator')
+    return problems
+
+
+@dataclass
+class PatchReport:
+    patched: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    written: list[Path] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        files = ', '.join(path.name for path in self.written) or 'no files written'
+        return (
+            f'Manifest patch: {len(self.patched)} documents patched, {len(self.unchanged)} already current '
+            f'({files}) in {self.seconds * 1000:.1f} ms'
+        )
+
+
+def patch_manifests(doc_ids, documents_dir: Path = DOCUMENTS_DIR, dry_run: bool = False) -> PatchReport:
+    """Bring the manifest entries of ``doc_ids`` in line with their ``metadata.ts``."""
+    started = time.perf_counter()
+    report = PatchReport()
+    json_path = documents_dir / 'manifest.generated.json'
+    ts_path = documents_dir / 'manifest.generated.ts'
+    json_text = json_path.read_text(encoding='utf-8')
+    ts_text = ts_path.read_text(encoding='utf-8')
+    entries = {entry['id']: entry for entry in json.loads(json_text)['entries']}
+
+    updates: dict[str, dict[str, list[str]]] = {}
+    metadata_paths: dict[str, Path] = {}
+    for doc_id in sorted(set(doc_ids)):
+        entry = entries.get(doc_id)
+        if entry is None:
+            raise ManifestPatchError(f'{doc_id}: not in the manifest; run a full regeneration')
+        metadata_path = metadata_paths[doc_id] = documents_dir / entry['importPath'].removeprefix('./') / 'metadata.ts'
+        fields = manifest_aliases(read_aliases(metadata_path))
+        translations = entry['meta']['translations']
+        current = {'en': translations['en']['aliases'], 'es': translations['es']['aliases'], 'all': entry['meta']['aliases']}
+        if fields == current:
+            report.unchanged.append(doc_id)
+        else:
+            updates[doc_id] = fields
+            report.patched.append(doc_id)
+
+    if updates:
+        json_text = patch_json(json_text, updates)
+        ts_text = patch_ts(ts_text, updates)
+        problems = check_consistency(json_text, ts_text, {doc_id: metadata_paths[doc_id] for doc_id in updates})
+        if problems:
+            raise ManifestPatchError('; '.join(problems))
+        if not dry_run:
+            write_atomic(json_path, json_text)
+            write_atomic(ts_path, ts_text)
+            report.written = [json_path, ts_path]
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def verify_full(root: Path = REPO_ROOT) -> list[str]:
+    """Run the generator on a copy of ``root`` and list where its output differs from the files."""
+    documents_dir = root / 'src' / 'lib' / 'documents'
+    with tempfile.TemporaryDirectory(prefix='manifest-verify-') as temp:
+        copy = Path(temp)
+        shutil.copytree(documents_dir, copy / 'src' / 'lib' / 'documents')
+        (copy / 'scripts').mkdir()
+        shutil.copy2(root / 'scripts' / GENERATOR.name, copy / 'scripts' / GENERATOR.name)
+        for name in ('.prettierrc', 'package.json'):
+            if (root / name).exists():
+                shutil.copy2(root / name, copy / name)
+        os.symlink(root / 'node_modules', copy / 'node_modules', target_is_directory=True)
+        result = subprocess.run(['node', str(copy / 'scripts' / GENERATOR.name)], capture_output=True, text=True)
+        if result.returncode != 0:
+            raise ManifestPatchError(f'generator failed: {result.stderr.strip()[-500:]}')
+        generated = copy / 'src' / 'lib' / 'documents'
+
+        problems = []
+        expected = json.loads((generated / 'manifest.generated.json').read_text(encoding='utf-8'))
+        actual = json.loads((documents_dir / 'manifest.generated.json').read_text(encoding='utf-8'))
+        expected_entries = {entry['id']: entry for entry in expected['entries']}
+        actual_entries = {entry['id']: entry for entry in actual['entries']}
+        for doc_id in sorted(expected_entries.keys() | actual_entries.keys()):
+            if expected_entries.get(doc_id) != actual_entries.get(doc_id):
+                problems.append(f'{doc_id}: JSON entry differs from a full regeneration')
+        expected.pop('generatedAt', None)
+        actual.pop('generatedAt', None)
+        if not problems and expected != actual:
+            problems.append('JSON differs from a full regeneration outside the entries')
+        expected_ts = (generated / 'manifest.generated.ts').read_text(encoding='utf-8').splitlines()
+        actual_ts = (documents_dir / 'manifest.generated.ts').read_text(encoding='utf-8').splitlines()
+        for number, (left, right) in enumerate(zip(expected_ts, actual_ts), 1):
+            if left != right:
+                problems.append(f'manifest.generated.ts:{number}: differs from a full regeneration')
+                break
+        else:
+            if len(expected_ts) != len(actual_ts):
+                problems.append('manifest.generated.ts: length differs from a full regeneration')
+        return problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Patch changed documents into the generated manifests.')
+    parser.add_argument('doc_ids', nargs='*', help='Documents whose metadata.ts changed.')
+    parser.add_argument('--ids-from', type=Path, help='Read document ids from a JSON list or a file with one id per line.')
+    parser.add_argument('--root', type=Path, default=REPO_ROOT, help='Repository root (default: this repo).')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would change without writing.')
+    parser.add_argument('--verify-full', action='store_true', help='Compare the result with a full node regeneration.')
+    args = parser.parse_args(argv)
+
+    doc_ids = list(args.doc_ids)
+    if args.ids_from:
+        text = args.ids_from.read_text(encoding='utf-8')
+        doc_ids += json.loads(text) if text.lstrip().startswith('[') else text.split()
+    root = args.root.resolve()
+    try:
+        report = patch_manifests(doc_ids, root / 'src' / 'lib' / 'documents', args.dry_run)
+        print(report.summary(), file=sys.stderr)
+        if args.verify_full:
+            problems = verify_full(root)
+            for problem in problems:
+                print(problem)
+            print(f'Full regeneration: {"matches" if not problems else f"{len(problems)} differences"}', file=sys.stderr)
+            return 1 if problems else 0
+    except (ManifestPatchError, ValueError, OSError) as error:
+        raise SystemExit(str(error))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
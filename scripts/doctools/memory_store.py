@@ -0,0 +1,236 @@
+"""Append-only store for the TEAM ``memory.json`` files.
+
+    cd scripts
+    python -m doctools team-memory show ../TEAM/Document-Intelligence/memory.json
+    python -m doctools team-memory record ../TEAM/CEO/memory.json --note TEXT --set cycle_id=ceo-cycle-0002
+    python -m doctools team-memory compact ../TEAM/*/memory.json
+
+Updates go to ``memory.log.jsonl`` beside the snapshot, one JSON line per
+``record()`` call, written under an exclusive file lock. An append never
+reads the history, so its cost does not grow with it. Readers get the snapshot
+with the log replayed on top; the replay is cached and only new log lines are
+parsed on the next read. Once the log passes ``compact_bytes`` it is folded
+back into ``memory.json``.
+
+The first log line holds the sha256 of the snapshot the log applies to.
+Compaction writes the successor log (headed by the new snapshot's hash) to
+``memory.log.jsonl.next`` before replacing the snapshot, so a crash at any
+point leaves either the old snapshot plus its log or the new snapshot plus
+the fresh log, and appends are never replayed twice.
+
+If ``memory.json`` was edited directly, its hash no longer matches the log
+header and the log is rebased rather than replayed: notes and todos it
+appended that the edited file lacks are added back, while its scalar updates
+are dropped because the edit is newer. The next ``record()`` or compaction
+writes the rebased state to the snapshot and starts a fresh log.
+"""
+import argparse
+import copy
+import hashlib
+import json
+import os
+import sys
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+
+from .fsutil import write_atomic
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    with open(path, 'a+b') as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _detect_indent(text: str) -> int:
+    for line in text.splitlines()[1:2]:
+        return len(line) - len(line.lstrip(' ')) or 4
+    return 4
+
+
+def apply_record(state: dict, record: dict, rebase: bool = False) -> None:
+    """Apply one log line; with ``rebase``, only appends the snapshot does not already hold."""
+    for field, values in record.get('append', {}).items():
+        current = state.setdefault(field, [])
+        current.extend(value for value in values if not (rebase and value in current))
+    if not rebase:
+        state.update(record.get('set', {}))
+
+
+class MemoryStore:
+    def __init__(self, path: Path, compact_bytes: int = 64 * 1024):
+        self.path = Path(path)
+        self.log_path = self.path.with_name(f'{self.path.stem}.log.jsonl')
+        self.next_log_path = self.log_path.with_name(f'{self.log_path.name}.next')
+        self.lock_path = self.path.with_name(f'{self.path.name}.lock')
+        self.compact_bytes = compact_bytes
+        self._cache: tuple[tuple[str, bytes], int, dict] | None = None  # ((base, log header), offset, state)
+
+    def _read_snapshot(self) -> tuple[bytes, dict]:
+        try:
+            raw = self.path.read_bytes()
+        except FileNotFoundError:
+            return b'', {}
+        return raw, json.loads(raw.decode('utf-8-sig')) if raw.strip() else {}
+
+    def _recover(self) -> None:
+        """Finish a compaction interrupted after the snapshot was replaced. Caller holds the lock."""
+        if not self.next_log_path.exists():
+            return
+        header = json.loads(self.next_log_path.read_text(encoding='utf-8').split('\n', 1)[0])
+        raw, _ = self._read_snapshot()
+        if header.get('base') == _digest(raw):
+            os.replace(self.next_log_path, self.log_path)
+        else:
+            self.next_log_path.unlink()
+
+    def record(self, *, notes: Sequence[str] = (), todos: Sequence[str] = (), **fields) -> None:
+        """Append notes/todos and set scalar fields as one atomic log line."""
+        entry: dict = {}
+        appended = {name: list(values) for name, values in (('notes', notes), ('todos', todos)) if values}
+        if appended:
+            entry['append'] = appended
+        if fields:
+            entry['set'] = fields
+        if not entry:
+            return
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        with file_lock(self.lock_path):
+            self._recover()
+            if self._stale_locked():
+                self._compact_locked()
+            if not self.log_path.exists():
+                raw, _ = self._read_snapshot()
+                header = json.dumps({'base': _digest(raw)}) + '\n'
+                write_atomic(self.log_path, header)
+            fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND)
+            try:
+                os.write(fd, line)
+                size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+            if size > self.compact_bytes:
+                self._compact_locked()
+
+    def _log_mode(self, header: bytes, base: str) -> str:
+        """'replay' for a log written against this snapshot, 'rebase' after a direct edit, else 'skip'."""
+        if json.loads(header or b'{}').get('base') == base:
+            return 'replay'
+        try:
+            folded = json.loads(self.next_log_path.read_bytes().split(b'\n', 1)[0])
+        except FileNotFoundError:
+            return 'rebase'
+        # A compaction already folded this log into the snapshot.
+        return 'skip' if folded.get('base') == base else 'rebase'
+
+    def _stale_locked(self) -> bool:
+        try:
+            with open(self.log_path, 'rb') as handle:
+                header = handle.readline()
+        except FileNotFoundError:
+            return False
+        raw, _ = self._read_snapshot()
+        return self._log_mode(header, _digest(raw)) != 'replay'
+
+    def state(self) -> dict:
+        """Snapshot plus log. Only lines appended since the last call are parsed."""
+        raw, state = self._read_snapshot()
+        base = _digest(raw)
+        try:
+            with open(self.log_path, 'rb') as handle:
+                header = handle.readline()
+                mode = self._log_mode(header, base)
+                if mode == 'skip':
+                    return state
+                key = (base, header)
+                if self._cache and self._cache[0] == key:
+                    handle.seek(self._cache[1])
+                    state = self._cache[2]
+                tail = handle.read()
+                offset = handle.tell()
+        except FileNotFoundError:
+            return state
+        # Leave a partial last line (a writer mid-append) for the next read.
+        complete = tail[: tail.rfind(b'\n') + 1]
+        for line in complete.splitlines():
+            if line.strip():
+                apply_record(state, json.loads(line), rebase=mode == 'rebase')
+        self._cache = (key, offset - len(tail) + len(complete), state)
+        return copy.deepcopy(state)
+
+    def _compact_locked(self) -> bool:
+        try:
+            lines = self.log_path.read_bytes().count(b'\n')
+        except FileNotFoundError:
+            return False
+        if lines <= 1:
+            if self._stale_locked():
+                self.log_path.unlink()  # a bare header for an older snapshot
+            return False
+        raw, _ = self._read_snapshot()
+        text = json.dumps(self.state(), indent=_detect_indent(raw.decode('utf-8-sig')), ensure_ascii=False) + '\n'
+        write_atomic(self.next_log_path, json.dumps({'base': _digest(text.encode('utf-8'))}) + '\n')
+        write_atomic(self.path, text)
+        os.replace(self.next_log_path, self.log_path)
+        self._cache = None
+        return True
+
+    def compact(self) -> bool:
+        """Fold the log into the snapshot. Returns False when there was nothing to fold."""
+        with file_lock(self.lock_path):
+            self._recover()
+            return self._compact_locked()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Inspect, update or compact TEAM memory stores.')
+    parser.add_argument('command', choices=['show', 'record', 'compact'])
+    parser.add_argument('paths', nargs='+', type=Path, help='memory.json snapshot paths.')
+    parser.add_argument('--note', action='append', default=[], help='record: append a note (repeatable).')
+    parser.add_argument('--todo', action='append', default=[], help='record: append a todo (repeatable).')
+    parser.add_argument('--set', action='append', default=[], metavar='FIELD=VALUE', help='record: set a scalar field (repeatable).')
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        if any('=' not in item for item in args.set):
+            parser.error('--set takes FIELD=VALUE')
+        fields = dict(item.split('=', 1) for item in args.set)
+        for path in args.paths:
+            MemoryStore(path).record(notes=args.note, todos=args.todo, **fields)
+        return 0
+    if args.command == 'show':
+        # Several stores come out as one object keyed by path, so each pod's state stays attributable.
+        states = {str(path): MemoryStore(path).state() for path in args.paths}
+        json.dump(states if len(states) > 1 else states.popitem()[1], sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write('\n')
+        return 0
+    for path in args.paths:
+        print(f'{path}: {"compacted" if MemoryStore(path).compact() else "nothing to compact"}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+"""Parallel, atomic rewrite stage for ``metadata.ts`` alias arrays.
+
+Workers read a file, rewrite its alias arrays and stage the result in a temp
+file next to the original. Nothing touches the real file until the parent
+process commits the staged files with ``os.replace``. In all-or-nothing mode a
+single failure discards every staged file, and a failure while committing
+restores the files that were already replaced.
+"""
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import instrument
+from .fsutil import stage_text
+from .ts_literals import rewrite_alias_arrays
+
+
+@dataclass
+class RewriteJob:
+    doc_id: str
+    path: Path
+    aliases: dict[str, list[str]]
+
+
+@dataclass
+class RewriteResult:
+    doc_id: str
+    path: Path
+    staged: Path | None = None
+    changed: bool = False
+    seconds: float = 0.0
+    error: str | None = None
+
+
+@dataclass
+class RewriteReport:
+    results: list[RewriteResult] = field(default_factory=list)
+    committed: list[RewriteResult] = field(default_factory=list)
+    rolled_back: bool = False
+    workers: int = 1
+    seconds: float = 0.0
+
+    @property
+    def failures(self) -> list[RewriteResult]:
+        return [result for result in self.results if result.error]
+
+    @property
+    def throughput(self) -> float:
+        return len(self.results) / self.seconds if self.seconds else 0.0
+
+
+def stage_rewrite(job: RewriteJob) -> RewriteResult:
+    started = time.perf_counter()
+    result = RewriteResult(job.doc_id, job.path)
+    try:
+        # newline='' keeps CRLF files CRLF; the rewriter mirrors whatever it finds.
+        with job.path.open(encoding='utf-8', newline='') as handle:
+            content = handle.read()
+        updated = rewrite_alias_arrays(content, job.aliases)
+        if updated != content:
+            result.staged = stage_text(job.path, updated)
+            result.changed = True
+    except Exception as error:
+        result.error = f'{type(error).__name__}: {error}'
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def _discard(results: list[RewriteResult]) -> None:
+    for result in results:
+        if result.staged is not None:
+            result.staged.unlink(missing_ok=True)
+            result.staged = None
+
+
+def _commit(staged: list[RewriteResult], all_or_nothing: bool) -> list[RewriteResult]:
+    if not all_or_nothing:
+        try:
+            for result in staged:
+                os.replace(result.staged, result.path)
+                result.staged = None
+        finally:
+            _discard(staged)
+        return staged
+
+    backups: list[tuple[Path, Path]] = []
+    committed: list[RewriteResult] = []
+    try:
+        for result in staged:
+            backup = result.path.with_name(f'.{result.path.name}.bak')
+            shutil.copy2(result.path, backup)
+            backups.append((backup, result.path))
+            os.replace(result.staged, result.path)
+            result.staged = None
+            committed.append(result)
+    except BaseException:
+        for backup, target in backups:
+            os.replace(backup, target)
+        _discard(staged)
+        raise
+    for backup, _ in backups:
+        backup.unlink(missing_ok=True)
+    return committed
+
+
+def run_rewrites(jobs: list[RewriteJob], workers: int | None = None, all_or_nothing: bool = False) -> RewriteReport:
+    workers = max(1, workers or os.cpu_count() or 1)
+    report = RewriteReport(workers=min(workers, max(1, len(jobs))))
+    started = time.perf_counter()
+    with instrument.phase('rewrite'):
+        if report.workers > 1:
+            with ProcessPoolExecutor(max_workers=report.workers) as executor:
+                report.results = list(executor.map(stage_rewrite, jobs, chunksize=max(1, len(jobs) // (report.workers * 4))))
+        else:
+            report.results = [stage_rewrite(job) for job in jobs]
+
+    staged = [result for result in report.results if result.staged is not None]
+    with instrument.phase('write'):
+        if all_or_nothing and report.failures:
+            _discard(staged)
+            report.rolled_back = True
+        else:
+            report.committed = _commit(staged, all_or_nothing)
+    instrument.count('rewrite.documents', len(report.results))
+    instrument.count('rewrite.failures', len(report.failures))
+    instrument.count('rewrite.committed', len(report.committed))
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,334 @@
+"""Find and repair mojibake in text files without decoding them character by character.
+
+    python -m doctools.mojibake [PATH ...] [--apply] [--json] [--output PATH]
+
+Three kinds of damage are reported:
+
+``double-encoded``
+    UTF-8 that was read as cp1252 and written back as UTF-8 (``Ã±`` for
+    ``ñ``, ``â€™`` for ``’``). A single bytes regex, built once from the
+    cp1252 table, matches a mis-decoded lead byte followed by the right number
+    of mis-decoded continuation bytes. A match is repaired only if it
+    round-trips: cp1252-encoding the decoded match yields valid UTF-8 which
+    re-damages to the same bytes. Layered damage is unwound up to three times.
+    Plenty of unrelated text round-trips too (``SÍ”`` re-decodes to a
+    combining mark), so a repair is only applied when it is plausible source
+    text: no combining marks or control characters, only Latin, punctuation,
+    symbol and emoji blocks, and fewer mojibake bytes than before. Anything
+    else is reported as a proposal.
+``invalid-utf8``
+    Bytes that are not UTF-8 at all, typically a file saved as cp1252. They
+    are repaired by decoding just those bytes as cp1252, under the same
+    plausibility check.
+``replacement-char``
+    Runs of U+FFFD (and ``?`` glued to them). The original text is gone, so
+    these are reported without a repair.
+
+Pure-ASCII files are skipped with ``bytes.isascii()``, and the remaining
+files are searched with one compiled bytes regex, so there is no Python-level
+loop over the characters of a file.
+"""
+import argparse
+import bisect
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from .fsutil import write_atomic
+from .paths import REPO_ROOT
+
+DEFAULT_ROOTS = ('src', 'public/templates', 'docs')
+TEXT_SUFFIXES = frozenset({'.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs', '.md', '.json', '.css', '.html', '.txt', '.yml', '.yaml'})
+MAX_LAYERS = 3
+# Blocks a repaired character may come from: Latin-1 and Latin Extended, general
+# punctuation through dingbats (quotes, dashes, currency, arrows, check marks), and emoji.
+PLAUSIBLE_BLOCKS = ((0x00A0, 0x024F), (0x1E00, 0x1EFF), (0x2000, 0x27BF), (0x1F300, 0x1FAFF))
+# Emoji presentation selector and zero-width joiner, the only marks/format characters let through.
+PLAUSIBLE_EXTRAS = frozenset('\ufe0f\u200d')
+IMPLAUSIBLE_CATEGORIES = frozenset({'Mn', 'Me', 'Mc', 'Cc', 'Cf', 'Co', 'Cn', 'Cs'})
+
+
+def _misdecoded(byte: int) -> bytes:
+    """UTF-8 bytes of ``byte`` as a cp1252 reader shows it (latin-1 for cp1252's holes)."""
+    try:
+        char = bytes([byte]).decode('cp1252')
+    except UnicodeDecodeError:
+        char = chr(byte)
+    return char.encode('utf-8')
+
+
+def _alternation(values: range) -> bytes:
+    encoded = sorted({_misdecoded(value) for value in values}, key=lambda item: (-len(item), item))
+    return b'(?:' + b'|'.join(re.escape(item) for item in encoded) + b')'
+
+
+_CONTINUATION = _alternation(range(0x80, 0xC0))
+DOUBLE_ENCODED_RE = re.compile(
+    b'(?:'
+    + _alternation(range(0xC2, 0xE0)) + _CONTINUATION
+    + b'|' + _alternation(range(0xE0, 0xF0)) + _CONTINUATION + b'{2}'
+    + b'|' + _alternation(range(0xF0, 0xF5)) + _CONTINUATION + b'{3}'
+    + b')+'
+)
+REPLACEMENT_RE = re.compile(rb'\??(?:\xef\xbf\xbd[^\s\xef]{0,3})*\xef\xbf\xbd\??')
+ESCAPED_RE = re.compile('[\udc80-\udcff]+')
+
+
+MISDECODED = [_misdecoded(byte) for byte in range(256)]
+
+
+def _to_cp1252(text: str) -> bytes:
+    encoded = bytearray()
+    for char in text:
+        try:
+            encoded += char.encode('cp1252')
+        except UnicodeEncodeError:
+            encoded += char.encode('latin-1')
+    return bytes(encoded)
+
+
+def repair_double_encoded(data: bytes) -> bytes | None:
+    """Undo cp1252 double-encoding of ``data`` or return ``None`` if it does not round-trip."""
+    repaired = data
+    for _ in range(MAX_LAYERS):
+        try:
+            candidate = _to_cp1252(repaired.decode('utf-8')).decode('utf-8').encode('utf-8')
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            break
+        if b''.join(MISDECODED[byte] for byte in candidate) != repaired:
+            break
+        repaired = candidate
+        if not DOUBLE_ENCODED_RE.fullmatch(repaired):
+            break
+    return repaired if repaired != data else None
+
+
+def _mojibake_bytes(data: bytes) -> int:
+    return sum(match.end() - match.start() for match in DOUBLE_ENCODED_RE.finditer(data))
+
+
+def plausible_repair(original: bytes, repaired: bytes) -> bool:
+    """Whether ``repaired`` reads as source text and leaves less mojibake than ``original``."""
+    try:
+        text = repaired.decode('utf-8')
+    except UnicodeDecodeError:
+        return False
+    for char in text:
+        if char.isascii() and (char.isprintable() or char in '\t\n\r'):
+            continue
+        if char in PLAUSIBLE_EXTRAS:
+            continue
+        if unicodedata.category(char) in IMPLAUSIBLE_CATEGORIES:
+            return False
+        if not any(low <= ord(char) <= high for low, high in PLAUSIBLE_BLOCKS):
+            return False
+    return _mojibake_bytes(repaired) < _mojibake_bytes(original) or not _mojibake_bytes(original)
+
+
+@dataclass
+class Finding:
+    path: str
+    line: int
+    column: int
+    kind: str
+    text: str
+    repair: str | None
+    start: int = field(repr=False)
+    end: int = field(repr=False)
+    # A round-trip repair that failed the plausibility check; shown, never applied.
+    proposal: str | None = None
+
+
+@dataclass
+class ScanReport:
+    findings: list[Finding] = field(default_factory=list)
+    files: int = 0
+    scanned_bytes: int = 0
+    seconds: float = 0.0
+    repaired_files: list[str] = field(default_factory=list)
+
+    def unrepaired(self) -> list[Finding]:
+        """Findings still in the files: those without a repair, or in files that were not rewritten."""
+        written = set(self.repaired_files)
+        return [finding for finding in self.findings if finding.repair is None or finding.path not in written]
+
+    def counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for finding in self.findings:
+            counts[finding.kind] = counts.get(finding.kind, 0) + 1
+        return counts
+
+    def to_json(self) -> dict:
+        return {
+            'files': self.files,
+            'bytes': self.scanned_bytes,
+            'seconds': round(self.seconds, 3),
+            'counts': self.counts(),
+            'repaired_files': self.repaired_files,
+            'unrepaired': len(self.unrepaired()),
+            'findings': [
+                {key: value for key, value in asdict(finding).items() if key not in {'start', 'end'}}
+                for finding in self.findings
+            ],
+        }
+
+    def summary(self) -> str:
+        counts = ', '.join(f'{count} {kind}' for kind, count in sorted(self.counts().items())) or 'no mojibake'
+        rate = self.scanned_bytes / self.seconds / 1e6 if self.seconds else 0.0
+        return f'{self.files} files ({self.scanned_bytes / 1e6:.1f} MB) in {self.seconds:.2f}s ({rate:.0f} MB/s): {counts}'
+
+
+def _invalid_spans(raw: bytes) -> list[tuple[int, int]]:
+    """Byte spans that are not valid UTF-8, found in one surrogateescape decode."""
+    try:
+        raw.decode('utf-8')
+        return []
+    except UnicodeDecodeError:
+        pass
+    text = raw.decode('utf-8', errors='surrogateescape')
+    spans: list[tuple[int, int]] = []
+    byte_pos = char_pos = 0
+    for match in ESCAPED_RE.finditer(text):
+        byte_pos += len(text[char_pos:match.start()].encode('utf-8', errors='surrogateescape'))
+        spans.append((byte_pos, byte_pos + match.end() - match.start()))
+        byte_pos = spans[-1][1]
+        char_pos = match.end()
+    return spans
+
+
+def scan_bytes(raw: bytes, path: str) -> list[Finding]:
+    if raw.isascii():
+        return []
+    hits: list[tuple[int, int, str, bytes | None]] = []
+    for match in DOUBLE_ENCODED_RE.finditer(raw):
+        hits.append((match.start(), match.end(), 'double-encoded', repair_double_encoded(match.group())))
+    for match in REPLACEMENT_RE.finditer(raw):
+        hits.append((match.start(), match.end(), 'replacement-char', None))
+    for start, end in _invalid_spans(raw):
+        try:
+            repair = raw[start:end].decode('cp1252').encode('utf-8')
+        except UnicodeDecodeError:
+            repair = None
+        hits.append((start, end, 'invalid-utf8', repair))
+    if not hits:
+        return []
+
+    line_starts = [0] + [match.end() for match in re.finditer(rb'\n', raw)]
+    findings = []
+    for start, end, kind, repair in sorted(hits):
+        line = bisect.bisect_right(line_starts, start)
+        proposal = None
+        if repair is not None and not plausible_repair(raw[start:end], repair):
+            repair, proposal = None, repair
+        findings.append(
+            Finding(
+                path=path,
+                line=line,
+                column=len(raw[line_starts[line - 1]:start].decode('utf-8', errors='replace')) + 1,
+                kind=kind,
+                text=raw[start:end].decode('utf-8', errors='backslashreplace'),
+                repair=repair.decode('utf-8') if repair is not None else None,
+                start=start,
+                end=end,
+                proposal=proposal.decode('utf-8', errors='backslashreplace') if proposal is not None else None,
+            )
+        )
+    return findings
+
+
+def apply_repairs(raw: bytes, findings: list[Finding]) -> bytes:
+    pieces: list[bytes] = []
+    cursor = 0
+    for finding in findings:
+        if finding.repair is None or finding.start < cursor:
+            continue
+        pieces.append(raw[cursor:finding.start])
+        pieces.append(finding.repair.encode('utf-8'))
+        cursor = finding.end
+    pieces.append(raw[cursor:])
+    return b''.join(pieces)
+
+
+def iter_text_files(paths: list[Path]):
+    for path in paths:
+        if path.is_file():
+            yield path
+            continue
+        for directory, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(name for name in dirnames if name not in {'node_modules', '.git', '.next'})
+            for name in sorted(filenames):
+                if os.path.splitext(name)[1] in TEXT_SUFFIXES:
+                    yield Path(directory, name)
+
+
+def scan(paths: list[Path], root: Path = REPO_ROOT, apply: bool = False) -> ScanReport:
+    report = ScanReport()
+    started = time.perf_counter()
+    for path in iter_text_files(paths):
+        raw = path.read_bytes()
+        report.files += 1
+        report.scanned_bytes += len(raw)
+        try:
+            label = path.resolve().relative_to(root).as_posix()
+        except ValueError:
+            label = path.as_posix()
+        findings = scan_bytes(raw, label)
+        report.findings.extend(findings)
+        if apply and any(finding.repair is not None for finding in findings):
+            repaired = apply_repairs(raw, findings)
+            try:
+                text = repaired.decode('utf-8')
+            except UnicodeDecodeError:
+                continue
+            write_atomic(path, text)
+            report.repaired_files.append(label)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Scan text files for mojibake and optionally repair it.')
+    parser.add_argument('paths', nargs='*', type=Path, help='Files or directories (default: src, public/templates, docs).')
+    parser.add_argument(
+        '--apply',
+        action='store_true',
+        help='Write plausible round-trip repairs back to the files; exit 1 if any finding is left unrepaired.',
+    )
+    parser.add_argument('--json', action='store_true', help='Print the full JSON report.')
+    parser.add_argument('--output', type=Path, help='Also write the JSON report to this file.')
+    args = parser.parse_args(argv)
+
+    paths = args.paths or [REPO_ROOT / name for name in DEFAULT_ROOTS]
+    report = scan(paths, apply=args.apply)
+    data = report.to_json()
+    if args.output:
+        write_atomic(args.output, json.dumps(data, indent=2, ensure_ascii=False) + '\n')
+    if args.json:
+        json.dump(data, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write('\n')
+    else:
+        for finding in report.findings:
+            if finding.repair is not None:
+                repair = f' -> {finding.repair!r}'
+            elif finding.proposal is not None:
+                repair = f' -> {finding.proposal!r} (propose only)'
+            else:
+                repair = ''
+            print(f'{finding.path}:{finding.line}:{finding.column}: {finding.kind} {finding.text!r}{repair}')
+    for path in report.repaired_files:
+        print(f'repaired: {path}', file=sys.stderr)
+    print(report.summary(), file=sys.stderr)
+    # Without --apply nothing was repaired; with it, only what could not be.
+    remaining = report.findings if not args.apply else report.unrepaired()
+    if args.apply and remaining:
+        print(f'{len(remaining)} findings left unrepaired', file=sys.stderr)
+    return 1 if remaining else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+"""Alias normalization shared by the manifest index and the alias scripts.
+
+``normalize_es`` lower-cases and strips accents (``Cláusula`` -> ``clausula``).
+ASCII input returns right after ``lower()``. Everything else is folded by one
+``str.translate`` with a table precomputed from the NFD decompositions of the
+Latin blocks; characters outside the table are decomposed once, on first
+sight, and added to it. Only text containing the handful of characters whose
+decomposition is order-sensitive (non-spacing combining classes that are not
+``Mn``) takes the full NFD-and-filter path, so results always match it.
+
+``normalize_es`` is memoized in a bounded LRU, and ``normalize_es_many``
+lower-cases a whole alias list in one call.
+"""
+import unicodedata
+from collections.abc import Iterable
+from functools import lru_cache
+
+MEMO_SIZE = 16384
+_SEPARATOR = '\x00'
+
+# Latin-1 Supplement, Latin Extended-A/B, IPA and Latin Extended Additional.
+_FOLD_RANGES = (range(0x00C0, 0x0300), range(0x1E00, 0x1F00))
+_COMBINING = range(0x0300, 0x0370)
+
+
+def _fold_slow(value: str) -> str:
+    normalized = unicodedata.normalize('NFD', value)
+    return ''.join(ch for ch in normalized if unicodedata.category(ch) != 'Mn')
+
+
+# code point -> folded text (None deletes a combining mark)
+FOLD_TABLE: dict[int, str | None] = {code: None for code in _COMBINING if unicodedata.category(chr(code)) == 'Mn'}
+# Every non-ASCII code point the table already accounts for, mapped to None;
+# ``text.translate(_KNOWN).isascii()`` tells whether folding is complete.
+_KNOWN: dict[int, None] = {}
+# Code points that must go through the full-string NFD path.
+_ORDER_SENSITIVE: set[int] = set()
+
+
+def _learn(code: int) -> bool:
+    char = chr(code)
+    decomposed = unicodedata.normalize('NFD', char)
+    if any(unicodedata.combining(part) and unicodedata.category(part) != 'Mn' for part in decomposed):
+        _ORDER_SENSITIVE.add(code)
+        return False
+    folded = _fold_slow(char)
+    if folded != char:
+        FOLD_TABLE[code] = folded
+    _KNOWN[code] = None
+    for part in folded:
+        if not part.isascii():
+            _KNOWN[ord(part)] = None
+    return True
+
+
+for _block in _FOLD_RANGES:
+    for _code in _block:
+        _learn(_code)
+_KNOWN.update(FOLD_TABLE.fromkeys(FOLD_TABLE))
+
+
+def _finish(folded: str) -> str | None:
+    """Fold the characters the table has not seen yet; None if NFD order matters."""
+    for char in set(folded.translate(_KNOWN)):
+        code = ord(char)
+        if not char.isascii() and (code in _ORDER_SENSITIVE or not _learn(code)):
+            return None
+    return folded.translate(FOLD_TABLE)
+
+
+def _fold_lowered(lowered: str) -> str:
+    folded = lowered.translate(FOLD_TABLE)
+    if folded.isascii() or folded.translate(_KNOWN).isascii():
+        return folded
+    finished = _finish(folded)
+    return _fold_slow(folded) if finished is None else finished
+
+
+def fold_es(value: str) -> str:
+    """Unmemoized ``normalize_es``."""
+    lowered = value.strip().lower()
+    return lowered if lowered.isascii() else _fold_lowered(lowered)
+
+
+normalize_es = lru_cache(maxsize=MEMO_SIZE)(fold_es)
+
+
+def normalize_es_many(values: Iterable[str]) -> list[str]:
+    """``[normalize_es(value) for value in values]`` with one ``lower()`` over the joined list.
+
+    ASCII aliases (most of them) are done after that single call; only the
+    accented ones are translated individually.
+    """
+    stripped = [value.strip() for value in values]
+    if not stripped:
+        return []
+    lowered = _SEPARATOR.join(stripped).lower()
+    if lowered.count(_SEPARATOR) != len(stripped) - 1:
+        # A value contains the separator itself; fold one at a time.
+        return [fold_es(value) for value in stripped]
+    if lowered.isascii():
+        return lowered.split(_SEPARATOR)
+    return [part if part.isascii() else _fold_lowered(part) for part in lowered.split(_SEPARATOR)]
+
+
+def normalize_en(value: str) -> str:
+    return value.strip().lower()
@@ -0,0 +1,8 @@
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+STATE_DIR = REPO_ROOT / 'state'
+DOCUMENTS_DIR = REPO_ROOT / 'src' / 'lib' / 'documents'
+MANIFEST_PATH = DOCUMENTS_DIR / 'manifest.generated.json'
+REPORT_PATH = REPO_ROOT / 'template-verification-report.json'
+TEMPLATES_DIR = REPO_ROOT / 'public' / 'templates'
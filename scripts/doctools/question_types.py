@@ -0,0 +1,188 @@
+"""Inventory of question field types across every ``questions.ts``.
+
+    python -m doctools.question_types [--json] [--output PATH]
+
+Each file is tokenized with the ``ts_literals`` walker, so ``type:`` inside a
+placeholder string or comment is ignored and nested objects (array subfields)
+keep their own ``id``. Parsed fields are cached per file keyed on mtime and
+size; a warm run only stats the tree and re-parses what changed. Files are
+read and parsed in a thread pool.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .fsutil import write_atomic
+from .paths import DOCUMENTS_DIR, REPO_ROOT, STATE_DIR
+from .ts_literals import STRING_LITERAL, TOKEN_RE
+
+CACHE_VERSION = 1
+VALUE_RE = re.compile(rf'\s*({STRING_LITERAL})')
+TYPES_PATH = REPO_ROOT / 'src' / 'types' / 'documents.ts'
+QUESTION_TYPE_RE = re.compile(r'export type Question = \{.*?\btype:(.*?);', re.DOTALL)
+
+
+def parse_fields(text: str) -> list[tuple[str | None, str]]:
+    """Return ``(id, type)`` for every object literal that has a string ``type``."""
+    fields: list[tuple[str | None, str]] = []
+    stack: list[dict[str, str] | None] = []
+    for match in TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == 'open':
+            stack.append({} if match.group('open') == '{' else None)
+        elif kind == 'close':
+            current = stack.pop() if stack else None
+            if current and 'type' in current:
+                fields.append((current.get('id'), current['type']))
+        elif kind == 'key' and stack and stack[-1] is not None:
+            key = match.group('key').strip('\'"')
+            if key in {'id', 'type'}:
+                value = VALUE_RE.match(text, match.end())
+                if value:
+                    stack[-1][key] = value.group(1)[1:-1]
+    return fields
+
+
+def supported_types(path: Path = TYPES_PATH) -> set[str]:
+    """The string literals of ``Question['type']`` in ``src/types/documents.ts``."""
+    match = QUESTION_TYPE_RE.search(path.read_text(encoding='utf-8'))
+    if match is None:
+        raise ValueError(f'No Question type union in {path}')
+    return {literal[1:-1] for literal in re.findall(STRING_LITERAL, match.group(1))}
+
+
+@dataclass
+class Inventory:
+    # type -> document -> field ids
+    types: dict[str, dict[str, list[str | None]]] = field(default_factory=dict)
+    files: int = 0
+    parsed: int = 0
+    seconds: float = 0.0
+
+    def add(self, document: str, fields: list[tuple[str | None, str]]) -> None:
+        for field_id, field_type in fields:
+            self.types.setdefault(field_type, {}).setdefault(document, []).append(field_id)
+
+    def discard(self, document: str) -> None:
+        for field_type in list(self.types):
+            documents = self.types[field_type]
+            documents.pop(document, None)
+            if not documents:
+                del self.types[field_type]
+
+    def field_count(self, field_type: str) -> int:
+        return sum(len(ids) for ids in self.types[field_type].values())
+
+    def to_json(self) -> dict:
+        return {
+            'files': self.files,
+            'fields': sum(self.field_count(field_type) for field_type in self.types),
+            'types': {
+                field_type: {
+                    'fields': self.field_count(field_type),
+                    'documents': dict(sorted(documents.items())),
+                }
+                for field_type, documents in sorted(self.types.items())
+            },
+        }
+
+    def summary(self) -> str:
+        return f'{self.files} files ({self.parsed} parsed, {self.files - self.parsed} cached) in {self.seconds * 1000:.0f} ms'
+
+
+def _question_files(root: Path) -> list[Path]:
+    found: list[Path] = []
+    for directory, _, names in os.walk(root):
+        if 'questions.ts' in names:
+            found.append(Path(directory) / 'questions.ts')
+    return sorted(found)
+
+
+def _load_cache(path: Path | None) -> dict[str, dict]:
+    if path is None or not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except json.JSONDecodeError:
+        return {}
+    return data.get('files', {}) if data.get('version') == CACHE_VERSION else {}
+
+
+def _scan(path: Path) -> tuple[int, int, list[tuple[str | None, str]]]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size, parse_fields(path.read_text(encoding='utf-8', errors='replace'))
+
+
+def build_inventory(
+    root: Path = DOCUMENTS_DIR,
+    cache_path: Path | None = STATE_DIR / 'question-types.cache.json',
+    workers: int | None = None,
+) -> Inventory:
+    started = time.perf_counter()
+    cached = _load_cache(cache_path)
+    entries: dict[str, dict] = {}
+    stale: list[tuple[str, Path]] = []
+    for path in _question_files(root):
+        document = path.parent.relative_to(root).as_posix()
+        stat = path.stat()
+        previous = cached.get(document)
+        if previous and previous['mtime_ns'] == stat.st_mtime_ns and previous['size'] == stat.st_size:
+            entries[document] = previous
+        else:
+            stale.append((document, path))
+
+    if stale:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for (document, _), (mtime_ns, size, fields) in zip(stale, pool.map(lambda item: _scan(item[1]), stale)):
+                entries[document] = {'mtime_ns': mtime_ns, 'size': size, 'fields': fields}
+
+    inventory = Inventory(files=len(entries), parsed=len(stale))
+    for document in sorted(entries):
+        inventory.add(document, [tuple(item) for item in entries[document]['fields']])
+
+    if cache_path is not None and (stale or len(entries) != len(cached)):
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(cache_path, json.dumps({'version': CACHE_VERSION, 'files': entries}, separators=(',', ':')))
+    inventory.seconds = time.perf_counter() - started
+    return inventory
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Index question field types across document questions.ts files.')
+    parser.add_argument('--root', type=Path, default=DOCUMENTS_DIR, help='Directory searched for questions.ts files.')
+    parser.add_argument(
+        '--cache-path',
+        type=Path,
+        default=STATE_DIR / 'question-types.cache.json',
+        help='Per-file parse cache (default: state/question-types.cache.json).',
+    )
+    parser.add_argument('--no-cache', action='store_true', help='Parse every file and leave the cache untouched.')
+    parser.add_argument('--workers', type=int, default=None, help='Reader threads (default: Python default).')
+    parser.add_argument('--json', action='store_true', help='Print the full type -> document -> field id index.')
+    parser.add_argument('--output', type=Path, help='Also write the JSON index to this file.')
+    args = parser.parse_args(argv)
+
+    inventory = build_inventory(args.root.resolve(), None if args.no_cache else args.cache_path, args.workers)
+    index = inventory.to_json()
+    if args.output:
+        write_atomic(args.output, json.dumps(index, indent=2, ensure_ascii=False) + '\n')
+    if args.json:
+        json.dump(index, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write('\n')
+    else:
+        print(f'{"type":<16} {"fields":>7} {"documents":>9}')
+        for field_type, info in sorted(index['types'].items(), key=lambda item: -item[1]['fields']):
+            print(f'{field_type:<16} {info["fields"]:>7} {len(info["documents"]):>9}')
+        print(f'{"total":<16} {index["fields"]:>7} {index["files"]:>9}')
+    print(inventory.summary(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,125 @@
+"""Incremental reader for ``template-verification-report.json``.
+
+The report is one large object whose ``results`` array holds a record per
+template, each with full variable and heading lists. ``iter_report_results``
+reads the file in fixed-size chunks and decodes one result object at a time,
+yielding only the requested fields. Memory stays bounded by the largest single
+result, and the first record is available after the first chunk is read.
+"""
+import codecs
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+from . import workspace
+
+DEFAULT_FIELDS = ('documentType', 'errors', 'contentHash')
+ALIAS_MISMATCH = 'Metadata alias count mismatch'
+
+_WHITESPACE = ' \t\r\n'
+_NUMBER_TAIL = '0123456789.eE+-'
+
+
+class _ChunkedText:
+    def __init__(self, path: Path, chunk_size: int):
+        self._handle = path.open('rb')
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self._chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self._handle.read(self._chunk_size)
+        if not chunk:
+            self.eof = True
+            self.buffer += self._decoder.decode(b'', final=True)
+            return False
+        if self.pos > self._chunk_size:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += self._decoder.decode(chunk)
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError('Unexpected end of report')
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f'Expected {char!r} at offset {self.pos}, found {self.buffer[self.pos]!r}')
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder):
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number that reaches the end of the buffer may continue in the next chunk.
+            if (
+                not self.eof
+                and isinstance(value, (int, float))
+                and (end == len(self.buffer) or self.buffer[end] in _NUMBER_TAIL)
+            ):
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_report_results(
+    path: Path,
+    fields: tuple[str, ...] | None = DEFAULT_FIELDS,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[dict]:
+    """Yield each entry of the report's ``results`` array, projected to ``fields``.
+
+    Pass ``fields=None`` to receive complete result objects.
+    """
+    decoder = json.JSONDecoder()
+    reader = _ChunkedText(path, chunk_size)
+    try:
+        reader.expect('{')
+        while reader.peek() != '}':
+            if reader.peek() == ',':
+                reader.pos += 1
+            key = reader.value(decoder)
+            reader.expect(':')
+            if key != 'results':
+                reader.value(decoder)
+                continue
+            reader.expect('[')
+            while reader.peek() != ']':
+                if reader.peek() == ',':
+                    reader.pos += 1
+                result = reader.value(decoder)
+                if fields is None:
+                    yield result
+                else:
+                    yield {name: result[name] for name in fields if name in result}
+            reader.pos += 1
+    finally:
+        reader.close()
+
+
+def alias_mismatch_documents(path: Path) -> set[str]:
+    found = workspace.cached(path, 'alias-mismatch', lambda: frozenset(
+        result['documentType']
+        for result in iter_report_results(path, ('documentType', 'errors'))
+        if any(ALIAS_MISMATCH in error for error in result.get('errors', []))
+    ))
+    return set(found)
@@ -0,0 +1,357 @@
+"""In-process port of ``scripts/verify-templates.ts`` for the Python tooling.
+
+    python -m doctools.template_verify [--json] [--output PATH] [--strict]
+
+Per-template checks (word count, required sections, variable count,
+prohibited content, structure) run in a process pool and are cached in
+``state/template-verify.cache.json`` keyed on each file's content hash, so a
+warm run only re-reads files whose mtime or size moved and re-checks files
+whose bytes changed. The en/es parity checks, including the metadata alias
+count, are cheap and always run against the current manifest.
+
+Error strings match the TypeScript verifier, and ``report_json`` produces the
+same shape as ``template-verification-report.json``. The document-specific
+rule tables and content-type patterns of the TS verifier are not ported.
+
+Invalid templates are the report, not a failure of the run, so the exit
+status is 0 unless ``--strict`` is given (the TS verifier's default, for
+gating); that keeps ``python -m doctools verify + fix-aliases`` chainable.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .fsutil import write_atomic
+from .manifest import ManifestIndex, load_manifest
+from .paths import STATE_DIR, TEMPLATES_DIR
+from .report_stream import ALIAS_MISMATCH
+
+CACHE_VERSION = 1
+LANGUAGES = ('en', 'es')
+MIN_WORDS = 500
+MAX_WORDS = 10000
+MIN_VARIABLES = 5
+REQUIRED_SECTIONS = ('## 1.', '## Signatures', 'IMPORTANT LEGAL NOTICE')
+PROHIBITED_CONTENT = (
+    'Vehicle Bill of Sale',
+    '_Template generated by 123 LegalDoc_',
+    'Replace bracketed fields with actual data',
+)
+DUPLICATE_CONTENT = 'DUPLICATE CONTENT: This file has identical content to other templates'
+# Template names whose manifest entry lives under a different id.
+METADATA_ALIASES = {'bill-of-sale-vehicle': 'vehicle-bill-of-sale'}
+
+VARIABLE_RE = re.compile(r'\{\{\s*([#/>]?)\s*([a-zA-Z0-9_.-]+)[^}]*\}\}')
+NUMBERED_RE = re.compile(r'^(\d+(?:\.\d+)*)')
+NUMBERED_SECTION_RE = re.compile(r'^##\s+(\d+)\.', re.MULTILINE)
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+@dataclass
+class TemplateResult:
+    path: str
+    documentType: str
+    language: str
+    contentHash: str
+    variables: list[str]
+    sectionHeadings: list[str]
+    numberedSections: list[str]
+    variableCount: int
+    sectionCount: int
+    wordCount: int
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+    @property
+    def isValid(self) -> bool:
+        return not self.errors
+
+    def to_json(self) -> dict:
+        data = asdict(self)
+        data['isValid'] = self.isValid
+        return data
+
+
+def check_template(path: Path, raw: bytes | None = None) -> TemplateResult:
+    """Run the per-file checks of ``verifyTemplate`` on one template."""
+    raw = path.read_bytes() if raw is None else raw
+    content = raw.decode('utf-8', errors='replace')
+    names = [name.strip() for prefix, name in VARIABLE_RE.findall(content) if not prefix and name != 'else']
+    lines = [line.strip() for line in re.split(r'\r?\n', content)]
+    headings = [re.sub(r'^##\s+', '', line).strip() for line in lines if line.startswith('## ')]
+    numbered = [match.group(1) for match in map(NUMBERED_RE.match, headings) if match]
+    result = TemplateResult(
+        path=str(path),
+        documentType=path.stem,
+        language=path.parent.name,
+        contentHash=hashlib.md5(raw).hexdigest(),
+        variables=sorted(set(names)),
+        sectionHeadings=headings,
+        numberedSections=numbered,
+        variableCount=len(names),
+        sectionCount=len(numbered),
+        wordCount=len(WHITESPACE_RE.split(content)),
+    )
+    errors, warnings = result.errors, result.warnings
+
+    if result.wordCount < MIN_WORDS:
+        errors.append(f'Document too short: {result.wordCount} words (minimum: {MIN_WORDS})')
+    if result.wordCount > MAX_WORDS:
+        warnings.append(f'Document very long: {result.wordCount} words (typical max: {MAX_WORDS})')
+    for section in REQUIRED_SECTIONS:
+        if section not in content:
+            errors.append(f'Missing required section: "{section}"')
+    if result.variableCount < MIN_VARIABLES:
+        errors.append(f'Too few variables: {result.variableCount} (minimum: {MIN_VARIABLES})')
+    for prohibited in PROHIBITED_CONTENT:
+        if prohibited in content:
+            errors.append(f'Contains prohibited content: "{prohibited}"')
+
+    if not content.startswith('# '):
+        errors.append('Missing main header (# Title)')
+    numbers = [int(number) for number in NUMBERED_SECTION_RE.findall(content)]
+    if numbers != list(range(1, len(numbers) + 1)):
+        errors.append('Section numbering is not sequential')
+    if_count, end_if_count = content.count('{{#if'), content.count('{{/if')
+    if if_count != end_if_count:
+        errors.append(f'Unbalanced Handlebars conditions: {if_count} #if vs {end_if_count} /if')
+    if '**_' in content or '_**' in content:
+        warnings.append('Inconsistent markdown formatting detected')
+    return result
+
+
+def _check_job(job: tuple[str, bytes]) -> dict:
+    path, raw = job
+    return asdict(check_template(Path(path), raw))
+
+
+def metadata_id(document_type: str) -> str:
+    return METADATA_ALIASES.get(document_type, document_type)
+
+
+def parity_issues(results: list[TemplateResult], manifest: ManifestIndex) -> list[tuple[str, tuple[str, ...], str]]:
+    """``findTranslationParityIssues``: ``(documentType, languages, message)`` triples."""
+    by_document: dict[str, dict[str, TemplateResult]] = {}
+    for result in results:
+        if result.language in LANGUAGES:
+            by_document.setdefault(result.documentType, {})[result.language] = result
+
+    issues: list[tuple[str, tuple[str, ...], str]] = []
+    for document_type, languages in by_document.items():
+        entry = manifest.by_id.get(metadata_id(document_type))
+        if entry is None:
+            issues.append((document_type, tuple(languages), f'Metadata entry missing for document "{document_type}".'))
+            continue
+        translations = entry['meta'].get('translations') or {}
+        has_en = bool(translations.get('en', {}).get('name'))
+        has_es = bool(translations.get('es', {}).get('name'))
+        english, spanish = languages.get('en'), languages.get('es')
+        if english and not has_en:
+            issues.append((document_type, ('en',), f'Metadata missing English translation block for document "{document_type}".'))
+        if spanish and not has_es:
+            issues.append((document_type, ('es',), f'Metadata missing Spanish translation block for document "{document_type}".'))
+        if has_es and english and not spanish:
+            issues.append((
+                document_type,
+                ('en',),
+                f'Spanish template missing for document "{document_type}" but metadata declares Spanish support.',
+            ))
+            continue
+        if has_en and spanish and not english:
+            issues.append((
+                document_type,
+                ('es',),
+                f'English template missing for document "{document_type}" but metadata declares English support.',
+            ))
+            continue
+        if not english or not spanish:
+            continue
+
+        en_vars, es_vars = set(english.variables), set(spanish.variables)
+        parts = []
+        missing_es = [name for name in english.variables if name not in es_vars]
+        missing_en = [name for name in spanish.variables if name not in en_vars]
+        if missing_es:
+            parts.append(f'missing in ES: {", ".join(missing_es)}')
+        if missing_en:
+            parts.append(f'missing in EN: {", ".join(missing_en)}')
+        if parts:
+            issues.append((document_type, LANGUAGES, f'Variable parity mismatch ({"; ".join(parts)}).'))
+        if len(english.sectionHeadings) != len(spanish.sectionHeadings):
+            issues.append((
+                document_type,
+                LANGUAGES,
+                f'Section count mismatch: EN has {len(english.sectionHeadings)}, ES has {len(spanish.sectionHeadings)}.',
+            ))
+        if english.numberedSections != spanish.numberedSections:
+            issues.append((
+                document_type,
+                LANGUAGES,
+                f'Section numbering mismatch: EN {", ".join(english.numberedSections) or "none"}, '
+                f'ES {", ".join(spanish.numberedSections) or "none"}.',
+            ))
+        en_aliases = translations.get('en', {}).get('aliases')
+        es_aliases = translations.get('es', {}).get('aliases')
+        if en_aliases and es_aliases and len(en_aliases) != len(es_aliases):
+            issues.append((
+                document_type,
+                LANGUAGES,
+                f'{ALIAS_MISMATCH}: EN has {len(en_aliases)}, ES has {len(es_aliases)}.',
+            ))
+    return issues
+
+
+@dataclass
+class VerificationReport:
+    results: list[TemplateResult] = field(default_factory=list)
+    checked: int = 0
+    seconds: float = 0.0
+
+    def alias_mismatch_documents(self) -> set[str]:
+        """Manifest ids whose en/es alias counts differ (what fix-spanish-aliases repairs)."""
+        return {
+            metadata_id(result.documentType)
+            for result in self.results
+            if any(ALIAS_MISMATCH in error for error in result.errors)
+        }
+
+    def report_json(self) -> dict:
+        errors = sum(len(result.errors) for result in self.results)
+        valid = sum(result.isValid for result in self.results)
+        return {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+            'summary': {
+                'totalTemplates': len(self.results),
+                'validTemplates': valid,
+                'invalidTemplates': len(self.results) - valid,
+                'totalErrors': errors,
+                'totalWarnings': sum(len(result.warnings) for result in self.results),
+            },
+            'results': [result.to_json() for result in self.results],
+        }
+
+    def summary(self) -> str:
+        data = self.report_json()['summary']
+        return (
+            f'{data["totalTemplates"]} templates ({self.checked} checked, {len(self.results) - self.checked} cached) '
+            f'in {self.seconds:.2f}s: {data["invalidTemplates"]} invalid, {data["totalErrors"]} errors'
+        )
+
+
+def _load_cache(path: Path | None) -> dict[str, dict]:
+    if path is None or not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except json.JSONDecodeError:
+        return {}
+    return data.get('files', {}) if data.get('version') == CACHE_VERSION else {}
+
+
+def verify_templates(
+    root: Path = TEMPLATES_DIR,
+    manifest: ManifestIndex | None = None,
+    cache_path: Path | None = STATE_DIR / 'template-verify.cache.json',
+    workers: int | None = None,
+) -> VerificationReport:
+    started = time.perf_counter()
+    manifest = manifest or load_manifest()
+    cached = _load_cache(cache_path)
+    entries: dict[str, dict] = {}
+    jobs: list[tuple[str, bytes]] = []
+    for language in LANGUAGES:
+        for path in sorted((root / language).glob('*.md')):
+            key = f'{language}/{path.name}'
+            stat = path.stat()
+            previous = cached.get(key)
+            if previous and (previous['mtime_ns'], previous['size']) == (stat.st_mtime_ns, stat.st_size):
+                entries[key] = previous
+                continue
+            raw = path.read_bytes()
+            if previous and previous['result']['contentHash'] == hashlib.md5(raw).hexdigest():
+                entries[key] = dict(previous, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                continue
+            entries[key] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+            jobs.append((str(path), raw))
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            checked = list(executor.map(_check_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    else:
+        checked = [_check_job(job) for job in jobs]
+    for (path, _), result in zip(jobs, checked):
+        key = f'{Path(path).parent.name}/{Path(path).name}'
+        entries[key]['result'] = result
+
+    report = VerificationReport(checked=len(jobs))
+    by_key: dict[tuple[str, str], TemplateResult] = {}
+    for key in sorted(entries):
+        data = entries[key]['result']
+        # Parity errors are attached below; cached results only hold per-file errors.
+        result = TemplateResult(**{**data, 'errors': list(data['errors']), 'warnings': list(data['warnings'])})
+        report.results.append(result)
+        by_key[result.documentType, result.language] = result
+
+    for document_type, languages, message in parity_issues(report.results, manifest):
+        for language in languages:
+            result = by_key.get((document_type, language))
+            if result is not None and message not in result.errors:
+                result.errors.append(message)
+
+    by_hash: dict[str, list[TemplateResult]] = {}
+    for result in report.results:
+        by_hash.setdefault(result.contentHash, []).append(result)
+    for duplicates in by_hash.values():
+        if len(duplicates) > 1:
+            for result in duplicates:
+                result.errors.append(DUPLICATE_CONTENT)
+
+    if cache_path is not None and (jobs or len(entries) != len(cached)):
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(cache_path, json.dumps({'version': CACHE_VERSION, 'files': entries}, separators=(',', ':')))
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Verify en/es templates against the document manifest.')
+    parser.add_argument('--root', type=Path, default=TEMPLATES_DIR, help='Templates directory with en/ and es/.')
+    parser.add_argument(
+        '--cache-path',
+        type=Path,
+        default=STATE_DIR / 'template-verify.cache.json',
+        help='Per-file result cache (default: state/template-verify.cache.json).',
+    )
+    parser.add_argument('--no-cache', action='store_true', help='Re-check every template and leave the cache untouched.')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count).')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON.')
+    parser.add_argument('--output', type=Path, help='Write a template-verification-report.json compatible file.')
+    parser.add_argument('--strict', action='store_true', help='Exit 1 if any template is invalid.')
+    args = parser.parse_args(argv)
+
+    report = verify_templates(args.root.resolve(), cache_path=None if args.no_cache else args.cache_path, workers=args.workers)
+    data = report.report_json()
+    if args.output:
+        write_atomic(args.output, json.dumps(data, indent=2, ensure_ascii=False) + '\n')
+    if args.json:
+        json.dump(data, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write('\n')
+    else:
+        for result in report.results:
+            for error in result.errors:
+                print(f'{result.language}/{result.documentType}: {error}')
+    print(report.summary(), file=sys.stderr)
+    return 1 if args.strict and any(not result.isValid for result in report.results) else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
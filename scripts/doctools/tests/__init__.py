@@ -0,0 +1,4 @@
+"""Tests for the Python maintenance tooling.
+
+Run with ``python -m pytest doctools/tests`` from ``scripts/``.
+"""
@@ -0,0 +1,44 @@
+from doctools import cli
+
+
+def fake_run(statuses: dict[str, int], calls: list):
+    def run(name: str, args: list[str]) -> int:
+        calls.append((name, args))
+        return statuses.get(name, 0)
+    return run
+
+
+def test_split_chain():
+    assert cli.split_chain(['verify', '--json', '+', 'diff', '--changed']) == [['verify', '--json'], ['diff', '--changed']]
+
+
+def test_chain_stops_at_the_first_failure_unless_keep_going(monkeypatch, capsys):
+    calls = []
+    monkeypatch.setattr(cli, 'run', fake_run({'fix-aliases': 1}, calls))
+    assert cli.main(['verify', '+', 'fix-aliases', '+', 'diff']) == 1
+    assert [name for name, _ in calls] == ['verify', 'fix-aliases']
+
+    calls.clear()
+    assert cli.main(['--keep-going', 'verify', '+', 'fix-aliases', '+', 'diff', 'a.md']) == 1
+    assert calls == [('verify', []), ('fix-aliases', []), ('diff', ['a.md'])]
+    assert 'continuing' in capsys.readouterr().err
+
+
+def test_unknown_command_runs_nothing(monkeypatch, capsys):
+    calls = []
+    monkeypatch.setattr(cli, 'run', fake_run({}, calls))
+    assert cli.main(['verify', '+', 'nope']) == 2
+    assert calls == []
+    assert "unknown command 'nope'" in capsys.readouterr().err
+
+
+def test_verify_only_fails_with_strict(monkeypatch):
+    from doctools import template_verify
+    from doctools.template_verify import TemplateResult, VerificationReport
+
+    invalid = TemplateResult(path='en/lease.md', documentType='lease', language='en', contentHash='x', variables=[],
+                             sectionHeadings=[], numberedSections=[], variableCount=0, sectionCount=0, wordCount=1,
+                             errors=['Too short'])
+    monkeypatch.setattr(template_verify, 'verify_templates', lambda *args, **kwargs: VerificationReport(checked=1, results=[invalid]))
+    assert template_verify.main(['--no-cache']) == 0
+    assert template_verify.main(['--no-cache', '--strict']) == 1
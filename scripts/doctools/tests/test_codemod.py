@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from doctools.codemod import AhoCorasick, Codemod, Patch, PatchError, apply_patches
+
+
+def brute_force(text: str, patterns: list[str]) -> list[tuple[int, int]]:
+    return sorted(
+        (start, index)
+        for index, pattern in enumerate(patterns)
+        for start in range(len(text) - len(pattern) + 1)
+        if text.startswith(pattern, start)
+    )
+
+
+def test_overlapping_and_nested_patterns_are_all_found():
+    patterns = ['he', 'she', 'his', 'hers', 'e']
+    text = 'ushers and his sheep'
+    assert sorted(AhoCorasick(patterns).finditer(text)) == brute_force(text, patterns)
+
+
+def test_matches_agree_with_brute_force():
+    rng = random.Random(7)
+    for _ in range(200):
+        patterns = list({''.join(rng.choices('ab\n', k=rng.randint(1, 4))) for _ in range(rng.randint(1, 6))})
+        text = ''.join(rng.choices('ab\n', k=rng.randint(0, 40)))
+        assert sorted(AhoCorasick(patterns).finditer(text)) == brute_force(text, patterns)
+
+
+def test_empty_anchor_is_rejected():
+    with pytest.raises(PatchError):
+        AhoCorasick(['ok', ''])
+
+
+def test_overlaps_resolve_leftmost_then_longest_then_earlier_patch():
+    text, counts = apply_patches('abcd', [Patch('bcd', 'X', count=None), Patch('ab', 'Y', count=None)])
+    assert (text, counts) == ('Ycd', [0, 1])
+
+    text, counts = apply_patches('abcd', [Patch('ab', 'Y', count=None), Patch('abc', 'Z', count=None)])
+    assert (text, counts) == ('Zd', [0, 1])
+
+    text, counts = apply_patches('abcd', [Patch('ab', 'first', count=None), Patch('ab', 'second', count=None)])
+    assert (text, counts) == ('firstcd', [1, 0])
+
+
+def test_replacements_are_not_matched_again():
+    text, counts = apply_patches('a-b', [Patch('a', 'b'), Patch('b', 'c')])
+    assert (text, counts) == ('b-c', [1, 1])
+
+
+@pytest.mark.parametrize('source', [
+    "const label = 'old value'; // old value\n",
+    'const label = "old value";\n/* old value */\n',
+    'const label = `old value`;\n// old value\n',
+])
+def test_anchors_inside_string_literals_and_comments_are_plain_text(source):
+    # The codemod is literal: every occurrence counts, so a stray copy in a comment trips the expected count.
+    with pytest.raises(PatchError, match='expected 1, found 2'):
+        apply_patches(source, [Patch('old value', 'new value')])
+    text, counts = apply_patches(source, [Patch('old value', 'new value', count=2)])
+    assert (text.count('new value'), counts) == (2, [2])
+
+
+def test_line_endings_are_matched_and_restored():
+    text, _ = apply_patches('one\r\ntwo\r\nthree\r\n', [Patch('one\ntwo\n', 'uno\ndos\n')])
+    assert text == 'uno\r\ndos\r\nthree\r\n'
+    text, _ = apply_patches('one\ntwo\n', [Patch('one\r\ntwo', 'uno\r\ndos')])
+    assert text == 'uno\ndos\n'
+
+
+def test_a_failed_count_writes_nothing(tmp_path):
+    path = tmp_path / 'file.ts'
+    path.write_text('alpha beta\n', encoding='utf-8')
+    codemod = Codemod(tmp_path).add('file.ts', Patch('alpha', 'ALPHA'), Patch('gamma', 'GAMMA'))
+    with pytest.raises(PatchError, match='file.ts'):
+        codemod.run()
+    assert path.read_text(encoding='utf-8') == 'alpha beta\n'
+
+
+def test_dry_run_returns_a_diff_and_keeps_the_file(tmp_path):
+    path = tmp_path / 'file.ts'
+    path.write_bytes(b'\xef\xbb\xbfalpha\r\nbeta\r\n')
+    codemod = Codemod(tmp_path).add('file.ts', Patch('alpha', 'ALPHA'))
+
+    [result] = codemod.run(dry_run=True)
+    assert result.changed and '-alpha\n+ALPHA\n' in result.diff
+    assert path.read_bytes() == b'\xef\xbb\xbfalpha\r\nbeta\r\n'
+
+    codemod.run()
+    assert path.read_bytes() == b'\xef\xbb\xbfALPHA\r\nbeta\r\n'
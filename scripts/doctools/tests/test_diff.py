@@ -0,0 +1,52 @@
+import difflib
+import random
+
+import pytest
+
+from doctools import diff
+from doctools.bench.diff import apply_unified, mutate
+
+
+def both(a: list[str], b: list[str], **kwargs) -> tuple[list[str], list[str]]:
+    return (
+        list(difflib.unified_diff(a, b, 'a', 'b', lineterm='', **kwargs)),
+        list(diff.unified_diff(a, b, 'a', 'b', lineterm='', **kwargs)),
+    )
+
+
+@pytest.mark.parametrize('a, b', [
+    ([], []),
+    ([], ['new']),
+    (['old'], []),
+    (['same', 'lines'], ['same', 'lines']),
+    (['a', 'b', 'c'], ['a', 'x', 'c']),
+])
+def test_edge_cases_match_difflib(a, b):
+    expected, produced = both(a, b)
+    assert produced == expected
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_unique_lines_match_difflib_byte_for_byte(seed):
+    rng = random.Random(seed)
+    a = [f'line {index}' for index in range(300)]
+    b = mutate(a, rng.randint(1, 12), rng)
+    for context in (0, 3, 5):
+        expected, produced = both(a, b, n=context)
+        assert produced == expected
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_repetitive_input_still_reconstructs_the_target(seed):
+    # Repeated lines leave the alignment ambiguous: hunks may differ from difflib but must apply.
+    rng = random.Random(seed)
+    a = [rng.choice(['', '---', '- item', '| cell |', 'text']) for _ in range(200)]
+    b = mutate(a, rng.randint(1, 20), rng)
+    assert apply_unified(a, list(diff.unified_diff(a, b, 'a', 'b', lineterm=''))) == b
+
+
+def test_region_diff_only_covers_the_marked_window():
+    a = ['head', '<!-- start -->', 'one', 'two', '<!-- end -->', 'tail']
+    b = ['HEAD', '<!-- start -->', 'one', 'three', '<!-- end -->', 'tail']
+    lines = list(diff.region_diff(a, b, '<!-- start -->', '<!-- end -->', 'a', 'b', lineterm=''))
+    assert lines == ['--- a', '+++ b', '@@ -1,3 +1,3 @@', ' <!-- start -->', ' one', '-two', '+three']
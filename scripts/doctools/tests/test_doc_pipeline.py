@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from doctools.doc_pipeline import DocPipeline, replace_section, replace_text, trim_trailing_whitespace
+
+DOC = '# Policy\n\nBody.\n\n**Summary**  \n\nOld text.\n\n## Contact\n\nMail us.\n\n\n'
+
+
+def test_trim_trailing_whitespace_only_touches_the_end():
+    assert trim_trailing_whitespace()(DOC) == DOC.rstrip('\n') + '\n'
+    assert trim_trailing_whitespace()('**Header**  \n\ntext  \n \n') == '**Header**  \n\ntext\n'
+
+
+def test_replace_section_keeps_the_spacing_around_it():
+    updated = replace_section('**Summary', '**Summary**  \n\nNew text.\n')(DOC)
+    assert updated == DOC.replace('Old text.', 'New text.')
+
+
+def test_only_transforms_that_change_the_file_are_reported(tmp_path: Path):
+    path = tmp_path / 'policy.md'
+    path.write_text(DOC, encoding='utf-8')
+    pipeline = DocPipeline(tmp_path).add(
+        'policy.md', replace_section('**Summary', '**Summary**  \n\nOld text.\n', name='summary'),
+    ).add_shared(trim_trailing_whitespace())
+
+    report = pipeline.run()
+    assert report.results[0].fired == ['trailing whitespace']
+    assert {name: stat.fired for name, stat in report.stats.items()} == {'summary': 0, 'trailing whitespace': 1}
+    assert path.read_text(encoding='utf-8') == DOC.rstrip('\n') + '\n'
+
+    report = pipeline.run()
+    assert (report.results[0].fired, report.results[0].changed) == ([], False)
+    assert all(stat.fired == 0 for stat in report.stats.values())
+
+
+def test_transforms_that_cancel_out_are_not_reported(tmp_path: Path):
+    (tmp_path / 'policy.md').write_text(DOC, encoding='utf-8')
+    pipeline = DocPipeline(tmp_path).add(
+        'policy.md', replace_text('Mail', 'Write', name='forward'), replace_text('Write', 'Mail', name='back'),
+    )
+
+    report = pipeline.run(dry_run=True)
+    assert (report.results[0].fired, report.results[0].changed) == ([], False)
+    assert all(stat.fired == 0 for stat in report.stats.values())
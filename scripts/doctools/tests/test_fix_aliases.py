@@ -0,0 +1,169 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from doctools import fix_aliases
+from doctools.bench.fixtures import generate
+from doctools.fsutil import write_atomic
+from doctools.manifest import load_manifest
+from doctools.manifest_patch import PatchReport, manifest_aliases, patch_json, read_aliases
+
+
+@pytest.fixture
+def library(tmp_path: Path):
+    return generate(tmp_path, 12, seed=0, mismatch_rate=0.5)
+
+
+def run(library, *args: str, patch: bool = False) -> int:
+    options = [] if patch else ['--no-manifest-patch']
+    return fix_aliases.main(['--root', str(library.root), '--workers', '1', *options, *args])
+
+
+def patch_json_manifest(doc_ids, documents_dir: Path) -> PatchReport:
+    # The fixture's TS manifest is not prettier-formatted, so only the JSON one is patched here.
+    path = documents_dir / 'manifest.generated.json'
+    text = path.read_text(encoding='utf-8')
+    entries = {entry['id']: entry for entry in json.loads(text)['entries']}
+    updates = {
+        doc_id: manifest_aliases(read_aliases(documents_dir / entries[doc_id]['importPath'].removeprefix('./') / 'metadata.ts'))
+        for doc_id in doc_ids
+    }
+    write_atomic(path, patch_json(text, updates))
+    return PatchReport(patched=sorted(doc_ids), written=[path])
+
+
+def metadata_paths(root: Path) -> dict[str, Path]:
+    documents_dir = root / 'src' / 'lib' / 'documents'
+    manifest = load_manifest(documents_dir / 'manifest.generated.json', snapshot_dir=None)
+    return {entry['id']: documents_dir / entry['importPath'].removeprefix('./') / 'metadata.ts' for entry in manifest.entries}
+
+
+def mismatched(root: Path) -> set[str]:
+    found = set()
+    for doc_id, path in metadata_paths(root).items():
+        aliases = read_aliases(path)
+        if len(aliases['en']) != len(aliases['es']):
+            found.add(doc_id)
+    return found
+
+
+def test_offline_miss_leaves_documents_unchanged(library, capsys):
+    before = {doc_id: path.read_bytes() for doc_id, path in metadata_paths(library.root).items()}
+
+    assert run(library, '--offline') == 0
+
+    assert {doc_id: path.read_bytes() for doc_id, path in metadata_paths(library.root).items()} == before
+    assert f'{library.mismatched} documents left unchanged' in capsys.readouterr().out
+    assert not (library.root / 'state' / 'translation-cache.jsonl').exists()
+
+
+def test_translations_are_cached_for_offline_runs(library, capsys, monkeypatch):
+    cache_path = library.root / 'state' / 'translation-cache.jsonl'
+    assert run(library, '--translator', 'fake', '--rate', '0') == 0
+    out = capsys.readouterr().out
+    assert 'Translating' in out
+    assert mismatched(library.root) == set()
+    assert cache_path.exists()
+
+    # A fresh library with the same aliases resolves entirely from the cache.
+    fresh = generate(library.root / 'again', 12, seed=0, mismatch_rate=0.5)
+    calls = []
+    monkeypatch.setattr(fix_aliases.FakeTranslator, 'translate', lambda self, alias: calls.append(alias))
+    assert run(fresh, '--offline', '--cache-path', str(cache_path)) == 0
+    out = capsys.readouterr().out
+    assert calls == []
+    assert 'Offline mode' not in out
+    assert ', 0 misses,' in out
+    assert mismatched(fresh.root) == set()
+
+
+def test_online_run_after_offline_still_translates(library, capsys):
+    assert run(library, '--offline') == 0
+    capsys.readouterr()
+
+    assert run(library, '--translator', 'fake', '--rate', '0') == 0
+    out = capsys.readouterr().out
+    assert f'Updated {library.mismatched} metadata files' in out
+    assert 'Translating' in out
+    assert mismatched(library.root) == set()
+
+
+def test_permanent_translation_failure_leaves_documents_pending(library, capsys, monkeypatch):
+    before = {doc_id: path.read_bytes() for doc_id, path in metadata_paths(library.root).items()}
+
+    def fail(self, alias):
+        raise fix_aliases.TranslationError(f'service down for {alias!r}')
+
+    monkeypatch.setattr(fix_aliases.FakeTranslator, 'translate', fail)
+    assert run(library, '--translator', 'fake', '--rate', '0', '--retries', '0') == 1
+
+    out = capsys.readouterr().out
+    assert {doc_id: path.read_bytes() for doc_id, path in metadata_paths(library.root).items()} == before
+    assert 'No metadata files were updated.' in out
+    assert "Translation failed for '" in out
+    assert f'{library.mismatched} documents left unchanged' in out
+    assert not (library.root / 'state' / 'translation-cache.jsonl').exists()
+
+
+def test_incremental_rerun_skips_documents_after_manifest_patch(library, capsys, monkeypatch):
+    monkeypatch.setattr(fix_aliases, 'patch_manifests', patch_json_manifest)
+    assert run(library, '--translator', 'fake', '--rate', '0', '--incremental', patch=True) == 0
+    assert f'Updated {library.mismatched} metadata files' in capsys.readouterr().out
+
+    assert run(library, '--translator', 'fake', '--rate', '0', '--incremental', patch=True) == 0
+    out = capsys.readouterr().out
+    assert f'skipped {library.mismatched} documents' in out
+    assert 'reprocessed' not in out
+
+
+@pytest.mark.parametrize('option', [['--global-uniqueness'], ['--memory-threshold', '0.9'], ['--cache-path', 'other.jsonl']])
+def test_incremental_rerun_with_other_options_reprocesses(library, capsys, monkeypatch, option, tmp_path):
+    option = [str(tmp_path / value) if value.endswith('.jsonl') else value for value in option]
+    monkeypatch.setattr(fix_aliases, 'patch_manifests', patch_json_manifest)
+    assert run(library, '--translator', 'fake', '--rate', '0', '--incremental', patch=True) == 0
+    capsys.readouterr()
+
+    assert run(library, '--translator', 'fake', '--rate', '0', '--incremental', *option, patch=True) == 0
+    out = capsys.readouterr().out
+    assert 'skipped 0 documents' in out
+    assert f'reprocessed {library.mismatched}: overrides or options changed' in out
+
+
+def test_incremental_state_is_not_recorded_when_the_patch_fails(library, capsys):
+    # The real patcher cannot find the fixture's unformatted TS blocks.
+    assert run(library, '--translator', 'fake', '--rate', '0', '--incremental', patch=True) == 0
+    assert 'Manifest patch failed' in capsys.readouterr().out
+
+    assert run(library, '--translator', 'fake', '--rate', '0', '--incremental', patch=True) == 0
+    assert f'reprocessed {library.mismatched}: no previous run' in capsys.readouterr().out
+
+
+def test_memory_match_without_a_usable_candidate_is_batched(library, capsys, monkeypatch):
+    manifest_path = library.root / 'src' / 'lib' / 'documents' / 'manifest.generated.json'
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    broken = sorted(mismatched(library.root))[0]
+    entries = {entry['id']: entry for entry in manifest['entries']}
+    pending = entries[broken]['meta']['translations']['en']['aliases'][-1]
+    # Another document teaches the memory an accepted variant whose Spanish is on the BAD_SUBSTRINGS list.
+    donor = next(entry for doc_id, entry in entries.items() if doc_id not in mismatched(library.root))
+    donor['meta']['translations']['en']['aliases'].append(f'the {pending}')
+    donor['meta']['translations']['es']['aliases'].append('formulario automático')
+    manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+
+    serial = []
+    translate_with_retry = fix_aliases.translate_with_retry
+    monkeypatch.setattr(fix_aliases, 'translate_with_retry',
+                        lambda translator, alias, *args, **kwargs: serial.append(alias) or translate_with_retry(translator, alias, *args, **kwargs))
+    assert run(library, '--translator', 'fake', '--rate', '0') == 0
+    assert serial == []
+    assert 'automático' not in ''.join(read_aliases(metadata_paths(library.root)[broken])['es'])
+
+
+def test_state_save_is_timed_apart_from_the_metadata_write(library, monkeypatch):
+    phases = []
+    phase = fix_aliases.instrument.phase
+    monkeypatch.setattr(fix_aliases.instrument, 'phase', lambda name: phases.append(name) or phase(name))
+    assert run(library, '--translator', 'fake', '--rate', '0') == 0
+    assert phases.count('write') == 1
+    assert phases.index('write') < phases.index('state save')
@@ -0,0 +1,35 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from doctools.git_blobs import GitBlobReader, changed_paths
+from doctools.worktree_diff import render_diff
+
+
+def git(repo: Path, *args: str) -> None:
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args], cwd=repo, check=True,
+                   capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    git(tmp_path, 'init', '-q')
+    (tmp_path / 'with space.md').write_text('one\ntwo\n', encoding='utf-8')
+    (tmp_path / 'gone.md').write_text('old\nlines\n', encoding='utf-8')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'initial')
+    return tmp_path
+
+
+def test_read_many_handles_missing_paths_with_spaces(repo):
+    with GitBlobReader(repo) as reader:
+        blobs = reader.read_many(['with space.md', 'not here at all.md', 'gone.md'])
+        assert reader.read('still not here.md') is None
+    assert blobs == {'with space.md': b'one\ntwo\n', 'not here at all.md': None, 'gone.md': b'old\nlines\n'}
+
+
+def test_deleted_file_diffs_against_nothing(repo):
+    (repo / 'gone.md').unlink()
+    assert changed_paths(['.'], repo) == ['gone.md']
+    assert render_diff('gone.md', 'old\nlines\n', repo) == '--- a/gone.md\n+++ /dev/null\n@@ -1,2 +0,0 @@\n-old\n-lines\n'
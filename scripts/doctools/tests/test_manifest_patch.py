@@ -0,0 +1,92 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from doctools.manifest_patch import check_consistency, patch_manifests
+from doctools.paths import DOCUMENTS_DIR
+from doctools.ts_literals import rewrite_alias_arrays
+
+DOC_IDS = ('ach-authorization-form', 'advance-directive')
+
+
+@pytest.fixture
+def documents_dir(tmp_path: Path) -> Path:
+    for name in ('manifest.generated.json', 'manifest.generated.ts'):
+        shutil.copy2(DOCUMENTS_DIR / name, tmp_path / name)
+    for doc_id in DOC_IDS:
+        (tmp_path / 'us' / doc_id).mkdir(parents=True)
+        shutil.copy2(DOCUMENTS_DIR / 'us' / doc_id / 'metadata.ts', tmp_path / 'us' / doc_id / 'metadata.ts')
+    return tmp_path
+
+
+def metadata_paths(documents_dir: Path) -> dict[str, Path]:
+    return {doc_id: documents_dir / 'us' / doc_id / 'metadata.ts' for doc_id in DOC_IDS}
+
+
+def set_es_aliases(path: Path, aliases: list[str]) -> None:
+    path.write_text(rewrite_alias_arrays(path.read_text(encoding='utf-8'), {'es': aliases}), encoding='utf-8')
+
+
+def check(documents_dir: Path) -> list[str]:
+    return check_consistency(
+        (documents_dir / 'manifest.generated.json').read_text(encoding='utf-8'),
+        (documents_dir / 'manifest.generated.ts').read_text(encoding='utf-8'),
+        metadata_paths(documents_dir),
+    )
+
+
+def en_manifest_array(ts_text: str, doc_id: str) -> tuple[int, int]:
+    start = ts_text.index(f'\n    id: "{doc_id}",\n')
+    array_start = ts_text.index('\n          aliases: [', start)
+    return array_start, ts_text.index('\n          ],', array_start) + len('\n          ],')
+
+
+def test_untouched_manifests_are_consistent(documents_dir):
+    assert check(documents_dir) == []
+
+
+def test_patch_is_checked_against_metadata(documents_dir):
+    path = metadata_paths(documents_dir)['ach-authorization-form']
+    set_es_aliases(path, ['autorización bancaria', 'formulario de pago automático'])
+
+    report = patch_manifests(['ach-authorization-form'], documents_dir)
+
+    assert report.patched == ['ach-authorization-form']
+    assert check(documents_dir) == []
+    metadata = json.loads((documents_dir / 'manifest.generated.json').read_text(encoding='utf-8'))['metadata']
+    assert metadata['ach-authorization-form']['translations']['es']['aliases'] == ['autorización bancaria', 'formulario de pago automático']
+
+
+def test_metadata_changes_after_the_patch_are_reported(documents_dir):
+    set_es_aliases(metadata_paths(documents_dir)['ach-authorization-form'], ['autorización bancaria'])
+
+    problems = check(documents_dir)
+
+    assert 'ach-authorization-form: JSON entries es aliases do not match metadata.ts' in problems
+    assert 'ach-authorization-form: DOCUMENT_METADATA es aliases do not match metadata.ts' in problems
+    assert 'ach-authorization-form: DOCUMENT_MANIFEST all aliases do not match metadata.ts' in problems
+
+
+def test_document_metadata_en_array_is_checked(documents_dir):
+    ts_path = documents_dir / 'manifest.generated.ts'
+    text = ts_path.read_text(encoding='utf-8')
+    block = text.index('\n  "ach-authorization-form": {\n')
+    item = '\n          "bank authorization",'
+    en_item = text.index(item, block)
+    ts_path.write_text(text[:en_item] + item.replace('authorization', 'authorisation') + text[en_item + len(item):], encoding='utf-8')
+
+    assert check(documents_dir) == ['ach-authorization-form: DOCUMENT_METADATA en aliases do not match metadata.ts']
+
+
+def test_aliases_found_in_another_document_do_not_pass(documents_dir):
+    ts_path = documents_dir / 'manifest.generated.ts'
+    text = ts_path.read_text(encoding='utf-8')
+    (ach_start, ach_end), (other_start, other_end) = (en_manifest_array(text, doc_id) for doc_id in DOC_IDS)
+    assert ach_end < other_start
+    swapped = (text[:ach_start] + text[other_start:other_end] + text[ach_end:other_start]
+               + text[ach_start:ach_end] + text[other_end:])
+    ts_path.write_text(swapped, encoding='utf-8')
+
+    assert check(documents_dir) == [f'{doc_id}: DOCUMENT_MANIFEST en aliases do not match metadata.ts' for doc_id in DOC_IDS]
@@ -0,0 +1,126 @@
+import json
+import multiprocessing
+import os
+from pathlib import Path
+
+import pytest
+
+from doctools.memory_store import MemoryStore, main
+
+
+@pytest.fixture
+def snapshot(tmp_path: Path) -> Path:
+    path = tmp_path / 'memory.json'
+    path.write_text(json.dumps({'cycle_id': 'c1', 'last_updated': None, 'notes': ['n1'], 'todos': []}, indent=4) + '\n',
+                    encoding='utf-8')
+    return path
+
+
+def write_notes(path: str, writer: int, count: int) -> None:
+    store = MemoryStore(Path(path), compact_bytes=2048)
+    for index in range(count):
+        store.record(notes=[f'w{writer}-{index}'], cycle_id=f'w{writer}')
+
+
+def test_record_appends_without_touching_the_snapshot(snapshot):
+    before = snapshot.read_bytes()
+    store = MemoryStore(snapshot)
+    store.record(notes=['n2'], todos=['t1'], cycle_id='c2')
+    store.record(notes=['n3'])
+
+    assert snapshot.read_bytes() == before
+    assert store.state() == {'cycle_id': 'c2', 'last_updated': None, 'notes': ['n1', 'n2', 'n3'], 'todos': ['t1']}
+    # A second reader replays the same log; the first only parses what was added since.
+    store.record(todos=['t2'])
+    assert store.state() == MemoryStore(snapshot).state()
+
+
+def test_compaction_folds_the_log_into_the_snapshot(snapshot):
+    store = MemoryStore(snapshot)
+    store.record(notes=['n2'], cycle_id='c2')
+    assert store.compact()
+    assert not store.compact()
+
+    assert json.loads(snapshot.read_text(encoding='utf-8'))['notes'] == ['n1', 'n2']
+    assert snapshot.read_text(encoding='utf-8').startswith('{\n    "cycle_id"')
+    assert MemoryStore(snapshot).state()['cycle_id'] == 'c2'
+
+
+def test_concurrent_writers_lose_nothing(snapshot):
+    context = multiprocessing.get_context('spawn')
+    writers = [context.Process(target=write_notes, args=(str(snapshot), writer, 60)) for writer in range(3)]
+    for process in writers:
+        process.start()
+    for process in writers:
+        process.join()
+        assert process.exitcode == 0
+
+    notes = MemoryStore(snapshot).state()['notes']
+    assert len(notes) == 1 + 3 * 60
+    for writer in range(3):
+        assert [note for note in notes if note.startswith(f'w{writer}-')] == [f'w{writer}-{index}' for index in range(60)]
+    # compact_bytes is small, so the writers compacted while the others appended.
+    assert len(json.loads(snapshot.read_text(encoding='utf-8'))['notes']) > 1
+
+
+def test_interrupted_compaction_does_not_replay_twice(snapshot, monkeypatch):
+    store = MemoryStore(snapshot)
+    store.record(notes=['n2'])
+
+    replace = os.replace
+
+    def crash_on_log_swap(source, target):
+        if Path(target) == store.log_path:
+            raise KeyboardInterrupt
+        replace(source, target)
+
+    # Die after the snapshot is replaced but before the successor log is swapped in.
+    monkeypatch.setattr(os, 'replace', crash_on_log_swap)
+    with pytest.raises(KeyboardInterrupt):
+        store.compact()
+    monkeypatch.undo()
+    assert store.next_log_path.exists()
+    assert json.loads(snapshot.read_text(encoding='utf-8'))['notes'] == ['n1', 'n2']
+
+    assert MemoryStore(snapshot).state()['notes'] == ['n1', 'n2']
+    MemoryStore(snapshot).record(notes=['n3'])
+    assert MemoryStore(snapshot).state()['notes'] == ['n1', 'n2', 'n3']
+
+
+def test_direct_edit_wins_over_an_older_log(snapshot):
+    store = MemoryStore(snapshot)
+    store.record(notes=['n9'], cycle_id='c9')
+
+    # An agent edits memory.json by hand from a copy that predates the log.
+    data = json.loads(snapshot.read_text(encoding='utf-8'))
+    data['cycle_id'] = 'c10'
+    data['notes'].append('n10')
+    snapshot.write_text(json.dumps(data, indent=4) + '\n', encoding='utf-8')
+
+    expected = {'cycle_id': 'c10', 'last_updated': None, 'notes': ['n1', 'n10', 'n9'], 'todos': []}
+    assert MemoryStore(snapshot).state() == expected
+    assert store.state() == expected
+
+    store.compact()
+    assert json.loads(snapshot.read_text(encoding='utf-8')) == expected
+    store.record(notes=['n11'])
+    assert MemoryStore(snapshot).state()['notes'] == ['n1', 'n10', 'n9', 'n11']
+    assert MemoryStore(snapshot).state()['cycle_id'] == 'c10'
+
+
+def test_record_command(snapshot):
+    assert main(['record', str(snapshot), '--note', 'from cli', '--set', 'cycle_id=c3', '--set', 'last_updated=now']) == 0
+    state = MemoryStore(snapshot).state()
+    assert (state['cycle_id'], state['last_updated'], state['notes'][-1]) == ('c3', 'now', 'from cli')
+
+
+def test_show_keys_several_stores_by_path(snapshot, tmp_path, capsys):
+    other = tmp_path / 'pod' / 'memory.json'
+    other.parent.mkdir()
+    other.write_text(snapshot.read_text(encoding='utf-8'), encoding='utf-8')
+    MemoryStore(other).record(notes=['pending'])
+
+    assert main(['show', str(snapshot), str(other)]) == 0
+    shown = json.loads(capsys.readouterr().out)
+    assert shown[str(snapshot)]['notes'] == ['n1']
+    assert shown[str(other)]['notes'] == ['n1', 'pending']
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import pytest
+
+from doctools.mojibake import MISDECODED, main, plausible_repair, repair_double_encoded, scan_bytes
+
+
+def damage(text: str, layers: int = 1) -> bytes:
+    """UTF-8 read as cp1252 and saved again, ``layers`` times."""
+    data = text.encode('utf-8')
+    for _ in range(layers):
+        data = b''.join(MISDECODED[byte] for byte in data)
+    return data
+
+
+@pytest.mark.parametrize('text, layers', [('ñ', 1), ('’', 1), ('”', 1), ('©', 3), ('—', 2), ('✓', 1)])
+def test_double_encoding_is_repaired(text, layers):
+    [finding] = scan_bytes(damage(text, layers), 'file.md')
+    assert (finding.kind, finding.repair, finding.proposal) == ('double-encoded', text, None)
+
+
+def test_implausible_round_trip_is_only_proposed():
+    # 'Í”' round-trips to U+0354, a combining mark: real text, not mojibake.
+    raw = 'AVISO: “SÍ”'.encode('utf-8')
+    assert repair_double_encoded('Í”'.encode('utf-8')) == '͔'.encode('utf-8')
+    [finding] = scan_bytes(raw, 'file.md')
+    assert finding.repair is None
+    assert finding.proposal == '͔'
+
+
+def test_plausible_repair_rejects_controls_and_other_scripts():
+    assert plausible_repair(b'\xc3\x83\xc2\xb1', 'ñ'.encode('utf-8'))
+    assert not plausible_repair(b'x', b'\x05')
+    assert not plausible_repair(b'x', 'Ж'.encode('utf-8'))
+
+
+def test_cp1252_bytes_are_repaired():
+    [first, second] = scan_bytes('Sección 1 – Partes'.encode('cp1252'), 'file.md')
+    assert (first.kind, first.repair, second.repair) == ('invalid-utf8', 'ó', '–')
+
+
+def test_apply_exit_status_reflects_what_is_left(tmp_path: Path):
+    fixable = tmp_path / 'fixable.md'
+    fixable.write_bytes(damage('Año nuevo'))
+    assert main([str(fixable), '--apply']) == 0
+    assert fixable.read_text(encoding='utf-8') == 'Año nuevo'
+    assert main([str(fixable)]) == 0
+
+    stuck = tmp_path / 'stuck.md'
+    original = 'AVISO: “SÍ” y �'.encode('utf-8')
+    stuck.write_bytes(original)
+    assert main([str(stuck)]) == 1
+    assert main([str(stuck), '--apply']) == 1
+    assert stuck.read_bytes() == original
@@ -0,0 +1,78 @@
+import pytest
+
+from doctools.translation_memory import TranslationMemory, same_terms
+
+PAIRS = [
+    ('irrevocable living trust', 'fideicomiso en vida irrevocable'),
+    ('unsecured promissory note', 'pagaré no garantizado'),
+    ('automatic payment form', 'formulario de pago automático'),
+    ('medical authorization form', 'formulario de autorización médica'),
+    ('vehicle bill of sale', 'factura de venta de vehículo'),
+    ('lease agreements', 'contratos de arrendamiento'),
+    ('offer of employment', 'oferta de empleo'),
+]
+
+
+@pytest.fixture(scope='module')
+def memory() -> TranslationMemory:
+    return TranslationMemory.from_pairs(PAIRS, {'boat bill of sale': 'factura de venta de embarcación'})
+
+
+@pytest.mark.parametrize('query', [
+    'revocable living trust',
+    'secured promissory note',
+    'automatic nonpayment form',
+    'medical authorization',
+    'vehicle bill of sael',
+    'boat bill',
+    'lease agreement',
+    'vehicle bills of sale',
+])
+def test_differing_terms_are_never_accepted(memory, query):
+    assert memory.accept(query) == []
+
+
+def test_negations_still_rank_as_candidates_for_review(memory):
+    [match] = memory.lookup('revocable living trust', limit=1)
+    assert match.source == 'irrevocable living trust'
+
+
+@pytest.mark.parametrize('query, spanish', [
+    ('bill of sale for vehicle', 'factura de venta de vehículo'),
+    ('lease agreements', 'contratos de arrendamiento'),
+    ('employment offer', 'oferta de empleo'),
+    ('Boat Bill of Sale', 'factura de venta de embarcación'),
+])
+def test_reordered_forms_are_accepted(memory, query, spanish):
+    assert memory.accept(query)[0].translations[0] == spanish
+
+
+def test_singular_and_plural_are_not_merged(memory):
+    assert memory.accept('lease agreement') == []
+    assert [match.source for match in memory.lookup('lease agreement')] == ['lease agreements']
+    memory = TranslationMemory.from_pairs([('lease agreement', 'contrato de arrendamiento'), *PAIRS])
+    [match] = memory.accept('lease agreement')
+    assert match.translations == ('contrato de arrendamiento',)
+
+
+def test_threshold_bounds_word_order_and_function_word_drift(memory):
+    assert memory.accept('vehicle bill of sale', threshold=1)
+    assert memory.accept('bill of sale for vehicle', threshold=1) == []
+    assert memory.accept('bill of sale for vehicle', threshold=0.85)
+    assert memory.accept('offer for employment', threshold=0.85) == []
+    assert memory.accept('offer for employment')
+
+
+def test_same_terms_ignores_order_and_stopwords_only():
+    assert same_terms('bill of sale for vehicle', 'vehicle bill of sale')
+    assert not same_terms('bill of sale for vehicles', 'vehicle bill of sale')
+    assert not same_terms('secured note', 'unsecured note')
+    assert not same_terms('lessor notice', 'lessee notice')
+    assert not same_terms('business lease', 'busines lease')
+
+
+def test_override_outranks_manifest_pairs():
+    memory = TranslationMemory.from_pairs([('donation agreement', 'contrato de donación')] * 3,
+                                          {'donation agreement': 'acuerdo de donación'})
+    [match] = memory.accept('donation agreement')
+    assert (match.origin, match.translations) == ('override', ('acuerdo de donación',))
@@ -0,0 +1,28 @@
+from doctools.translators import FakeTranslator, TokenBucket, translate_batch, translate_with_retry
+
+
+class CountingBucket(TokenBucket):
+    def __init__(self):
+        super().__init__(rate=0)
+        self.acquired = 0
+
+    def acquire(self) -> None:
+        self.acquired += 1
+
+
+def test_batch_and_serial_calls_share_one_bucket():
+    bucket = CountingBucket()
+    translator = FakeTranslator()
+
+    translations, failures = translate_batch(['lease', 'bill of sale', 'lease'], translator, bucket=bucket)
+    translate_with_retry(translator, 'waiver', bucket)
+
+    assert translations == {'lease': 'arrendamiento (término legal)', 'bill of sale': 'factura de venta (término legal)'}
+    assert failures == {}
+    assert bucket.acquired == translator.calls == 3
+
+
+def test_batch_reports_aliases_that_keep_failing():
+    translations, failures = translate_batch(['notice'], FakeTranslator(failure_rate=1.0), retries=1, backoff=0)
+    assert translations == {}
+    assert 'after 2 attempts' in failures['notice']
@@ -0,0 +1,76 @@
+import re
+
+import pytest
+
+from doctools.ts_literals import (
+    STRING_LITERAL,
+    find_translations_block,
+    is_code,
+    locate_alias_arrays,
+    rewrite_alias_arrays,
+)
+
+STRING_RE = re.compile(STRING_LITERAL)
+
+METADATA = """export const meta = {
+  id: 'x', // translations: { en: { aliases: ['comment'] } }
+  note: "translations: { not this }",
+  /* translations: {
+     es: { aliases: ['block comment'] } } */
+  help: `template ${'translations: {'} text`,
+  translations: {
+    en: {
+      name: 'X [draft]',
+      aliases: ['a ] b', "c's [d]", /* ] */ 'e'], // ]
+    },
+    es: {
+      aliases: [
+        'f \\' ] g',
+      ],
+    },
+  },
+};
+"""
+
+
+@pytest.mark.parametrize('marker, expected', [
+    ("id: 'x'", True),
+    ('// translations', False),
+    ("'comment'", False),
+    ('"translations: { not this }"', False),
+    ("['block comment']", False),
+    ("'translations: {'", False),
+    ('translations: {\n    en', True),
+])
+def test_is_code_skips_strings_comments_and_templates(marker, expected):
+    assert is_code(METADATA, METADATA.index(marker) + 1) is expected
+
+
+def test_translations_block_is_found_past_commented_and_quoted_copies():
+    assert METADATA[find_translations_block(METADATA) - 14:].startswith('translations: {\n    en')
+
+
+def test_string_literal_handles_escapes_and_stays_on_one_line():
+    assert STRING_RE.findall("['a', \"b \\\" c\", 'd \\' e']") == ["'a'", '"b \\" c"', "'d \\' e'"]
+    assert STRING_RE.findall("'open\nclose'") == []
+
+
+def test_brackets_and_quotes_inside_aliases_do_not_confuse_the_locator():
+    spans = locate_alias_arrays(METADATA)
+    assert METADATA[spans['en'].start:spans['en'].end] == """['a ] b', "c's [d]", /* ] */ 'e']"""
+    assert METADATA[spans['es'].start:spans['es'].end] == "[\n        'f \\' ] g',\n      ]"
+    assert spans['es'].indent == '      '
+
+
+def test_rewrite_touches_only_the_alias_arrays():
+    updated = rewrite_alias_arrays(METADATA, {'en': ['new ] one'], 'es': ["it's"]})
+    spans = locate_alias_arrays(updated)
+    assert updated[spans['en'].start:spans['en'].end] == "[\n        'new ] one',\n      ]"
+    assert updated[spans['es'].start:spans['es'].end] == "[\n        'it\\'s',\n      ]"
+    assert updated[:spans['en'].start] == METADATA[:METADATA.index("['a ] b'")]
+    assert updated.endswith("  },\n};\n")
+
+
+def test_unbalanced_block_is_an_error():
+    with pytest.raises(ValueError):
+        locate_alias_arrays("const m = { translations: { en: { aliases: ['a' }, };")
@@ -0,0 +1,86 @@
+"""Persistent, versioned cache for machine-translated document aliases.
+
+Entries are appended to a JSONL file, one object per translation. Each record
+carries the cache format version and a fingerprint of the post-processing
+rules that shaped it, so changing ``REMOVE_SUFFIXES`` or the overrides table
+silently invalidates older records instead of serving stale output.
+"""
+import hashlib
+import json
+from pathlib import Path
+
+CACHE_VERSION = 1
+
+
+def rules_fingerprint(*rules) -> str:
+    payload = json.dumps(rules, ensure_ascii=False, sort_keys=True, default=list)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def normalize_key(alias: str) -> str:
+    return ' '.join(alias.split()).lower()
+
+
+class TranslationCache:
+    def __init__(self, path: Path, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.stale = 0
+        self._entries: dict[str, str] | None = None
+
+    def _load(self) -> dict[str, str]:
+        if self._entries is not None:
+            return self._entries
+        entries: dict[str, str] = {}
+        if self.path.exists():
+            with self.path.open(encoding='utf-8') as handle:
+                for line in handle:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from an interrupted run; ignore it.
+                        continue
+                    if record.get('v') != CACHE_VERSION or record.get('rules') != self.fingerprint:
+                        self.stale += 1
+                        continue
+                    entries[record['key']] = record['es']
+        self._entries = entries
+        return entries
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __contains__(self, alias: str) -> bool:
+        return normalize_key(alias) in self._load()
+
+    def get(self, alias: str) -> str | None:
+        value = self._load().get(normalize_key(alias))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, alias: str, translation: str) -> None:
+        key = normalize_key(alias)
+        entries = self._load()
+        if entries.get(key) == translation:
+            return
+        entries[key] = translation
+        record = {'v': CACHE_VERSION, 'rules': self.fingerprint, 'key': key, 'es': translation}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open('a', encoding='utf-8') as handle:
+            handle.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.writes += 1
+
+    def summary(self) -> str:
+        return (
+            f'Translation cache: {self.hits} hits, {self.misses} misses, '
+            f'{self.writes} new entries ({len(self._load())} cached, {self.stale} stale records ignored)'
+        )
@@ -0,0 +1,211 @@
+"""Fuzzy translation memory over the vetted en->es alias pairs.
+
+    python -m doctools.translation_memory QUERY... [--limit N] [--min-score F] [--json]
+
+Every English alias that already has a Spanish form in the manifest (documents
+whose en/es alias lists line up) or in the overrides table is a memory entry.
+Entries are indexed twice: by word token and by character trigram of the
+normalized English text. A lookup collects the entries sharing a token or a
+trigram with the query and ranks them by the mean of two Dice coefficients:
+one over trigrams, so "bill-of-sale" and small typos still match, and one
+over tokens weighted by inverse document frequency, so "boat bill of sale"
+lists "vessel bill of sale" as a candidate but a missing distinctive word
+("boat") costs far more than a missing "of".
+
+Overrides outrank manifest pairs for the same English text. ``accept`` only
+returns matches whose content words are exactly the query's, number included:
+"medical authorization" never borrows the Spanish of "medical authorization
+form", "revocable living trust" never borrows that of "irrevocable living
+trust" and "lease agreement" never borrows the plural of "lease agreements".
+What is left to differ is word order and function words, and the threshold
+decides how much of that is tolerated: 1 takes only the same words in the
+same order, 0.85 also "the vehicle bill of sale" or "bill of sale for
+vehicle", and the default also "offer for employment". Near misses still show
+up in ``lookup`` for a human to judge.
+"""
+import argparse
+import json
+import math
+import re
+import sys
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+
+from .normalize import normalize_en
+
+GRAM = 3
+DEFAULT_THRESHOLD = 0.75
+STOPWORDS = frozenset({'a', 'an', 'and', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'with'})
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def memory_key(text: str) -> str:
+    return ' '.join(TOKEN_RE.findall(normalize_en(text)))
+
+
+def tokens(key: str) -> set[str]:
+    # No plural folding: a singular alias must not pick up a plural Spanish form.
+    return set(key.split())
+
+
+def grams(key: str) -> set[str]:
+    padded = f' {key} '
+    return {padded[start:start + GRAM] for start in range(len(padded) - GRAM + 1)}
+
+
+def same_terms(a: str, b: str) -> bool:
+    """Whether both keys have the same content words, in the same number.
+
+    No typo tolerance: one-letter and prefix differences are where negations
+    and antonyms live ("secured"/"unsecured", "lessor"/"lessee").
+    """
+    return tokens(a) - STOPWORDS == tokens(b) - STOPWORDS
+
+
+@dataclass(frozen=True)
+class MemoryMatch:
+    source: str
+    translations: tuple[str, ...]
+    score: float
+    origin: str  # 'override' or 'manifest'
+
+
+@dataclass
+class TranslationMemory:
+    sources: list[str] = field(default_factory=list)
+    translations: list[Counter] = field(default_factory=list)
+    origins: list[str] = field(default_factory=list)
+    token_postings: dict[str, list[int]] = field(default_factory=dict)
+    gram_postings: dict[str, list[int]] = field(default_factory=dict)
+    _positions: dict[str, int] = field(default_factory=dict, repr=False)
+    _sizes: list[int] = field(default_factory=list, repr=False)
+    _token_totals: list[float] | None = field(default=None, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def add(self, english: str, spanish: str, origin: str = 'manifest') -> None:
+        key = memory_key(english)
+        spanish = ' '.join(spanish.split()).lower()
+        if not key or not spanish:
+            return
+        position = self._positions.get(key)
+        if position is None:
+            position = self._positions[key] = len(self.sources)
+            self.sources.append(key)
+            self.translations.append(Counter())
+            self.origins.append(origin)
+            key_tokens, key_grams = tokens(key), grams(key)
+            self._sizes.append(len(key_grams))
+            self._token_totals = None
+            for token in key_tokens:
+                self.token_postings.setdefault(token, []).append(position)
+            for gram in key_grams:
+                self.gram_postings.setdefault(gram, []).append(position)
+        if origin == 'override':
+            # An override replaces whatever the manifest taught for this text.
+            self.translations[position] = Counter({spanish: 1})
+            self.origins[position] = origin
+        elif self.origins[position] == 'manifest':
+            self.translations[position][spanish] += 1
+
+    @classmethod
+    def from_pairs(cls, pairs, overrides: dict[str, str] | None = None) -> 'TranslationMemory':
+        memory = cls()
+        for english, spanish in pairs:
+            memory.add(english, spanish)
+        for english, spanish in (overrides or {}).items():
+            memory.add(english, spanish, 'override')
+        return memory
+
+    def weight(self, token: str) -> float:
+        return math.log(1 + len(self.sources) / (len(self.token_postings.get(token, ())) or 1))
+
+    def _totals(self) -> list[float]:
+        if self._token_totals is None:
+            self._token_totals = [sum(self.weight(token) for token in tokens(source)) for source in self.sources]
+        return self._token_totals
+
+    def _ranked(self, position: int) -> tuple[str, ...]:
+        counts = self.translations[position]
+        return tuple(sorted(counts, key=lambda spanish: (-counts[spanish], spanish)))
+
+    def lookup(self, text: str, limit: int = 5, min_score: float = 0.5) -> list[MemoryMatch]:
+        """Entries ranked by similarity to ``text``, best first."""
+        key = memory_key(text)
+        if not key:
+            return []
+        query_tokens, query_grams = tokens(key), grams(key)
+        query_total = 0.0
+        shared_tokens: dict[int, float] = {}
+        for token in query_tokens:
+            weight = self.weight(token)
+            query_total += weight
+            for position in self.token_postings.get(token, ()):
+                shared_tokens[position] = shared_tokens.get(position, 0.0) + weight
+        shared_grams: dict[int, int] = {}
+        for gram in query_grams:
+            for position in self.gram_postings.get(gram, ()):
+                shared_grams[position] = shared_grams.get(position, 0) + 1
+
+        totals = self._totals()
+        scored = []
+        for position, gram_overlap in shared_grams.items():
+            token_score = 2 * shared_tokens.get(position, 0.0) / (query_total + totals[position])
+            gram_score = 2 * gram_overlap / (len(query_grams) + self._sizes[position])
+            score = (token_score + gram_score) / 2
+            if score >= min_score:
+                scored.append((-score, self.origins[position] != 'override', self.sources[position], position))
+        scored.sort()
+        return [
+            MemoryMatch(self.sources[position], self._ranked(position), round(-negative, 3), self.origins[position])
+            for negative, _, _, position in scored[:limit]
+        ]
+
+    def accept(self, text: str, threshold: float = DEFAULT_THRESHOLD, limit: int = 5) -> list[MemoryMatch]:
+        """Matches good enough to reuse without review."""
+        key = memory_key(text)
+        return [match for match in self.lookup(text, limit, threshold) if same_terms(key, match.source)]
+
+
+def manifest_pairs(entries: list[dict]):
+    """(en, es) alias pairs from documents whose two alias lists line up."""
+    for entry in entries:
+        translations = entry['meta'].get('translations', {})
+        en_aliases = translations.get('en', {}).get('aliases', [])
+        es_aliases = translations.get('es', {}).get('aliases', [])
+        if len(en_aliases) != len(es_aliases):
+            continue
+        for en_alias, es_alias in zip(en_aliases, es_aliases):
+            if '(' not in es_alias:
+                yield en_alias, es_alias
+
+
+def main(argv: list[str] | None = None) -> int:
+    from .manifest import load_manifest
+    from .paths import MANIFEST_PATH
+
+    parser = argparse.ArgumentParser(description='Look up English aliases in the manifest translation memory.')
+    parser.add_argument('queries', nargs='+', help='English alias text.')
+    parser.add_argument('--limit', type=int, default=5)
+    parser.add_argument('--min-score', type=float, default=0.5)
+    parser.add_argument('--json', action='store_true', help='Print matches as JSON.')
+    args = parser.parse_args(argv)
+
+    memory = TranslationMemory.from_pairs(manifest_pairs(load_manifest(MANIFEST_PATH).entries))
+    results = {query: memory.lookup(query, args.limit, args.min_score) for query in args.queries}
+    if args.json:
+        json.dump({query: [asdict(match) for match in matches] for query, matches in results.items()},
+                  sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write('\n')
+        return 0
+    for query, matches in results.items():
+        print(f'{query}:')
+        for match in matches:
+            flag = '*' if match.score >= DEFAULT_THRESHOLD and same_terms(memory_key(query), match.source) else ' '
+            print(f' {flag}{match.score:5.2f}  {match.source} -> {" | ".join(match.translations)}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
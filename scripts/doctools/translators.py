@@ -0,0 +1,180 @@
+"""Translator backends and a concurrent, rate-limited batch resolver.
+
+Backends only return the raw machine translation for one English alias;
+suffix stripping and normalization stay with the caller so cached output is
+identical no matter which backend produced it.
+"""
+import json
+import random
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TranslationError(RuntimeError):
+    pass
+
+
+class Translator:
+    name = 'base'
+
+    def translate(self, alias: str) -> str:
+        raise NotImplementedError
+
+
+class GoogleTranslator(Translator):
+    name = 'google'
+    endpoint = 'https://translate.googleapis.com/translate_a/single'
+
+    def __init__(self, timeout: float = 15.0):
+        self.timeout = timeout
+
+    def translate(self, alias: str) -> str:
+        params = {
+            'client': 'gtx',
+            'sl': 'en',
+            'tl': 'es',
+            'dt': 't',
+            'q': f'{alias} (legal term)',
+        }
+        url = self.endpoint + '?' + urllib.parse.urlencode(params)
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            payload = json.loads(response.read().decode('utf-8'))
+        return ''.join(chunk[0] for chunk in payload[0]) if payload and payload[0] else ''
+
+
+FAKE_GLOSSARY = {
+    'agreement': 'acuerdo',
+    'contract': 'contrato',
+    'form': 'formulario',
+    'notice': 'aviso',
+    'letter': 'carta',
+    'lease': 'arrendamiento',
+    'bill': 'factura',
+    'sale': 'venta',
+    'of': 'de',
+    'power': 'poder',
+    'attorney': 'abogado',
+    'release': 'liberación',
+    'waiver': 'renuncia',
+    'policy': 'política',
+}
+
+
+class FakeTranslator(Translator):
+    """Deterministic offline backend for tests and benchmarks.
+
+    Words found in ``FAKE_GLOSSARY`` are swapped, everything else is kept, and
+    the result carries the same ``(término legal)`` tail the real endpoint
+    tends to echo back. ``latency`` and ``failure_rate`` simulate a slow or
+    flaky service.
+    """
+
+    name = 'fake'
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def translate(self, alias: str) -> str:
+        with self._lock:
+            self.calls += 1
+            fail = self._random.random() < self.failure_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise TranslationError(f'simulated failure for {alias!r}')
+        words = [FAKE_GLOSSARY.get(word.lower(), word.lower()) for word in alias.split()]
+        return ' '.join(words) + ' (término legal)'
+
+
+BACKENDS = {
+    GoogleTranslator.name: GoogleTranslator,
+    FakeTranslator.name: FakeTranslator,
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``rate`` tokens per second, bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def translate_with_retry(
+    translator: Translator,
+    alias: str,
+    bucket: TokenBucket | None = None,
+    retries: int = 3,
+    backoff: float = 0.5,
+) -> str:
+    attempt = 0
+    while True:
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            return translator.translate(alias)
+        except Exception as error:
+            if attempt >= retries:
+                raise TranslationError(f'{alias!r} failed after {attempt + 1} attempts: {error}') from error
+            time.sleep(backoff * (2 ** attempt) * (0.5 + random.random() / 2))
+            attempt += 1
+
+
+def translate_batch(
+    aliases: list[str],
+    translator: Translator,
+    concurrency: int = 8,
+    rate: float = 5.0,
+    retries: int = 3,
+    backoff: float = 0.5,
+    bucket: TokenBucket | None = None,
+) -> tuple[dict[str, str], dict[str, str]]:
+    """Resolve ``aliases`` concurrently; returns ``(translations, failures)``.
+
+    Pass ``bucket`` to share one rate limit with calls made outside the batch;
+    otherwise a bucket of ``rate`` requests per second is made for this batch.
+    """
+    unique = list(dict.fromkeys(aliases))
+    bucket = bucket or TokenBucket(rate)
+    translations: dict[str, str] = {}
+    failures: dict[str, str] = {}
+    if not unique:
+        return translations, failures
+
+    def work(alias: str) -> tuple[str, str | None, str | None]:
+        try:
+            return alias, translate_with_retry(translator, alias, bucket, retries, backoff), None
+        except TranslationError as error:
+            return alias, None, str(error)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for alias, translated, error in executor.map(work, unique):
+            if error is None:
+                translations[alias] = translated
+            else:
+                failures[alias] = error
+    return translations, failures
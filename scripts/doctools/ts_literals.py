@@ -0,0 +1,146 @@
+"""Locate and rewrite ``translations.<locale>.aliases`` arrays in ``metadata.ts``.
+
+A C-level regex search jumps straight to the ``translations: {`` key, a cheap
+check confirms the match is live code rather than a comment or string, and a
+token walker then scans just that block once. The walker understands string
+literals and comments, so brackets or quotes inside an alias never confuse
+bracket matching. Every alias array is recorded with its span and all edits
+are spliced back in a single pass.
+"""
+import re
+from dataclasses import dataclass
+
+_SQ = r"'[^'\\\n]*(?:\\.[^'\\\n]*)*'"
+_DQ = r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+_TEMPLATE = r'`[^`\\]*(?:\\.[^`\\]*)*`'
+_COMMENT = r'//[^\n]*|/\*.*?\*/'
+_IDENT = r'[A-Za-z_$][\w$]*'
+
+# A single- or double-quoted string on one line, quotes included.
+STRING_LITERAL = rf'{_SQ}|{_DQ}'
+
+LITERAL_RE = re.compile(rf'{_SQ}|{_DQ}|{_TEMPLATE}|{_COMMENT}', re.DOTALL)
+
+TRANSLATIONS_RE = re.compile(r'translations\s*:\s*\{')
+
+# Runs of literals, comments, punctuation and whitespace collapse into a single
+# ``skip`` match. Object keys and brackets are the only tokens the walker
+# actually inspects.
+TOKEN_RE = re.compile(
+    rf"""
+      (?P<open>[{{\[(])
+    | (?P<close>[}}\])])
+    | (?P<key>{_IDENT}|{_SQ}|{_DQ})\s*:
+    | (?P<skip>(?:(?:{_SQ}|{_DQ})(?!\s*:)|{_TEMPLATE}|{_COMMENT}|/(?![/*])|[^'"`/{{}}\[\]()A-Za-z_$]+)+|{_IDENT})
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+OPENERS = {'{': '}', '[': ']', '(': ')'}
+
+
+@dataclass(frozen=True)
+class AliasSpan:
+    locale: str
+    start: int
+    end: int
+    indent: str
+
+
+def is_code(content: str, pos: int) -> bool:
+    if content.rfind('/*', 0, pos) > content.rfind('*/', 0, pos):
+        return False
+    if content.count('`', 0, pos) % 2:
+        return False
+    line_start = content.rfind('\n', 0, pos) + 1
+    line_end = content.find('\n', pos)
+    if line_end == -1:
+        line_end = len(content)
+    for match in LITERAL_RE.finditer(content, line_start, line_end):
+        if match.start() > pos:
+            break
+        if match.end() > pos:
+            return False
+    return True
+
+
+def find_translations_block(content: str) -> int:
+    """Return the offset of the ``{`` that opens the ``translations`` object."""
+    pos = content.find('translations')
+    while pos != -1:
+        match = TRANSLATIONS_RE.match(content, pos)
+        previous = content[pos - 1] if pos else ' '
+        if match and not (previous.isalnum() or previous in '_$.') and is_code(content, pos):
+            return match.end() - 1
+        pos = content.find('translations', pos + 1)
+    raise ValueError('Missing translations block')
+
+
+def _indent_at(content: str, pos: int) -> str:
+    line_start = content.rfind('\n', 0, pos) + 1
+    line = content[line_start:pos]
+    return line[: len(line) - len(line.lstrip())]
+
+
+def locate_alias_arrays(content: str) -> dict[str, AliasSpan]:
+    """Return the span of each ``translations.<locale>.aliases`` array literal.
+
+    ``start`` points at the opening ``[`` and ``end`` just past the matching
+    ``]``. Raises ``ValueError`` when the block is missing or unbalanced.
+    """
+    block_start = find_translations_block(content)
+    spans: dict[str, AliasSpan] = {}
+    # Each frame is (closing char, key that introduced it, start offset).
+    stack: list[tuple[str, str | None, int]] = []
+    pending_key: str | None = 'translations'
+
+    for match in TOKEN_RE.finditer(content, block_start):
+        kind = match.lastgroup
+        if kind == 'skip':
+            continue
+        if kind == 'key':
+            key = match.group('key')
+            pending_key = key[1:-1] if key[0] in '\'"' else key
+        elif kind == 'open':
+            stack.append((OPENERS[match.group()], pending_key, match.start()))
+            pending_key = None
+        else:
+            token = match.group()
+            if not stack or stack[-1][0] != token:
+                raise ValueError(f'Unbalanced {token!r} at offset {match.start()}')
+            _, key, start = stack.pop()
+            if not stack:
+                return spans
+            if token == ']' and key == 'aliases' and len(stack) == 2 and stack[-1][1] is not None:
+                locale = stack[-1][1]
+                spans.setdefault(locale, AliasSpan(locale, start, match.end(), _indent_at(content, start)))
+            pending_key = None
+
+    raise ValueError(f'Unclosed {stack[-1][0]!r} opened at offset {stack[-1][2]}')
+
+
+def render_alias_array(aliases: list[str], indent: str, newline: str) -> str:
+    if not aliases:
+        return '[]'
+    item_indent = indent + '  '
+    escaped = [alias.replace('\\', '\\\\').replace("'", "\\'") for alias in aliases]
+    lines = newline.join(f"{item_indent}'{alias}'," for alias in escaped)
+    return '[' + newline + lines + newline + indent + ']'
+
+
+def rewrite_alias_arrays(content: str, aliases_by_locale: dict[str, list[str]]) -> str:
+    """Replace the alias arrays for every locale in ``aliases_by_locale`` at once."""
+    spans = locate_alias_arrays(content)
+    for locale in aliases_by_locale:
+        if locale not in spans:
+            raise ValueError(f'Missing aliases array for {locale}')
+
+    newline = '\r\n' if '\r\n' in content else '\n'
+    parts: list[str] = []
+    cursor = 0
+    for span in sorted((spans[locale] for locale in aliases_by_locale), key=lambda item: item.start):
+        parts.append(content[cursor:span.start])
+        parts.append(render_alias_array(aliases_by_locale[span.locale], span.indent, newline))
+        cursor = span.end
+    parts.append(content[cursor:])
+    return ''.join(parts)
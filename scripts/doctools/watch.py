@@ -0,0 +1,234 @@
+"""Re-check document folders as their ``metadata.ts``/``questions.ts`` are saved.
+
+    python -m doctools watch [--interval S] [--debounce S] [--once]
+
+The manifest (folder -> document id), an ``AliasRegistry`` over every
+document's en/es aliases and the question-type ``Inventory`` are loaded once
+and kept in memory. The tree is polled (the standard library has no inotify;
+stat-ing both files of ~300 folders takes a couple of milliseconds), and a
+folder whose files changed is re-checked once they have been quiet for
+``--debounce``, so an editor's save-and-format or a bulk rewrite is checked
+once. Only the touched folders are re-read. Each check reports:
+
+- an alias count mismatch between en and es (the template verification rule);
+- an alias repeated within a locale, or used by another document in the same
+  locale;
+- question types outside the ``Question['type']`` union in
+  ``src/types/documents.ts`` (plus any ``--allow-type``).
+
+With the defaults a problem is reported 40-70 ms after the save.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from .alias_registry import AliasRegistry
+from .manifest import LOCALES, load_manifest
+from .manifest_patch import manifest_aliases, read_aliases
+from .paths import DOCUMENTS_DIR, STATE_DIR
+from .question_types import TYPES_PATH, Inventory, build_inventory, parse_fields, supported_types
+from .report_stream import ALIAS_MISMATCH
+
+WATCHED = ('metadata.ts', 'questions.ts')
+DEFAULT_INTERVAL = 0.02
+DEFAULT_DEBOUNCE = 0.04
+
+
+@dataclass
+class FolderReport:
+    folder: str  # relative to the documents directory, e.g. 'us/affidavit'
+    doc_id: str
+    problems: list[str] = field(default_factory=list)
+    # Seconds from the newest save in the folder to the report (None on the initial pass).
+    latency: float | None = None
+
+
+@dataclass
+class Watcher:
+    documents_dir: Path = DOCUMENTS_DIR
+    supported: set[str] = field(default_factory=supported_types)
+    debounce: float = DEFAULT_DEBOUNCE
+    registry: AliasRegistry = field(default_factory=AliasRegistry)
+    inventory: Inventory = field(default_factory=Inventory)
+    doc_ids: dict[str, str] = field(default_factory=dict)
+    signatures: dict[str, tuple] = field(default_factory=dict)
+    pending: dict[str, float] = field(default_factory=dict)
+    problems: dict[str, list[str]] = field(default_factory=dict)
+    # (folder, metadata path, questions path), re-listed when a jurisdiction directory changes.
+    _layout: list[tuple[str, str, str]] = field(default_factory=list, repr=False)
+    _layout_key: tuple = field(default=(), repr=False)
+
+    def load(self, snapshot_dir: Path | None = STATE_DIR) -> list[FolderReport]:
+        """Warm every index, then check all folders so the registry matches the files on disk."""
+        manifest = load_manifest(self.documents_dir / 'manifest.generated.json', snapshot_dir)
+        self.doc_ids = {entry['importPath'].removeprefix('./'): entry['id'] for entry in manifest.entries}
+        self.registry = AliasRegistry.from_manifest(manifest)
+        cache_path = None if snapshot_dir is None else snapshot_dir / 'question-types.cache.json'
+        self.inventory = build_inventory(self.documents_dir, cache_path)
+        self.signatures = self.scan()
+        return self.check(self.signatures, initial=True)
+
+    def _folders(self) -> list[tuple[str, str, str]]:
+        # Adding or removing a folder changes its parent's mtime; editing a file does not.
+        jurisdictions = [entry for entry in os.scandir(self.documents_dir) if entry.is_dir()]
+        key = tuple((entry.name, entry.stat().st_mtime_ns) for entry in jurisdictions)
+        if key != self._layout_key:
+            self._layout = [
+                (f'{jurisdiction.name}/{folder.name}', *(os.path.join(folder.path, name) for name in WATCHED))
+                for jurisdiction in jurisdictions
+                for folder in os.scandir(jurisdiction.path)
+                if folder.is_dir()
+            ]
+            self._layout_key = key
+        return self._layout
+
+    def scan(self) -> dict[str, tuple]:
+        signatures: dict[str, tuple] = {}
+        stat = os.stat
+        for folder, *paths in self._folders():
+            signature = []
+            for path in paths:
+                try:
+                    info = stat(path)
+                except FileNotFoundError:
+                    signature.append(None)
+                else:
+                    signature.append((info.st_mtime_ns, info.st_size))
+            if signature != [None, None]:
+                signatures[folder] = tuple(signature)
+        return signatures
+
+    def poll(self) -> list[FolderReport]:
+        """Scan once and check the folders whose changes have settled."""
+        current = self.scan()
+        now = time.time()
+        for folder in current.keys() | self.signatures.keys():
+            if current.get(folder) != self.signatures.get(folder):
+                # Quiet time counts from the newest save itself, not from when this poll noticed it.
+                saves = [signature[0] / 1e9 for signature in current.get(folder, ()) if signature]
+                self.pending[folder] = max(saves, default=now)
+        self.signatures = current
+        ready = [folder for folder, changed in self.pending.items() if now - changed >= self.debounce]
+        for folder in ready:
+            del self.pending[folder]
+        return self.check(ready)
+
+    def check(self, folders, initial: bool = False) -> list[FolderReport]:
+        return [self._check_folder(folder, initial) for folder in sorted(folders)]
+
+    def _check_folder(self, folder: str, initial: bool) -> FolderReport:
+        doc_id = self.doc_ids.get(folder, folder.rsplit('/', 1)[-1])
+        report = FolderReport(folder, doc_id)
+        path = self.documents_dir / folder
+        for locale in LOCALES:
+            self.registry.remove_document(doc_id, locale)
+        self.inventory.discard(folder)
+
+        metadata = path / 'metadata.ts'
+        if metadata.exists():
+            try:
+                raw = read_aliases(metadata)
+            except (ValueError, SyntaxError) as error:
+                report.problems.append(f'Could not read aliases: {error}')
+            else:
+                report.problems += self._check_aliases(doc_id, raw)
+        questions = path / 'questions.ts'
+        if questions.exists():
+            fields = parse_fields(questions.read_text(encoding='utf-8', errors='replace'))
+            self.inventory.add(folder, fields)
+            unsupported: dict[str, list[str]] = {}
+            for field_id, field_type in fields:
+                if field_type not in self.supported:
+                    unsupported.setdefault(field_type, []).append(field_id or '?')
+            for field_type, ids in sorted(unsupported.items()):
+                report.problems.append(f'Unsupported question type {field_type!r}: {", ".join(ids)}.')
+
+        if folder in self.signatures:
+            self.problems[folder] = report.problems
+            if not initial:
+                newest = max(signature[0] for signature in self.signatures[folder] if signature)
+                report.latency = max(0.0, time.time() - newest / 1e9)
+        else:
+            self.problems.pop(folder, None)
+        return report
+
+    def _check_aliases(self, doc_id: str, raw: dict[str, list[str]]) -> list[str]:
+        problems: list[str] = []
+        aliases = manifest_aliases(raw)
+        if aliases['en'] and aliases['es'] and len(aliases['en']) != len(aliases['es']):
+            problems.append(f'{ALIAS_MISMATCH}: EN has {len(aliases["en"])}, ES has {len(aliases["es"])}.')
+        for locale in LOCALES:
+            for alias in aliases[locale]:
+                owners = self.registry.owners(alias)
+                if (doc_id, locale) in owners:
+                    problems.append(f'Duplicate {locale} alias {alias!r}.')
+                others = sorted(owner for owner, owner_locale in owners if owner != doc_id and owner_locale == locale)
+                if others:
+                    problems.append(f'{locale} alias {alias!r} is also used by {", ".join(others)}.')
+                self.registry.add(doc_id, locale, alias)
+        return problems
+
+    def run(self, on_report: Callable[[FolderReport], None], interval: float = DEFAULT_INTERVAL,
+            stop: threading.Event | None = None) -> None:
+        stop = stop or threading.Event()
+        while not stop.wait(interval):
+            for report in self.poll():
+                on_report(report)
+
+
+def print_report(report: FolderReport) -> None:
+    latency = '' if report.latency is None else f' ({report.latency * 1000:.0f} ms)'
+    if not report.problems:
+        print(f'{report.folder}: ok{latency}', flush=True)
+        return
+    print(f'{report.folder}: {len(report.problems)} problem(s){latency}')
+    for problem in report.problems:
+        print(f'  - {problem}')
+    sys.stdout.flush()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Watch document folders and re-check alias parity and question types on save.')
+    parser.add_argument('--root', type=Path, default=DOCUMENTS_DIR, help='Documents directory (default: src/lib/documents).')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help=f'Seconds between polls (default: {DEFAULT_INTERVAL}).')
+    parser.add_argument(
+        '--debounce',
+        type=float,
+        default=DEFAULT_DEBOUNCE,
+        help=f'Seconds a folder must be quiet before it is checked (default: {DEFAULT_DEBOUNCE}).',
+    )
+    parser.add_argument('--types-from', type=Path, default=TYPES_PATH, help='TypeScript file declaring the Question type union.')
+    parser.add_argument('--allow-type', action='append', default=[], help='Also accept this question type (repeatable).')
+    parser.add_argument('--once', action='store_true', help='Check every folder, print the problems and exit.')
+    parser.add_argument('--show-existing', action='store_true', help='Print the problems found by the initial pass.')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    watcher = Watcher(args.root.resolve(), supported_types(args.types_from) | set(args.allow_type), args.debounce)
+    reports = watcher.load()
+    failing = [report for report in reports if report.problems]
+    if args.once or args.show_existing:
+        for report in failing:
+            print_report(report)
+    print(
+        f'{len(reports)} folders checked in {(time.perf_counter() - started) * 1000:.0f} ms, '
+        f'{len(failing)} with problems',
+        file=sys.stderr,
+    )
+    if args.once:
+        return 1 if failing else 0
+    print(f'watching {watcher.documents_dir} (Ctrl-C to stop)', file=sys.stderr)
+    try:
+        watcher.run(print_report, args.interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
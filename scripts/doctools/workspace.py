@@ -0,0 +1,51 @@
+"""In-process cache of parsed inputs, shared by chained ``doctools`` subcommands.
+
+``python -m doctools verify + fix-aliases + patch-manifest + diff`` runs every
+step in one interpreter; loaders route through ``cached`` so the manifest,
+the verification report and other inputs are read and parsed once. Entries
+are keyed on the file's ``(mtime_ns, size)``, so a step that rewrites a file
+(fix-aliases writing metadata, patch-manifest writing the manifest) makes the
+next step load the new content instead of a stale copy.
+"""
+from pathlib import Path
+from typing import Callable, TypeVar
+
+T = TypeVar('T')
+
+_entries: dict[tuple[str, str], tuple[tuple[int, int], object]] = {}
+hits = 0
+misses = 0
+
+
+def cached(path: Path, kind: str, loader: Callable[[], T]) -> T:
+    """Return ``loader()``'s result for ``path``, reusing it while the file is unchanged."""
+    global hits, misses
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = (str(path.resolve()), kind)
+    found = _entries.get(key)
+    if found is not None and found[0] == signature:
+        hits += 1
+        return found[1]
+    misses += 1
+    value = loader()
+    _entries[key] = (signature, value)
+    return value
+
+
+def read_bytes(path: Path) -> bytes:
+    return cached(path, 'bytes', path.read_bytes)
+
+
+def read_text(path: Path, encoding: str = 'utf-8') -> str:
+    return cached(path, f'text:{encoding}', lambda: path.read_text(encoding=encoding))
+
+
+def clear() -> None:
+    global hits, misses
+    _entries.clear()
+    hits = misses = 0
+
+
+def summary() -> str:
+    return f'Workspace cache: {len(_entries)} inputs held, {hits} reuses, {misses} loads'
@@ -0,0 +1,69 @@
+"""Write HEAD-vs-working-tree unified diffs for selected files.
+
+    python -m doctools diff [PATH...] [--changed [PATHSPEC...]] [--output-dir DIR]
+
+Each file becomes ``<output-dir>/<path with / replaced by _>.diff``; the
+default output directory is ``ops/tmp``.
+"""
+import argparse
+from pathlib import Path
+
+from . import instrument, workspace
+from .diff import unified_diff
+from .git_blobs import GitBlobReader, changed_paths
+from .paths import REPO_ROOT
+
+OUT_DIR = REPO_ROOT / 'ops' / 'tmp'
+DEFAULT_PATHS = [
+    'public/templates/en/advance-directive.md',
+    'public/templates/es/advance-directive.md',
+]
+DEFAULT_CHANGED = ['public/templates/en', 'public/templates/es']
+
+
+def render_diff(path: str, old: str, repo: Path = REPO_ROOT) -> str:
+    current = repo / path
+    # A file deleted from the working tree diffs against nothing, as in git.
+    deleted = not current.exists()
+    new = '' if deleted else workspace.read_text(current)
+    instrument.count('diff.files')
+    tofile = '/dev/null' if deleted else f'b/{path}'
+    diff = unified_diff(old.splitlines(), new.splitlines(), fromfile=f'a/{path}', tofile=tofile, lineterm='')
+    return '\n'.join(diff) + '\n'
+
+
+def write_diffs(paths: list[str], out_dir: Path = OUT_DIR) -> None:
+    with instrument.phase('git read'), GitBlobReader(REPO_ROOT) as reader:
+        blobs = reader.read_many(paths)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for path in paths:
+        old = (blobs[path] or b'').decode('utf-8')
+        out_path = out_dir / (path.replace('/', '_') + '.diff')
+        with instrument.phase('diff'):
+            diff = render_diff(path, old)
+        with instrument.phase('write'):
+            out_path.write_text(diff)
+        print(f'wrote {out_path.relative_to(REPO_ROOT).as_posix() if out_path.is_relative_to(REPO_ROOT) else out_path}')
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Write HEAD-vs-working-tree diffs into ops/tmp.')
+    parser.add_argument('paths', nargs='*', help='Repo-relative files (default: the advance-directive templates).')
+    parser.add_argument(
+        '--changed',
+        nargs='*',
+        metavar='PATHSPEC',
+        help='Diff every file changed since HEAD under these pathspecs (default: public/templates).',
+    )
+    parser.add_argument('--output-dir', type=Path, default=OUT_DIR, help='Where to write the .diff files (default: ops/tmp).')
+    instrument.add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    instrument.start('gen_diff', args)
+
+    if args.changed is not None:
+        with instrument.phase('git status'):
+            targets = args.paths + changed_paths(args.changed or DEFAULT_CHANGED, REPO_ROOT)
+    else:
+        targets = args.paths or DEFAULT_PATHS
+    write_diffs(list(dict.fromkeys(targets)), args.output_dir.resolve())
+    return 0
@@ -1,9 +1,8 @@
-import pathlib
-import re
+import sys
+from pathlib import Path
 
-types = set()
-for path in pathlib.Path(''src/lib/documents'').rglob(''questions.ts''):
-    text = path.read_text(encoding='utf-8')
-    types.update(re.findall(r"type:\s*'([^']+)'", text))
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'scripts'))
 
-print(sorted(types))
+from doctools.question_types import main
+
+raise SystemExit(main())